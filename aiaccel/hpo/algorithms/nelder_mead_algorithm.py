@@ -2,11 +2,14 @@
 # SPDX-License-Identifier: MIT
 
 import numpy.typing as npt
+from typing import Any
 
+from collections import deque
 from collections.abc import Generator
 from dataclasses import dataclass
 import queue
 import threading
+import time
 
 import numpy as np
 
@@ -36,6 +39,10 @@ class NelderMeadAlgorithm:
     Uses a queue to receive results and advance the NelderMead algorithm.
     Return parameters within the normalization range by referring only to the number of dimensions.
 
+    The vertices proposed by the algorithm are buffered, so that get_vertex pops them without locking.
+    Only a thread that finds the buffer empty advances the generator, which is the single consumer of the results.
+    Threads waiting for results do not hold the lock and are woken up when a result or a proposal arrives.
+
     Args:
         dimensions: int | None = None
             The number of dimensions in the search space.
@@ -44,27 +51,49 @@ class NelderMeadAlgorithm:
         rng: np.random.RandomState | None = None
             RandomState used for calculating initial points.
         block: bool = False
-            Sets whether to block the queue used internally.
+            Sets whether get_vertex waits for results when no vertex can be proposed.
         timeout: int | None = None
-            Time to block the queue.
+            Time to wait in get_vertex.
+        speculative: bool = False
+            Proposes the reflection, expansion, outside contraction, and inside contraction at once
+            so that they are evaluated in parallel.
+            The simplex is updated in the same way as the sequential algorithm once all of them are evaluated.
+        result_timeout: float | None = None
+            Seconds to wait for the result of a vertex output by NelderMead.
+            Vertices without results in time are regarded as inf, so that stragglers do not stall the algorithm.
+            Their results arriving later are taken into the simplex in the same way as enqueued results.
+        boundary: str = "penalty"
+            How to handle vertices out of the normalized range (0, 1).
+            "penalty" regards them as inf without proposing them,
+            "projection" clips them to the nearest point in the range,
+            and "reflection" reflects them back into the range at the bounds.
     Attributes:
-        vertices: list[npt.NDArray[np.float64]]
-            List of simplex parameters.
-        values: list[float]
-            List of simplex calculation results.
+        vertices: npt.NDArray[np.float64]
+            Simplex parameters of shape (dimensions + 1, dimensions) sorted by their results.
+            Updated in place by the main loop and has fewer vertices during initialization.
+        values: npt.NDArray[np.float64]
+            Simplex calculation results of shape (dimensions + 1,) in ascending order.
         generator: iterator
             Generator for NelderMead parameters.
         lock: threading.Lock
-            threading.Lock variable used for thread-safe processing.
+            threading.Lock variable held while advancing the generator.
         results: queue.Queue[tuple[npt.NDArray[np.float64], float, bool]]
             Queue to receive tuples of parameters, calculation results,
             and a boolean indicating whether the parameters were output by NelderMead.
         simplex_size: int
             Number of vertices in the simplex.
+        num_iterations: int
+            Number of iterations of the main loop started so far.
+        diameter: float
+            Maximum distance from the best vertex to the others, or inf until the simplex is initialized.
+        value_spread: float
+            Difference between the worst and the best results in the simplex, or inf until the simplex is initialized.
+        num_stalls: int
+            Number of consecutive iterations that did not improve the best result.
     """
 
-    vertices: list[npt.NDArray[np.float64]]
-    values: list[float]
+    vertices: npt.NDArray[np.float64]
+    values: npt.NDArray[np.float64]
 
     def __init__(
         self,
@@ -73,7 +102,13 @@ class NelderMeadAlgorithm:
         rng: np.random.RandomState | None = None,
         block: bool = False,
         timeout: int | None = None,
+        speculative: bool = False,
+        result_timeout: float | None = None,
+        boundary: str = "penalty",
     ) -> None:
+        if boundary not in ("penalty", "projection", "reflection"):
+            raise ValueError(f"boundary must be penalty, projection, or reflection, but {boundary} is given.")
+
         self.coeff = coeff if coeff is not None else NelderMeadCoefficient()
 
         self._rng = rng if rng is not None else np.random.RandomState()
@@ -83,10 +118,102 @@ class NelderMeadAlgorithm:
 
         self.results: queue.Queue[tuple[npt.NDArray[np.float64], float, bool]] = queue.Queue()
 
+        self._proposals: deque[npt.NDArray[np.float64]] = deque()
+        self._arrival = threading.Condition(threading.Lock())
+
         self.block = block
         self.timeout = timeout
+        self.speculative = speculative
+        self.boundary = boundary
+
+        self.result_timeout = result_timeout
+        self._pending_vertices: list[tuple[npt.NDArray[np.float64], float]] = []
+        self._timed_out_vertices: list[npt.NDArray[np.float64]] = []
 
         self.dimensions = dimensions
+        self.num_iterations = 0
+        self.num_stalls = 0
+
+        self.vertices = np.empty((0, dimensions if dimensions is not None else 0))
+        self.values = np.empty(0)
+
+    @property
+    def diameter(self) -> float:
+        if self.dimensions is None or len(self.vertices) < self.dimensions + 1:
+            return np.inf
+
+        return float(np.max(np.linalg.norm(self.vertices[1:] - self.vertices[0], axis=1)))
+
+    @property
+    def value_spread(self) -> float:
+        if self.dimensions is None or len(self.values) < self.dimensions + 1:
+            return np.inf
+
+        return float(self.values[-1] - self.values[0])
+
+    def is_converged(
+        self,
+        xtol: float | None = None,
+        ftol: float | None = None,
+        max_stalls: int | None = None,
+    ) -> bool:
+        """Method to check the convergence of the simplex
+
+        Args:
+            xtol: float | None = None
+                Converged if diameter is less than or equal to this value.
+            ftol: float | None = None
+                Converged if value_spread is less than or equal to this value.
+            max_stalls: int | None = None
+                Converged if num_stalls reaches this value.
+
+        Returns:
+            bool:
+                Whether any of the given criteria is satisfied.
+        """
+
+        return (
+            (xtol is not None and self.diameter <= xtol)
+            or (ftol is not None and self.value_spread <= ftol)
+            or (max_stalls is not None and self.num_stalls >= max_stalls)
+        )
+
+    def state_dict(self) -> dict[str, Any]:
+        """Method to return the state of the simplex
+
+        The state is valid only while no vertex of the current iteration has been evaluated yet,
+        i.e., right after get_vertex started a new iteration (num_iterations has changed).
+        Since no result is pending at that time, the simplex is enough to restore the algorithm.
+
+        Returns:
+            dict[str, Any]:
+                JSON-serializable state of the simplex.
+        """
+
+        return {
+            "vertices": self.vertices.tolist(),
+            "values": self.values.tolist(),
+            "num_iterations": self.num_iterations,
+            "num_stalls": self.num_stalls,
+        }
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        """Method to restore the state returned by state_dict
+
+        The next get_vertex restarts the iteration at which the state was taken.
+
+        Args:
+            state_dict: dict[str, Any]: State returned by state_dict.
+        """
+
+        vertices, values = state_dict["vertices"], state_dict["values"]
+        self.dimensions = len(vertices[0])
+        self._reset_simplex(vertices, values)
+        self.num_iterations = state_dict["num_iterations"] - 1  # the iteration will be started again
+        self.num_stalls = state_dict.get("num_stalls", 0)
+
+        self.generator = iter(self._main_loop())
+        self._abandon_iteration()
 
     def get_vertex(self, dimensions: int | None = None) -> npt.NDArray[np.float64]:
         """Method to return the next parameters for NelderMead
@@ -108,21 +235,60 @@ class NelderMeadAlgorithm:
                 "dimensions is not set yet. Please provide it on __init__ or get_vertex or call put_vertex in advance."
             )
 
-        with self.lock:
-            for vertex in self.generator:
-                if vertex is None:
-                    raise NelderMeadEmptyError(
-                        "Cannot generate new vertex now. Maybe get_vertex is called in parallel."
-                    )
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        vertex: npt.NDArray[np.float64] | None = None
+        while vertex is None:
+            try:
+                vertex = self._proposals.popleft()
+                break
+            except IndexError:
+                pass
+
+            with self.lock:
+                if len(self._proposals) == 0:
+                    self._fill_proposals()
+            if len(self._proposals) > 0:
+                continue
 
-                if all(0 < x < 1 for x in vertex):
-                    break
-                self.put_value(vertex, np.inf)
+            if not self.block or (deadline is not None and time.monotonic() >= deadline):
+                raise NelderMeadEmptyError("Cannot generate new vertex now. Maybe get_vertex is called in parallel.")
 
-        assert vertex is not None
+            self._wait_for_arrival(deadline)
+
+        if self.result_timeout is not None:
+            with self.lock:
+                self._pending_vertices.append((vertex, time.monotonic()))
 
         return vertex
 
+    def _fill_proposals(self) -> None:
+        # advance the generator until it waits for results; called only with self.lock held
+        num_proposals = len(self._proposals)
+        for vertex in self.generator:
+            if vertex is None:
+                break
+
+            if self._is_feasible(vertex):
+                self._proposals.append(vertex)
+            else:  # only initial or shrunk vertices derived from enqueued ones out of the range
+                self.put_value(vertex, np.inf)
+
+        # the calling thread takes one of the new proposals and the other ones are left to waiting threads
+        num_new_proposals = len(self._proposals) - num_proposals
+        if num_new_proposals > 1:
+            with self._arrival:
+                self._arrival.notify(num_new_proposals - 1)
+
+    def _wait_for_arrival(self, deadline: float | None) -> None:
+        timeout = self._queue_timeout()
+        if deadline is not None:
+            remaining = max(deadline - time.monotonic(), 0.0)
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        with self._arrival:
+            if self.results.empty() and len(self._proposals) == 0:
+                self._arrival.wait(timeout)
+
     def put_value(
         self,
         vertex: npt.NDArray[np.float64],
@@ -145,6 +311,9 @@ class NelderMeadAlgorithm:
 
         self.results.put((vertex, value, enqueue))
 
+        with self._arrival:  # a single waiting thread is enough to consume the result
+            self._arrival.notify()
+
     def _collect_enqueued_results(
         self,
         vertices: list[npt.NDArray[np.float64]] | None = None,
@@ -165,6 +334,41 @@ class NelderMeadAlgorithm:
 
         return vertices, values
 
+    def _pop_vertex(self, vertices: list[npt.NDArray[np.float64]], vertex: npt.NDArray[np.float64]) -> bool:
+        for index, v in enumerate(vertices):
+            if np.array_equal(v, vertex):
+                del vertices[index]
+                return True
+        return False
+
+    def _queue_timeout(self) -> float | None:
+        pending_vertices = self._pending_vertices
+        if self.result_timeout is None or len(pending_vertices) == 0:
+            return None
+
+        _, proposed_at = pending_vertices[0]
+
+        return max(proposed_at + self.result_timeout - time.monotonic(), 0.0)
+
+    def _abandon_iteration(self) -> None:
+        # the proposals of the abandoned iteration are discarded, and the results of its vertices arriving later
+        # are handled like enqueued ones instead of expiring as inf results of the new iteration
+        self._proposals.clear()
+        self._timed_out_vertices += [vertex for vertex, _ in self._pending_vertices]
+        self._pending_vertices = []
+
+    def _expire_pending_vertices(self) -> list[npt.NDArray[np.float64]]:
+        if self.result_timeout is None:
+            return []
+
+        deadline = time.monotonic() - self.result_timeout
+
+        expired_vertices = [vertex for vertex, proposed_at in self._pending_vertices if proposed_at <= deadline]
+        self._pending_vertices = [(v, t) for v, t in self._pending_vertices if t > deadline]
+        self._timed_out_vertices += expired_vertices
+
+        return expired_vertices
+
     def _wait_for_results(
         self,
         num_waiting: int,
@@ -174,7 +378,14 @@ class NelderMeadAlgorithm:
         enqueued_vertices, enqueued_values = list[npt.NDArray[np.float64]](), list[float]()
         while len(values) < num_waiting:
             try:
-                vertex, value, enqueue = self.results.get(block=self.block, timeout=self.timeout)
+                vertex, value, enqueue = self.results.get(block=False)
+                if not enqueue and self.result_timeout is not None:
+                    # a late result is no longer waited for and is handled like an enqueued one
+                    enqueue = self._pop_vertex(self._timed_out_vertices, vertex)
+                    self._pending_vertices = [
+                        (v, t) for v, t in self._pending_vertices if not np.array_equal(v, vertex)
+                    ]
+
                 if enqueue:
                     enqueued_vertices.append(vertex)
                     enqueued_values.append(value)
@@ -182,7 +393,12 @@ class NelderMeadAlgorithm:
                     vertices.append(vertex)
                     values.append(value)
             except queue.Empty:
-                yield None
+                expired_vertices = self._expire_pending_vertices()
+                vertices += expired_vertices
+                values += [np.inf] * len(expired_vertices)
+
+                if len(expired_vertices) == 0:
+                    yield None
 
         enqueued_vertices, enqueued_values = self._collect_enqueued_results(enqueued_vertices, enqueued_values)
 
@@ -190,8 +406,8 @@ class NelderMeadAlgorithm:
         if (len(self.values) == 0 and len(enqueued_values) > 0) or (
             len(self.values) > 0 and len(enqueued_values) > 0 and min(enqueued_values) < max(self.values)
         ):
-            new_vertices = self.vertices + vertices + enqueued_vertices
-            new_values = self.values + values + enqueued_values
+            new_vertices = [*self.vertices, *vertices, *enqueued_vertices]
+            new_values = [*self.values, *values, *enqueued_values]
 
             raise UnexpectedVerticesUpdateError(new_vertices, new_values)
 
@@ -203,16 +419,119 @@ class NelderMeadAlgorithm:
         _, values = yield from self._wait_for_results(1)
         return values[0]
 
-    def _generator(self) -> Generator[npt.NDArray[np.float64] | None, None, None]:  # noqa: C901
+    def _reset_simplex(self, vertices: list[npt.NDArray[np.float64]], values: list[float]) -> None:
+        assert self.dimensions is not None
+
+        order = np.argsort(values, kind="stable")[: self.dimensions + 1]
+        self.vertices = np.array(vertices, dtype=np.float64).reshape(-1, self.dimensions)[order]
+        self.values = np.array(values, dtype=np.float64)[order]
+
+        self._update_centroid()
+
+    def _update_centroid(self) -> None:
+        self._centroid_sum: npt.NDArray[np.float64] = self.vertices[:-1].sum(axis=0)
+        self._n_centroid_updates = 0
+
+    def _centroid(self) -> npt.NDArray[np.float64]:
+        return self._centroid_sum / (len(self.vertices) - 1)
+
+    def _sort_simplex(self) -> None:
+        order = np.argsort(self.values, kind="stable")
+        self.vertices[:] = self.vertices[order]
+        self.values[:] = self.values[order]
+
+        self._update_centroid()
+
+    def _replace_worst(self, vertex: npt.NDArray[np.float64], value: float) -> None:
+        # insert the new vertex in place of the worst one while keeping the simplex sorted
+        index = int(np.searchsorted(self.values[:-1], value, side="right"))
+        if index < len(self.values) - 1:
+            self._centroid_sum += vertex - self.vertices[-2]  # the second worst vertex becomes the worst one
+            self.vertices[index + 1 :] = self.vertices[index:-1]
+            self.values[index + 1 :] = self.values[index:-1]
+
+        self.vertices[index], self.values[index] = vertex, value
+
+        # recompute the centroid once in a while to cancel rounding errors of the incremental updates
+        self._n_centroid_updates += 1
+        if self._n_centroid_updates >= len(self.vertices):
+            self._update_centroid()
+
+    def _is_feasible(self, vertex: npt.NDArray[np.float64]) -> bool:
+        if self.boundary == "penalty":
+            return bool(np.all((vertex > 0) & (vertex < 1)))
+
+        return bool(np.all((vertex >= 0) & (vertex <= 1)))
+
+    def _to_range(self, vertices: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        if self.boundary == "projection":
+            return np.clip(vertices, 0.0, 1.0)
+        elif self.boundary == "reflection":
+            return np.abs((vertices + 1.0) % 2.0 - 1.0)  # reflects repeatedly at 0 and 1
+
+        return vertices
+
+    def _evaluate(self, vertex: npt.NDArray[np.float64]) -> Generator[npt.NDArray[np.float64] | None, None, float]:
+        # infeasible vertices are penalized here without being proposed
+        if not self._is_feasible(vertex):
+            return np.inf
+
+        yield vertex
+        return (yield from self._wait_for_result())
+
+    def _wait_for_candidates(
+        self,
+        candidates: npt.NDArray[np.float64],
+    ) -> Generator[None, None, npt.NDArray[np.float64]]:
+        vertices, values = yield from self._wait_for_results(len(candidates))
+
+        # results arrive in the order of completion, so they are matched to the nearest candidates
+        distances = np.linalg.norm(np.asarray(vertices)[:, None, :] - candidates[None, :, :], axis=-1)
+
+        matched_values: npt.NDArray[np.float64] = np.asarray(values, dtype=np.float64)[np.argmin(distances, axis=0)]
+        return matched_values
+
+    def _speculative_step(self) -> Generator[npt.NDArray[np.float64] | None, None, bool]:
+        yc = self._centroid()
+        coeffs = np.array([self.coeff.r, self.coeff.e, self.coeff.oc, self.coeff.ic])
+        candidates = self._to_range(yc + coeffs[:, None] * (yc - self.vertices[-1]))
+
+        feasible = np.array([self._is_feasible(candidate) for candidate in candidates])
+        candidate_values = np.full(len(candidates), np.inf)
+        if feasible.any():
+            yield from candidates[feasible]
+            candidate_values[feasible] = yield from self._wait_for_candidates(candidates[feasible])
+
+        yr, ye, yoc, yic = candidates
+        fr, fe, foc, fic = candidate_values
+
+        if self.values[0] <= fr < self.values[-2]:  # reflect
+            self._replace_worst(yr, fr)
+        elif fr < self.values[0]:  # expand
+            self._replace_worst(*((ye, fe) if fe < fr else (yr, fr)))
+        elif self.values[-2] <= fr < self.values[-1]:  # outside contract
+            if foc > fr:
+                return True
+            self._replace_worst(yoc, foc)
+        else:  # inside contract
+            if fic >= self.values[-1]:
+                return True
+            self._replace_worst(yic, fic)
+
+        return False
+
+    def _generator(self) -> Generator[npt.NDArray[np.float64] | None, None, None]:
         # initialization
 
-        self.vertices, self.values = self._collect_enqueued_results()
+        vertices, values = self._collect_enqueued_results()
 
         if self.dimensions is None:
             raise ValueError(
                 "dimensions is not set yet. Please provide it on __init__ or get_vertex or call put_vertex in advance."
             )
 
+        self._reset_simplex(vertices, values)
+
         if self.dimensions + 1 > len(self.vertices):
             try:
                 num_random_points = self.dimensions + 1 - len(self.vertices)
@@ -223,63 +542,70 @@ class NelderMeadAlgorithm:
 
                 random_vertices, random_values = yield from self._wait_for_results(num_random_points)
 
-                self.vertices = self.vertices + random_vertices
-                self.values = self.values + random_values
+                self._reset_simplex([*self.vertices, *random_vertices], [*self.values, *random_values])
             except UnexpectedVerticesUpdateError as e:
-                self.vertices, self.values = e.updated_vertices, e.updated_values
+                self._abandon_iteration()
+                self._reset_simplex(e.updated_vertices, e.updated_values)
+
+        yield from self._main_loop()
 
-        # main loop
+    def _main_loop(self) -> Generator[npt.NDArray[np.float64] | None, None, None]:  # noqa: C901
         shrink_requied = False
         while True:
             try:
-                # sort self.vertices by their self.values
-                order = np.argsort(self.values)[: self.dimensions + 1]
-                self.vertices = [self.vertices[idx] for idx in order]
-                self.values = [self.values[idx] for idx in order]
-
-                # reflect
-                yc = np.mean(self.vertices[:-1], axis=0)
-                yield (yr := yc + self.coeff.r * (yc - self.vertices[-1]))
-
-                fr = yield from self._wait_for_result()
+                self.num_iterations += 1
+                best_value = self.values[0]
 
-                if self.values[0] <= fr < self.values[-2]:
-                    self.vertices[-1], self.values[-1] = yr, fr
-
-                elif fr < self.values[0]:  # expand
-                    yield (ye := yc + self.coeff.e * (yc - self.vertices[-1]))
-
-                    fe = yield from self._wait_for_result()
+                if self.speculative:
+                    shrink_requied = yield from self._speculative_step()
+                else:
+                    # reflect
+                    yc = self._centroid()
+                    yr = self._to_range(yc + self.coeff.r * (yc - self.vertices[-1]))
+                    fr = yield from self._evaluate(yr)
 
-                    self.vertices[-1], self.values[-1] = (ye, fe) if fe < fr else (yr, fr)
+                    if self.values[0] <= fr < self.values[-2]:
+                        self._replace_worst(yr, fr)
 
-                elif self.values[-2] <= fr < self.values[-1]:  # outside contract
-                    yield (yoc := yc + self.coeff.oc * (yc - self.vertices[-1]))
+                    elif fr < self.values[0]:  # expand
+                        ye = self._to_range(yc + self.coeff.e * (yc - self.vertices[-1]))
+                        fe = yield from self._evaluate(ye)
 
-                    foc = yield from self._wait_for_result()
+                        self._replace_worst(*((ye, fe) if fe < fr else (yr, fr)))
 
-                    if foc <= fr:
-                        self.vertices[-1], self.values[-1] = yoc, foc
-                    else:
-                        shrink_requied = True
+                    elif self.values[-2] <= fr < self.values[-1]:  # outside contract
+                        yoc = self._to_range(yc + self.coeff.oc * (yc - self.vertices[-1]))
+                        foc = yield from self._evaluate(yoc)
 
-                elif self.values[-1] <= fr:  # inside contract
-                    yield (yic := yc + self.coeff.ic * (yc - self.vertices[-1]))
+                        if foc <= fr:
+                            self._replace_worst(yoc, foc)
+                        else:
+                            shrink_requied = True
 
-                    fic = yield from self._wait_for_result()
+                    elif self.values[-1] <= fr:  # inside contract
+                        yic = self._to_range(yc + self.coeff.ic * (yc - self.vertices[-1]))
+                        fic = yield from self._evaluate(yic)
 
-                    if fic < self.values[-1]:
-                        self.vertices[-1], self.values[-1] = yic, fic
-                    else:
-                        shrink_requied = True
+                        if fic < self.values[-1]:
+                            self._replace_worst(yic, fic)
+                        else:
+                            shrink_requied = True
 
                 # shrink
                 if shrink_requied:
-                    self.vertices = [(v0 := self.vertices[0]) + self.coeff.s * (v - v0) for v in self.vertices]
-                    yield from self.vertices[1:]
-
-                    self.vertices[1:], self.values[1:] = yield from self._wait_for_results(len(self.vertices[1:]))
+                    shrunk_vertices = self.vertices[1:]
+                    shrunk_vertices -= self.vertices[0]
+                    shrunk_vertices *= self.coeff.s
+                    shrunk_vertices += self.vertices[0]
+                    yield from shrunk_vertices.copy()
+
+                    vertices, values = yield from self._wait_for_results(len(shrunk_vertices))
+                    self.vertices[1:], self.values[1:] = vertices, values
+                    self._sort_simplex()
                     shrink_requied = False
 
+                self.num_stalls = 0 if self.values[0] < best_value else self.num_stalls + 1
+
             except UnexpectedVerticesUpdateError as e:
-                self.vertices, self.values = e.updated_vertices, e.updated_values
+                self._abandon_iteration()
+                self._reset_simplex(e.updated_vertices, e.updated_values)
@@ -1,24 +1,197 @@
 # Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
 # SPDX-License-Identifier: MIT
 
-from typing import Any
+from typing import Any, cast
 
 import argparse
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import asyncio
+from collections.abc import Callable
 from datetime import datetime
 from importlib import resources
-import json
+import os
 from pathlib import Path
-import shlex
-import subprocess
 import sys
+import warnings
 
 from hydra.utils import instantiate
+from omegaconf import DictConfig
 from omegaconf import OmegaConf as oc  # noqa: N813
 
-from optuna.trial import Trial
+import optuna
+from optuna import Study
+from optuna.trial import FrozenTrial, Trial, TrialState
 
 from aiaccel.config import pathlib2str_config, prepare_config, print_config
+from aiaccel.hpo.optuna.buffered_storage import BufferedStorage, buffered_study
+from aiaccel.hpo.optuna.hparams_manager import HparamsManager
+from aiaccel.hpo.optuna.warm_start import warm_start
+from aiaccel.hpo.runners import (
+    BaseRunner,
+    CachedRunner,
+    CallableRunner,
+    CommandRunner,
+    JobArrayRunner,
+    MissingResultError,
+    PersistentCommandRunner,
+)
+
+_logger = optuna.logging.get_logger("optuna.study.study")
+
+
+def _setup_child_watcher() -> None:
+    # Python < 3.12 watches each child process with a dedicated thread by default
+    if sys.version_info < (3, 12) and hasattr(os, "pidfd_open"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+
+            watcher = asyncio.PidfdChildWatcher()
+            asyncio.get_event_loop_policy().set_child_watcher(watcher)
+            watcher.attach_loop(asyncio.get_running_loop())
+
+
+def tell_trials(study: Study, results: list[tuple[Trial, Any]]) -> list[FrozenTrial]:
+    """Tells the results of trials that finished at the same time.
+
+    The results are written at once through :class:`~aiaccel.hpo.optuna.buffered_storage.BufferedStorage`,
+    which is a single transaction for RDB storages. Each trial is told by :meth:`optuna.study.Study.tell`
+    and its completion is logged as in :meth:`optuna.study.Study.optimize`.
+
+    Args:
+        study (Study): Study to tell. If its storage is not ``BufferedStorage``, it is wrapped by
+            :func:`~aiaccel.hpo.optuna.buffered_storage.buffered_study`.
+        results (list[tuple[Trial, Any]]): Pairs of trials and their objective value(s),
+            :class:`optuna.TrialPruned` for the trials pruned by their intermediate values,
+            or :class:`~aiaccel.hpo.runners.MissingResultError` for the trials that failed without their results.
+
+    Returns:
+        list[FrozenTrial]: The finished trials.
+    """
+
+    if not isinstance(study._storage, BufferedStorage):
+        study = buffered_study(study)
+
+    frozentrials = []
+    with cast(BufferedStorage, study._storage).buffer():
+        for trial, y in results:
+            if isinstance(y, optuna.TrialPruned):
+                frozentrial = study.tell(trial, state=TrialState.PRUNED)
+                _logger.info(f"Trial {frozentrial.number} pruned.")
+            elif isinstance(y, MissingResultError):
+                frozentrial = study.tell(trial, state=TrialState.FAIL)
+                _logger.warning(
+                    f"Trial {frozentrial.number} failed with parameters: {frozentrial.params} "
+                    f"because of the following error: {y!r}."
+                )
+            else:
+                frozentrial = study.tell(trial, y)
+                if frozentrial.state == TrialState.COMPLETE:
+                    study._log_completed_trial(frozentrial.values, frozentrial.number, frozentrial.params)
+
+            frozentrials.append(frozentrial)
+
+    return frozentrials
+
+
+def _run_callbacks(
+    study: Study, frozentrials: list[FrozenTrial], callbacks: list[Callable[[Study, FrozenTrial], None]]
+) -> None:
+    # allow the callbacks to call study.stop() as in study.optimize()
+    study._thread_local.in_optimize_loop = True
+    try:
+        for frozentrial in frozentrials:
+            for callback in callbacks:
+                callback(study, frozentrial)
+    finally:
+        study._thread_local.in_optimize_loop = False
+
+
+def create_runner(config: DictConfig) -> BaseRunner:
+    """Creates the runner that evaluates trials according to ``config.command``.
+
+    Args:
+        config (DictConfig): Configuration of ``aiaccel-hpo optimize``.
+
+    Returns:
+        BaseRunner: :class:`CallableRunner` if ``config.command`` has ``_target_``,
+        :class:`PersistentCommandRunner` if ``config.persistent`` is true, :class:`JobArrayRunner` if ``config.job``
+        is given, otherwise :class:`CommandRunner`. It is wrapped by :class:`CachedRunner` if ``config.cache``
+        is true, which stores the results in ``config.cache_directory`` if given.
+    """
+
+    runner: BaseRunner
+    if isinstance(config.command, DictConfig) and "_target_" in config.command:
+        runner = CallableRunner(config.command, config.n_max_jobs)
+    elif config.get("persistent", False):
+        runner = PersistentCommandRunner(config.command, config)
+    elif config.get("job") is not None:
+        runner = JobArrayRunner(config.command, config)
+    else:
+        runner = CommandRunner(config.command, config)
+
+    if config.get("cache", False):
+        cache_directory = config.get("cache_directory")
+        runner = CachedRunner(runner, config, Path(cache_directory) if cache_directory is not None else None)
+
+    return runner
+
+
+async def run_study(
+    config: DictConfig,
+    study: Study,
+    params: HparamsManager,
+    runner: BaseRunner,
+    callbacks: list[Callable[[Study, FrozenTrial], None]] | None = None,
+) -> None:
+    """Runs trials concurrently in a single event loop until ``config.n_trials`` trials finish.
+
+    Args:
+        config (DictConfig): Configuration of ``aiaccel-hpo optimize``.
+        study (Study): Study to optimize.
+        params (HparamsManager): Hyperparameters to suggest.
+        runner (BaseRunner): Runner that evaluates a trial and returns its objective value(s).
+            It is closed when the study finishes.
+        callbacks (list[Callable[[Study, FrozenTrial], None]] | None, optional): Functions called with each
+            finished trial, as ``callbacks`` of :meth:`optuna.study.Study.optimize`. If a callback calls
+            :meth:`optuna.study.Study.stop`, no more trials are submitted and the running trials are waited for.
+            Defaults to None.
+    """
+
+    _setup_child_watcher()
+
+    tasks: dict[asyncio.Task[Any], Trial] = {}
+    submitted_job_count = 0
+    finished_job_count = 0
+
+    study._stop_flag = False
+    buffered = buffered_study(study)  # to write the parameters and the results of each wakeup at once
+
+    async with runner:
+        while finished_job_count < config.n_trials and not (study._stop_flag and len(tasks) == 0):
+            active_jobs = len(tasks.keys())
+            available_slots = max(0, config.n_max_jobs - active_jobs) if not study._stop_flag else 0
+
+            # Submit trials to the event loop
+            trials = [buffered.ask() for _ in range(min(available_slots, config.n_trials - submitted_job_count))]
+            for trial, hparams in zip(trials, params.suggest_hparams_batch(trials), strict=True):
+                task = asyncio.create_task(runner(trial, hparams))
+
+                tasks[task] = trial
+                submitted_job_count += 1
+
+            # Get results from all trials finished by this wakeup and tell them at once
+            done_tasks, _ = await asyncio.wait(tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+            results: list[tuple[Trial, Any]] = []
+            for task in done_tasks:
+                trial = tasks.pop(task)
+                try:
+                    results.append((trial, task.result()))
+                except (optuna.TrialPruned, MissingResultError) as e:  # only this trial is pruned or failed
+                    results.append((trial, e))
+            frozentrials = tell_trials(buffered, results)
+            finished_job_count += len(results)
+
+            _run_callbacks(study, frozentrials, callbacks or [])
 
 
 def main() -> None:
@@ -43,6 +216,8 @@ See complete usage: https://aistairc.github.io/aiaccel/user_guide/hpo.html .
 Typical usages:
   aiaccel-hpo optimize params.x1=[0,1] params.x2=[0,1] -- ./objective.py --x1={x1} --x2={x2} {out_filename}
   aiaccel-hpo optimize --config=config.yaml ./objective.py --x1={x1} --x2={x2} {out_filename}
+  aiaccel-hpo optimize params.x1=[0,1] params.x2=[0,1] command._target_=objective.objective --
+  aiaccel-hpo optimize params.x1=[0,1] params.x2=[0,1] persistent=true -- ./objective_server.py
 """,
         formatter_class=argparse.RawTextHelpFormatter,
     )
@@ -58,10 +233,13 @@ Typical usages:
     else:
         working_directory = args.config.parent.resolve()
 
-    config = prepare_config(
-        config_filename=args.config,
-        working_directory=working_directory,
-        overwrite_config=oc.from_cli(oc_args),
+    config = cast(
+        DictConfig,
+        prepare_config(
+            config_filename=args.config,
+            working_directory=working_directory,
+            overwrite_config=oc.from_cli(oc_args),
+        ),
     )
 
     if len(args.command) > 0:
@@ -80,50 +258,16 @@ Typical usages:
     study = instantiate(config.study)
     params = instantiate(config.params)
 
-    # main loop
-    futures: dict[Any, tuple[Trial, Path]] = {}
-    submitted_job_count = 0
-    finished_job_count = 0
-
-    with ThreadPoolExecutor(config.n_max_jobs) as pool:
-        while finished_job_count < config.n_trials:
-            active_jobs = len(futures.keys())
-            available_slots = max(0, config.n_max_jobs - active_jobs)
-
-            # Submit job in ThreadPoolExecutor
-            for _ in range(min(available_slots, config.n_trials - submitted_job_count)):
-                trial = study.ask()
-
-                out_filename = config.working_directory / f"trial_{trial.number:0>6}.json"
-
-                future = pool.submit(
-                    subprocess.run,
-                    shlex.join(config.command).format(
-                        config=config,
-                        job_name=f"trial_{trial.number:0>6}",
-                        out_filename=out_filename,
-                        **params.suggest_hparams(trial),
-                    ),
-                    shell=True,
-                    check=True,
-                )
-
-                futures[future] = trial, out_filename
-                submitted_job_count += 1
+    if len(config.get("warm_start") or []) > 0:
+        trials = warm_start(study, params, oc.to_container(config.warm_start, resolve=True))  # type: ignore[arg-type]
+        _logger.info(f"{len(trials)} trials are imported from the previous studies.")
 
-            # Get result from out_filename and tell
-            done_features, _ = wait(futures.keys(), return_when=FIRST_COMPLETED)
-            for future in done_features:
-                trial, out_filename = futures.pop(future)
+    callbacks = [instantiate(callback) for callback in config.get("callbacks") or []]
 
-                with open(out_filename) as f:
-                    y = json.load(f)
-
-                out_filename.unlink()
+    # main loop
+    runner = create_runner(config)
 
-                frozentrial = study.tell(trial, y)
-                study._log_completed_trial(y if isinstance(y, list) else [y], frozentrial.number, frozentrial.params)
-                finished_job_count += 1
+    asyncio.run(run_study(config, study, params, runner, callbacks))
 
 
 if __name__ == "__main__":
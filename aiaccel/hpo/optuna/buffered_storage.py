@@ -0,0 +1,298 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+from collections.abc import Container, Iterator, Sequence
+import contextlib
+import copy
+from datetime import datetime
+import threading
+
+import optuna
+from optuna import Study
+from optuna.distributions import BaseDistribution
+from optuna.storages import BaseStorage, RDBStorage
+from optuna.study._frozen import FrozenStudy
+from optuna.study._study_direction import StudyDirection
+from optuna.trial import FrozenTrial, TrialState
+
+try:  # private API of Optuna to commit several writes in a single transaction
+    from optuna.storages._cached_storage import _CachedStorage
+    from optuna.storages._rdb import models
+    from optuna.storages._rdb.storage import _create_scoped_session
+except ImportError:
+    _RDB_BATCHING_SUPPORTED = False
+else:
+    _RDB_BATCHING_SUPPORTED = all(
+        hasattr(RDBStorage, name)
+        for name in ["_set_trial_param_without_commit", "_set_trial_value_without_commit", "check_trial_is_updatable"]
+    ) and hasattr(models.TrialModel, "find_or_raise_by_id")
+
+
+def _get_rdb_backend(storage: BaseStorage) -> RDBStorage | None:
+    # the RDB storage whose writes can be committed in a single transaction, if any
+    if not _RDB_BATCHING_SUPPORTED:
+        return None
+
+    backend = storage._backend if isinstance(storage, _CachedStorage) else storage
+    return backend if isinstance(backend, RDBStorage) else None
+
+
+class _Buffer(threading.local):
+    def __init__(self) -> None:
+        self.depth = 0
+        self.params: dict[int, list[tuple[str, float, BaseDistribution]]] = {}
+        self.states: dict[int, tuple[TrialState, Sequence[float] | None, datetime]] = {}
+        # read only once until flushed, as the finished trials and the written best trial are not updated here
+        self.finished_trials: dict[int, FrozenTrial] = {}
+        self.written_best_trial: dict[int, FrozenTrial | None] = {}
+
+
+class BufferedStorage(BaseStorage):
+    """Storage that writes the parameters and the results of trials at once.
+
+    Inside :meth:`buffer`, :meth:`set_trial_param` and :meth:`set_trial_state_values` with a finished state are
+    kept in memory, and they are written when the outermost :meth:`buffer` exits. For RDB storages, they are
+    committed in a single transaction, and the other storages are written one by one. The buffered writes are
+    visible to the reads through this storage, e.g., by samplers, but not to other processes until written.
+    The other methods are delegated to the wrapped storage as they are. A buffered storage is meant to be
+    used for a single study, as :func:`buffered_study` does.
+
+    The single transaction relies on private API of Optuna. If it is not available, RDB storages are also
+    written one by one.
+
+    Args:
+        storage (BaseStorage): Storage to wrap, typically ``study._storage``.
+    """
+
+    def __init__(self, storage: BaseStorage) -> None:
+        self.storage = storage
+        self._buffer = _Buffer()
+
+    @contextlib.contextmanager
+    def buffer(self) -> Iterator[None]:
+        """Keeps the writes of parameters and results until the outermost context exits."""
+
+        self._buffer.depth += 1
+        try:
+            yield
+        finally:
+            self._buffer.depth -= 1
+            if self._buffer.depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered parameters and results."""
+
+        params, self._buffer.params = self._buffer.params, {}
+        states, self._buffer.states = self._buffer.states, {}
+        self._buffer.finished_trials.clear()
+        self._buffer.written_best_trial.clear()
+        if len(params) == 0 and len(states) == 0:
+            return
+
+        backend = _get_rdb_backend(self.storage)
+        if backend is None:
+            for trial_id, trial_params in params.items():
+                for param in trial_params:
+                    self.storage.set_trial_param(trial_id, *param)
+            for trial_id, (state, values, _) in states.items():
+                self.storage.set_trial_state_values(trial_id, state, values)
+            return
+
+        with _create_scoped_session(backend.scoped_session) as session:
+            for trial_id, trial_params in params.items():
+                for param in trial_params:
+                    backend._set_trial_param_without_commit(session, trial_id, *param)
+
+            # same as RDBStorage.set_trial_state_values for finished states
+            for trial_id, (state, values, datetime_complete) in states.items():
+                trial_model = models.TrialModel.find_or_raise_by_id(trial_id, session, for_update=True)
+                backend.check_trial_is_updatable(trial_id, trial_model.state)  # type: ignore[arg-type]
+
+                for objective, value in enumerate(values or []):
+                    backend._set_trial_value_without_commit(session, trial_id, objective, value)
+
+                trial_model.state = state
+                trial_model.datetime_complete = datetime_complete
+
+    def _is_buffered(self, trial_id: int) -> bool:
+        return trial_id in self._buffer.params or trial_id in self._buffer.states
+
+    def _apply_buffer(self, trial: FrozenTrial) -> FrozenTrial:
+        trial = copy.deepcopy(trial)
+        for name, value, distribution in self._buffer.params.get(trial._trial_id, []):
+            trial.params = {**trial.params, name: distribution.to_external_repr(value)}
+            trial.distributions = {**trial.distributions, name: distribution}
+
+        if trial._trial_id in self._buffer.states:
+            trial.state, values, trial.datetime_complete = self._buffer.states[trial._trial_id]
+            trial.values = None if values is None else list(values)
+
+        return trial
+
+    # buffered writes
+
+    def set_trial_param(
+        self, trial_id: int, param_name: str, param_value_internal: float, distribution: BaseDistribution
+    ) -> None:
+        if self._buffer.depth == 0:
+            self.storage.set_trial_param(trial_id, param_name, param_value_internal, distribution)
+            return
+
+        # the compatibility of the distributions is checked by Trial and when written
+        if trial_id not in self._buffer.params:
+            self.check_trial_is_updatable(trial_id, self.get_trial(trial_id).state)
+            self._buffer.params[trial_id] = []
+
+        self._buffer.params[trial_id].append((param_name, param_value_internal, distribution))
+
+    def set_trial_state_values(self, trial_id: int, state: TrialState, values: Sequence[float] | None = None) -> bool:
+        if self._buffer.depth == 0 or not state.is_finished():
+            return self.storage.set_trial_state_values(trial_id, state, values)
+
+        # Study.tell checks the state in the storage, which is checked again when written
+        if trial_id in self._buffer.states:
+            self.check_trial_is_updatable(trial_id, self._buffer.states[trial_id][0])
+        self._buffer.states[trial_id] = (state, values, datetime.now())
+        self._buffer.finished_trials.pop(trial_id, None)
+
+        return True
+
+    # reads that see the buffered writes
+
+    def get_trial(self, trial_id: int) -> FrozenTrial:
+        if trial_id in self._buffer.states:
+            if trial_id not in self._buffer.finished_trials:
+                self._buffer.finished_trials[trial_id] = self._apply_buffer(self.storage.get_trial(trial_id))
+            return copy.deepcopy(self._buffer.finished_trials[trial_id])
+
+        trial = self.storage.get_trial(trial_id)
+        return self._apply_buffer(trial) if self._is_buffered(trial_id) else trial
+
+    def get_all_trials(
+        self, study_id: int, deepcopy: bool = True, states: Container[TrialState] | None = None
+    ) -> list[FrozenTrial]:
+        if len(self._buffer.params) == 0 and len(self._buffer.states) == 0:
+            return self.storage.get_all_trials(study_id, deepcopy=deepcopy, states=states)
+
+        trials = [
+            self._apply_buffer(trial) if self._is_buffered(trial._trial_id) else trial
+            for trial in self.storage.get_all_trials(study_id, deepcopy=deepcopy)
+        ]
+        return trials if states is None else [trial for trial in trials if trial.state in states]
+
+    def get_n_trials(self, study_id: int, state: tuple[TrialState, ...] | TrialState | None = None) -> int:
+        if len(self._buffer.states) == 0:
+            return self.storage.get_n_trials(study_id, state)
+        return super().get_n_trials(study_id, state)
+
+    def get_best_trial(self, study_id: int) -> FrozenTrial:
+        completed = [
+            (trial_id, values[0])
+            for trial_id, (state, values, _) in self._buffer.states.items()
+            if state == TrialState.COMPLETE and values is not None
+        ]
+        if len(completed) == 0:
+            return self.storage.get_best_trial(study_id)
+
+        directions = self.get_study_directions(study_id)
+        if len(directions) > 1:
+            raise RuntimeError("Best trial can be obtained only for single-objective optimization.")
+
+        if study_id not in self._buffer.written_best_trial:
+            try:
+                self._buffer.written_best_trial[study_id] = self.storage.get_best_trial(study_id)
+            except ValueError:  # no completed trials are written yet
+                self._buffer.written_best_trial[study_id] = None
+
+        # compare the values without reading the buffered trials, and the written trials win ties
+        sign = 1.0 if directions[0] == StudyDirection.MINIMIZE else -1.0
+        best_trial_id, best_value = min(completed, key=lambda item: sign * item[1])
+        written_best_trial = self._buffer.written_best_trial[study_id]
+        if written_best_trial is not None and sign * written_best_trial.values[0] <= sign * best_value:
+            return copy.deepcopy(written_best_trial)
+
+        return self.get_trial(best_trial_id)
+
+    def get_trial_params(self, trial_id: int) -> dict[str, Any]:
+        return self.get_trial(trial_id).params
+
+    def get_trial_param(self, trial_id: int, param_name: str) -> float:
+        trial = self.get_trial(trial_id)
+        return trial.distributions[param_name].to_internal_repr(trial.params[param_name])
+
+    # delegated
+
+    def create_new_study(self, directions: Sequence[StudyDirection], study_name: str | None = None) -> int:
+        return self.storage.create_new_study(directions, study_name)
+
+    def delete_study(self, study_id: int) -> None:
+        self.storage.delete_study(study_id)
+
+    def set_study_user_attr(self, study_id: int, key: str, value: Any) -> None:
+        self.storage.set_study_user_attr(study_id, key, value)
+
+    def set_study_system_attr(self, study_id: int, key: str, value: Any) -> None:
+        self.storage.set_study_system_attr(study_id, key, value)
+
+    def get_study_id_from_name(self, study_name: str) -> int:
+        return self.storage.get_study_id_from_name(study_name)
+
+    def get_study_name_from_id(self, study_id: int) -> str:
+        return self.storage.get_study_name_from_id(study_id)
+
+    def get_study_directions(self, study_id: int) -> list[StudyDirection]:
+        return self.storage.get_study_directions(study_id)
+
+    def get_study_user_attrs(self, study_id: int) -> dict[str, Any]:
+        return self.storage.get_study_user_attrs(study_id)
+
+    def get_study_system_attrs(self, study_id: int) -> dict[str, Any]:
+        return self.storage.get_study_system_attrs(study_id)
+
+    def get_all_studies(self) -> list[FrozenStudy]:
+        return self.storage.get_all_studies()
+
+    def create_new_trial(self, study_id: int, template_trial: FrozenTrial | None = None) -> int:
+        return self.storage.create_new_trial(study_id, template_trial)
+
+    def set_trial_intermediate_value(self, trial_id: int, step: int, intermediate_value: float) -> None:
+        self.storage.set_trial_intermediate_value(trial_id, step, intermediate_value)
+
+    def set_trial_user_attr(self, trial_id: int, key: str, value: Any) -> None:
+        self.storage.set_trial_user_attr(trial_id, key, value)
+
+    def set_trial_system_attr(self, trial_id: int, key: str, value: Any) -> None:
+        self.storage.set_trial_system_attr(trial_id, key, value)
+
+    def get_trial_id_from_study_id_trial_number(self, study_id: int, trial_number: int) -> int:
+        return self.storage.get_trial_id_from_study_id_trial_number(study_id, trial_number)
+
+    def get_trial_number_from_id(self, trial_id: int) -> int:
+        return self.storage.get_trial_number_from_id(trial_id)
+
+    def get_trial_user_attrs(self, trial_id: int) -> dict[str, Any]:
+        return self.storage.get_trial_user_attrs(trial_id)
+
+    def get_trial_system_attrs(self, trial_id: int) -> dict[str, Any]:
+        return self.storage.get_trial_system_attrs(trial_id)
+
+    def remove_session(self) -> None:
+        self.storage.remove_session()
+
+
+def buffered_study(study: Study) -> Study:
+    """Creates a view of a study whose storage is wrapped by :class:`BufferedStorage`.
+
+    Args:
+        study (Study): Study to wrap.
+
+    Returns:
+        Study: Study sharing the storage, sampler, and pruner with ``study``.
+    """
+
+    return optuna.Study(
+        study_name=study.study_name, storage=BufferedStorage(study._storage), sampler=study.sampler, pruner=study.pruner
+    )
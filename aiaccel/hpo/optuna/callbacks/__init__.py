@@ -0,0 +1,6 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from aiaccel.hpo.optuna.callbacks.nelder_mead_convergence_callback import NelderMeadConvergenceCallback
+
+__all__ = ["NelderMeadConvergenceCallback"]
@@ -0,0 +1,60 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from optuna.study import Study
+from optuna.trial import FrozenTrial
+
+from aiaccel.hpo.optuna.samplers.nelder_mead_sampler import NelderMeadSampler
+
+
+class NelderMeadConvergenceCallback:
+    """Callback to stop the optimization when NelderMeadSampler has converged
+
+    The study is stopped by :meth:`optuna.study.Study.stop` once every simplex of the sampler satisfies
+    any of the given criteria. Trials that are already running still finish.
+    Note that simplices restarted by restart_diameter or restart_stalls of the sampler rarely converge all at once.
+
+    Example:
+
+        .. code-block:: python
+
+            study = optuna.create_study(sampler=NelderMeadSampler(search_space=search_space, seed=42))
+            study.optimize(objective, n_trials=1000, callbacks=[NelderMeadConvergenceCallback(xtol=1e-4)])
+
+        In ``aiaccel-hpo optimize``:
+
+        .. code-block:: yaml
+
+            callbacks:
+              - _target_: aiaccel.hpo.optuna.callbacks.NelderMeadConvergenceCallback
+                xtol: 1.0e-4
+
+    Args:
+        xtol: float | None = None
+            Maximum diameter of a converged simplex in the normalized space.
+        ftol: float | None = None
+            Maximum difference between the worst and the best results of a converged simplex.
+        max_stalls: int | None = None
+            Number of consecutive iterations without improvement after which a simplex is converged.
+
+    """
+
+    def __init__(
+        self,
+        xtol: float | None = None,
+        ftol: float | None = None,
+        max_stalls: int | None = None,
+    ) -> None:
+        if xtol is None and ftol is None and max_stalls is None:
+            raise ValueError("At least one of xtol, ftol, and max_stalls must be given.")
+
+        self.xtol = xtol
+        self.ftol = ftol
+        self.max_stalls = max_stalls
+
+    def __call__(self, study: Study, trial: FrozenTrial) -> None:
+        if not isinstance(study.sampler, NelderMeadSampler):
+            raise TypeError(f"NelderMeadConvergenceCallback requires NelderMeadSampler, but got {study.sampler}.")
+
+        if study.sampler.is_converged(self.xtol, self.ftol, self.max_stalls):
+            study.stop()
@@ -1,11 +1,12 @@
 # Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
 # SPDX-License-Identifier: MIT
 
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar, cast
 
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
 
+from optuna.distributions import CategoricalDistribution, FloatDistribution, IntDistribution
 from optuna.trial import Trial
 
 T = TypeVar("T")
@@ -32,6 +33,10 @@ class Float(Hparam[float]):
     step: float | None = None
     log: bool = False
 
+    @property
+    def distribution(self) -> FloatDistribution:
+        return FloatDistribution(low=self.low, high=self.high, step=self.step, log=self.log)
+
     def __call__(self, trial: Trial, name: str) -> float:
         return trial.suggest_float(name=name, low=self.low, high=self.high, step=self.step, log=self.log)
 
@@ -43,6 +48,10 @@ class Int(Hparam[int]):
     step: int = 1
     log: bool = False
 
+    @property
+    def distribution(self) -> IntDistribution:
+        return IntDistribution(low=self.low, high=self.high, step=self.step, log=self.log)
+
     def __call__(self, trial: Trial, name: str) -> int:
         return trial.suggest_int(name=name, low=self.low, high=self.high, step=self.step, log=self.log)
 
@@ -51,5 +60,88 @@ class Int(Hparam[int]):
 class Categorical(Hparam[None | bool | int | float | str]):
     choices: Sequence[None | bool | int | float | str]
 
+    @property
+    def distribution(self) -> CategoricalDistribution:
+        return CategoricalDistribution(choices=self.choices)
+
     def __call__(self, trial: Trial, name: str) -> None | bool | int | float | str:
         return trial.suggest_categorical(name=name, choices=self.choices)
+
+
+@dataclass
+class Choice(Hparam[Any]):
+    """Categorical hyperparameter whose choices have their own hyperparameters.
+
+    Only the hyperparameters of the chosen sub-space are suggested,
+    and those of the other sub-spaces are left out by :class:`HparamsManager` unless given in ``defaults``.
+    Each sub-space is defined in the same way as the hyperparameters of :class:`HparamsManager`
+    and can contain another :class:`Choice`.
+
+    Args:
+        choices (dict[Any, dict[str, Any] | None]): Sub-space of each choice.
+        defaults (dict[str, Any] | None, optional): Values given to the hyperparameters of the sub-spaces
+            that are not chosen. Defaults to None.
+    """
+
+    choices: dict[Any, dict[str, Any] | None]
+    defaults: dict[str, Any] | None = None
+    subspaces: dict[Any, dict[str, Callable[[Trial, str], Any]]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.subspaces = {
+            choice: {name: as_hparam(param) for name, param in (subspace or {}).items()}
+            for choice, subspace in self.choices.items()
+        }
+
+    @property
+    def distribution(self) -> CategoricalDistribution:
+        return CategoricalDistribution(choices=list(self.choices))
+
+    def __call__(self, trial: Trial, name: str) -> Any:
+        return trial.suggest_categorical(name=name, choices=list(self.choices))
+
+
+@dataclass
+class When(Hparam[T]):
+    """Hyperparameter that is suggested only if another hyperparameter takes one of the given values.
+
+    The other hyperparameter must be defined before this one.
+
+    Args:
+        key (str): Name of the hyperparameter that activates this one.
+        values (Sequence[Any]): Values of ``key`` for which this hyperparameter is suggested.
+        hparam (Hparam[T]): Hyperparameter to suggest when active.
+        default (T | None, optional): Value given when inactive. Defaults to None, which means that this
+            hyperparameter is left out when inactive.
+    """
+
+    key: str
+    values: Sequence[Any]
+    hparam: Hparam[T]
+    default: T | None = None
+
+    def is_active(self, hparams: dict[str, Any]) -> bool:
+        return self.key in hparams and hparams[self.key] in self.values
+
+    def __call__(self, trial: Trial, name: str) -> T:
+        return self.hparam(trial, name)
+
+
+def as_hparam(param: Any) -> Callable[[Trial, str], Any]:
+    """Converts a hyperparameter definition into a callable.
+
+    Args:
+        param (Any): Callable such as :class:`Hparam`, a list of the lower and upper bounds of :class:`Float`,
+            or a constant value.
+
+    Returns:
+        Callable[[Trial, str], Any]: Function that takes a trial and a name and returns the hyperparameter value.
+    """
+
+    if callable(param):
+        return cast(Callable[[Trial, str], Any], param)
+    elif isinstance(param, list):
+        low, high = param
+        return Float(low=low, high=high)
+    else:
+        return Const(value=param)
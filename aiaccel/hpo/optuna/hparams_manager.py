@@ -3,11 +3,69 @@
 
 from typing import Any
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
+import contextlib
 
+from optuna.distributions import BaseDistribution, CategoricalDistribution, IntDistribution
 from optuna.trial import Trial
 
-from aiaccel.hpo.optuna.hparams import Const, Float, Hparam, T
+from aiaccel.hpo.optuna.buffered_storage import BufferedStorage
+from aiaccel.hpo.optuna.hparams import Categorical, Choice, Const, Float, Hparam, Int, T, When, as_hparam
+
+
+def _compile_distributions(params: dict[str, Callable[[Trial, str], Any]]) -> dict[str, BaseDistribution]:
+    distributions: dict[str, BaseDistribution] = {}
+    for name, param in params.items():
+        if isinstance(param, When):
+            param = param.hparam
+
+        if isinstance(param, Float | Int | Categorical | Choice):
+            distributions[name] = param.distribution
+        if isinstance(param, Choice):
+            for subspace in param.subspaces.values():
+                distributions |= _compile_distributions(subspace)
+
+    return distributions
+
+
+def _param_names(params: dict[str, Callable[[Trial, str], Any]]) -> list[str]:
+    names = list(params)
+    for param in params.values():
+        if isinstance(param, When):
+            param = param.hparam
+
+        if isinstance(param, Choice):
+            for subspace in param.subspaces.values():
+                names += _param_names(subspace)
+
+    return names
+
+
+def _set_unchosen_subspaces(choice: Choice, chosen: list[Any], hparams: dict[str, Any]) -> None:
+    # the hyperparameters of the sub-spaces that are not chosen are left out unless they have defaults
+    defaults = choice.defaults or {}
+    for key, subspace in choice.subspaces.items():
+        if key not in chosen:
+            for sub_name in _param_names(subspace):
+                if sub_name in defaults:
+                    hparams.setdefault(sub_name, defaults[sub_name])
+
+
+def _convert_param(value: Any, distribution: BaseDistribution) -> Any:
+    # values read from CSV are strings
+    if isinstance(distribution, CategoricalDistribution):
+        if isinstance(value, str) and value not in distribution.choices:
+            value = next((choice for choice in distribution.choices if str(choice) == value), value)
+    elif isinstance(value, str):
+        value = float(value)
+
+    internal_value = distribution.to_internal_repr(value)
+    if not distribution._contains(internal_value) or (
+        isinstance(distribution, IntDistribution) and not internal_value.is_integer()
+    ):
+        raise ValueError(f"{value!r} is not contained in {distribution}.")
+
+    return distribution.to_external_repr(internal_value)
 
 
 class HparamsManager:
@@ -18,30 +76,37 @@ class HparamsManager:
     Attributes:
         params (dict): A dictionary where keys are hyperparameter names and values
                        are callables that take a Trial object and return a hyperparameter value.
+        distributions (dict[str, BaseDistribution]): Distributions of the ``Float``, ``Int``, ``Categorical``,
+                       and ``Choice`` hyperparameters including conditional ones.
     Methods:
         __init__(**params_def: dict[str, int | float | str | list[int | float] | Hparam[T]]) -> None:
             Initializes the HparamsManager with the given hyperparameter definitions.
         suggest_hparams(trial: Trial) -> dict[str, float | int | str | list[float | int | str]]:
             Suggests hyperparameters for the given trial.
+        suggest_hparams_batch(trials: Sequence[Trial]) -> list[dict[str, Any]]:
+            Suggests hyperparameters for the given trials and writes their parameters at once.
+        map_params(params: dict[str, Any]) -> dict[str, Any] | None:
+            Maps the parameters of a trial of another study onto this search space.
     """
 
     def __init__(self, **params_def: dict[str, int | float | str | list[int | float] | Hparam[T]]) -> None:
-        self.params: dict[str, Callable[[Trial, str], Any]] = {}
-        for name, param in params_def.items():
-            if callable(param):
-                self.params[name] = param
-            else:
-                if isinstance(param, list):
-                    low, high = param
-                    self.params[name] = Float(low=low, high=high)
-                else:
-                    self.params[name] = Const(value=param)
+        self.params: dict[str, Callable[[Trial, str], Any]] = {
+            name: as_hparam(param) for name, param in params_def.items()
+        }
+
+    @property
+    def distributions(self) -> dict[str, BaseDistribution]:
+        return _compile_distributions(self.params)
 
     def suggest_hparams(self, trial: Trial) -> dict[str, float | int | str | list[float | int | str]]:
         """
         Suggests hyperparameters for a given trial.
         This method generates a dictionary of hyperparameters by applying the
         parameter functions stored in `self.params` to the provided trial.
+        Only the active hyperparameters of ``Choice`` and ``When`` are suggested,
+        and the inactive ones are left out unless their defaults are given.
+        The parameters are written at once if the storage of the trial is ``BufferedStorage``
+        (see ``suggest_hparams_batch``).
         Args:
             trial (Trial): An Optuna trial object used to suggest hyperparameters.
         Returns:
@@ -51,4 +116,102 @@ class HparamsManager:
             these types.
         """
 
-        return {name: param_fn(trial, name) for name, param_fn in self.params.items()}
+        return self.suggest_hparams_batch([trial])[0]
+
+    def suggest_hparams_batch(
+        self, trials: Sequence[Trial]
+    ) -> list[dict[str, float | int | str | list[float | int | str]]]:
+        """
+        Suggests hyperparameters for several trials at once.
+        If the trials belong to a study whose storage is ``BufferedStorage``, e.g., created by
+        ``aiaccel.hpo.optuna.buffered_storage.buffered_study``, the parameters of all the trials are
+        written after they are sampled, which is a single transaction for RDB storages.
+        Otherwise, each parameter is written by ``Trial.suggest_*`` one by one.
+        Args:
+            trials (Sequence[Trial]): Optuna trial objects used to suggest hyperparameters.
+        Returns:
+            list[dict[str, float | int | str | list[float | int | str]]]: The hyperparameters of each trial
+            in the same order as ``trials``.
+        """
+
+        storages = {id(trial.storage): trial.storage for trial in trials}.values()
+        with contextlib.ExitStack() as stack:
+            for storage in storages:
+                if isinstance(storage, BufferedStorage):
+                    stack.enter_context(storage.buffer())
+
+            hparams_list: list[dict[str, Any]] = []
+            for trial in trials:
+                hparams_list.append({})
+                self._suggest(trial, self.params, hparams_list[-1])
+
+        return hparams_list
+
+    def _suggest(self, trial: Trial, params: dict[str, Callable[[Trial, str], Any]], hparams: dict[str, Any]) -> None:
+        for name, param_fn in params.items():
+            hparam = param_fn.hparam if isinstance(param_fn, When) else param_fn
+
+            if isinstance(param_fn, When) and not param_fn.is_active(hparams):
+                if param_fn.default is not None:
+                    hparams[name] = param_fn.default
+                if isinstance(hparam, Choice):
+                    _set_unchosen_subspaces(hparam, [], hparams)
+                continue
+
+            hparams[name] = param_fn(trial, name)
+
+            if isinstance(hparam, Choice):
+                _set_unchosen_subspaces(hparam, [hparams[name]], hparams)
+                self._suggest(trial, hparam.subspaces[hparams[name]], hparams)
+
+    def map_params(self, params: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Maps the parameters of a trial of another study onto this search space.
+        The active hyperparameters are determined from ``params`` in the same way as ``suggest_hparams``,
+        and the parameters that are not defined here are dropped.
+        Values given as strings, e.g., read from CSV, are converted by the distributions.
+        Args:
+            params (dict[str, Any]): Parameters of the trial.
+        Returns:
+            dict[str, Any] | None: Parameters of the active hyperparameters, which can be given to
+            ``optuna.trial.create_trial`` with ``distributions``, or None if any of them is missing,
+            out of its distribution, or not defined by ``Float``, ``Int``, ``Categorical``, or ``Choice``.
+        """
+
+        mapped_params: dict[str, Any] = {}
+        try:
+            self._map(self.params, params, {}, mapped_params)
+        except (KeyError, ValueError):
+            return None
+
+        return mapped_params
+
+    def _map(
+        self,
+        params: dict[str, Callable[[Trial, str], Any]],
+        values: dict[str, Any],
+        hparams: dict[str, Any],
+        mapped_params: dict[str, Any],
+    ) -> None:
+        for name, param_fn in params.items():
+            hparam = param_fn.hparam if isinstance(param_fn, When) else param_fn
+
+            if isinstance(param_fn, When) and not param_fn.is_active(hparams):
+                if param_fn.default is not None:
+                    hparams[name] = param_fn.default
+                if isinstance(hparam, Choice):
+                    _set_unchosen_subspaces(hparam, [], hparams)
+                continue
+
+            if isinstance(hparam, Const):
+                hparams[name] = hparam.value
+                continue
+
+            if not isinstance(hparam, Float | Int | Categorical | Choice):
+                raise ValueError(f"{name} has no distribution.")
+
+            hparams[name] = mapped_params[name] = _convert_param(values[name], hparam.distribution)
+
+            if isinstance(hparam, Choice):
+                _set_unchosen_subspaces(hparam, [hparams[name]], hparams)
+                self._map(hparam.subspaces[hparams[name]], values, hparams, mapped_params)
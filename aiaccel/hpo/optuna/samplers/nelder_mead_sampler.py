@@ -7,7 +7,9 @@ import numpy.typing as npt
 from typing import Any
 
 from collections.abc import Sequence
+import contextlib
 import math
+import threading
 import warnings
 
 import numpy as np
@@ -21,6 +23,31 @@ from aiaccel.hpo.algorithms import NelderMeadAlgorithm, NelderMeadCoefficient, N
 
 __all__ = ["NelderMeadSampler", "NelderMeadEmptyError"]
 
+_SNAPSHOT_KEY = "nelder_mead_snapshot"
+_MAX_SKIPPED_DUPLICATES = 100  # a simplex shrunk into a single discrete point proposes duplicates forever
+
+
+def _denormalize(value: float, distribution: BaseDistribution) -> Any:
+    if isinstance(distribution, optuna.distributions.CategoricalDistribution):  # ordinal encoding
+        return distribution.choices[min(int(value * len(distribution.choices)), len(distribution.choices) - 1)]
+
+    assert hasattr(distribution, "high")
+    assert hasattr(distribution, "low")
+    assert hasattr(distribution, "log")
+    if distribution.log:  # log scale
+        high = math.log(distribution.high)
+        low = math.log(distribution.low)
+        param_value = math.exp((high - low) * value + low)
+    else:
+        param_value = (distribution.high - distribution.low) * value + distribution.low
+
+    if isinstance(distribution, optuna.distributions.IntDistribution):
+        param_value = int(param_value)
+    if hasattr(distribution, "step") and distribution.step is not None:
+        param_value -= (param_value - distribution.low) % distribution.step
+
+    return param_value
+
 
 class NelderMeadSampler(optuna.samplers.BaseSampler):
     """Sampler using the NelderMead algorithm
@@ -30,6 +57,12 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
     (Even if set by e.g. optuna.optimize(n_jobs=2),
     the calculation is performed in series except in initial and shrink.)
     If parallelisation is enabled, set block = True.
+    With speculative = True, the reflection, expansion, and contractions of each iteration
+    are calculated in parallel (four trials at a time) instead of in series.
+    With num_simplices > 1, independent simplices run local searches in parallel,
+    and each trial is given to a simplex that can output parameters.
+    Categorical parameters are encoded as the order of their choices,
+    and their bounds in search_space are not used (e.g., give (0, 1)).
 
     When using optuna.enqueue_trial(),
     the enqueued parameters are calculated separately from the parameters determined by NelderMeadSampler
@@ -76,10 +109,47 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
             Sampler to output parameters when NelderMead cannot output parameters.
             Mainly intended for use on free computation nodes in parallel.
             If the sub_sampler function is enabled, it must be set with block = False.
+        speculative: bool = False
+            Proposes the reflection, expansion, outside contraction, and inside contraction at once.
+            The trajectory of the simplex is the same as the non-speculative NelderMead,
+            but more trials are evaluated per iteration in exchange for less waiting.
+        snapshot_interval: int | None = None
+            Minimum number of trials between snapshots of the NelderMead state,
+            which are stored in the study system attrs.
+            On resumption, only the trials after the latest snapshot are replayed.
+            If None, no snapshot is taken and all trials are replayed.
+            Snapshots require the trials to be evaluated one at a time, and cannot be combined with
+            speculative, block, result_timeout, or multiple simplices. A snapshot is skipped with a warning
+            while another trial is running.
+        result_timeout: float | None = None
+            Seconds to wait for a trial output by NelderMead before regarding its result as inf.
+            Failed trials and trials pruned without values are always regarded as inf.
+        num_simplices: int = 1
+            Number of independent simplices, each of which starts from its own random initial points.
+            The simplex of each trial is stored in trial.system_attrs["nm_index"].
+            Enqueued and sub_sampler results are given to all simplices.
+        restart_diameter: float | None = None
+            Restarts a simplex from new random points when its diameter in the normalized space
+            gets smaller than or equal to this value.
+        restart_stalls: int | None = None
+            Restarts a simplex from new random points when its best result has not improved
+            for this number of consecutive iterations.
+        boundary: str = "penalty"
+            How to handle vertices out of the search space.
+            "penalty" regards them as inf without running trials,
+            "projection" clips them to the nearest point in the search space,
+            and "reflection" reflects them back into the search space at the bounds.
+        skip_duplicates: bool = False
+            Does not run trials whose parameters after rounding int, stepped, and categorical parameters
+            are the same as those of a finished or running trial.
+            The result of the finished trial is given to NelderMead instead,
+            or that of the running trial once it finishes.
 
     Attributes:
         nm: NelderMeadAlgorithm
-            Instance of a class that manages the NelderMead algorithm.
+            Instance of a class that manages the NelderMead algorithm (the first simplex).
+        simplices: list[NelderMeadAlgorithm]
+            Instances managing the NelderMead algorithm of each simplex.
 
     """
 
@@ -91,19 +161,104 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
         coeff: NelderMeadCoefficient | None = None,
         block: bool = False,
         sub_sampler: optuna.samplers.BaseSampler | None = None,
+        speculative: bool = False,
+        snapshot_interval: int | None = None,
+        result_timeout: float | None = None,
+        num_simplices: int = 1,
+        restart_diameter: float | None = None,
+        restart_stalls: int | None = None,
+        boundary: str = "penalty",
+        skip_duplicates: bool = False,
     ) -> None:
         self._search_space = search_space
-        _rng = rng if rng is not None else np.random.RandomState(seed) if seed is not None else None
+        self._rng = rng if rng is not None else np.random.RandomState(seed) if seed is not None else None
+
+        self.num_simplices = num_simplices
+        self.restart_diameter = restart_diameter
+        self.restart_stalls = restart_stalls
+        self._multi_simplex = num_simplices > 1 or restart_diameter is not None or restart_stalls is not None
+        if self._multi_simplex and snapshot_interval is not None:
+            raise ValueError("snapshot_interval is not supported with multiple simplices or restarts.")
+        if snapshot_interval is not None and (speculative or block or result_timeout is not None):
+            raise ValueError("snapshot_interval is not supported with speculative, block, or result_timeout.")
+
+        # the other simplices draw initial points from random states derived from this seed
+        self._base_seed: int | None = None
+        if self._multi_simplex:
+            self._base_seed = seed if seed is not None else np.random.RandomState().randint(2**31)
+
+        self.block = block
+        self._algorithm_kwargs: dict[str, Any] = {
+            "dimensions": len(self._search_space),
+            "coeff": coeff,
+            "block": block and num_simplices == 1,  # multiple simplices are polled without blocking
+            "speculative": speculative,
+            "result_timeout": result_timeout,
+            "boundary": boundary,
+        }
+        self.simplices = [self._create_simplex(index, 0) for index in range(num_simplices)]
+        self._generations = [0] * num_simplices
+        self._next_index = 0
+        self._condition = threading.Condition()
 
-        self.nm = NelderMeadAlgorithm(
-            dimensions=len(self._search_space),
-            coeff=coeff,
-            rng=_rng,
-            block=block,
-        )
         self.sub_sampler = sub_sampler
         self.num_trial = 1
 
+        self._param_indices = {name: index for index, name in enumerate(self._search_space)}
+        self._trial_system_attrs: dict[int, dict[str, Any]] = {}
+
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_trial_number = 0
+
+        # distributions are known only after the parameters are suggested at least once
+        self._distributions: dict[str, BaseDistribution] = {}
+
+        self.skip_duplicates = skip_duplicates
+        self._cache_lock = threading.Lock()
+        self._cached_values: dict[tuple[Any, ...], float] = {}
+        self._running_duplicates: dict[tuple[Any, ...], list[tuple[int, int, npt.NDArray[np.float64]]]] = {}
+
+    @property
+    def nm(self) -> NelderMeadAlgorithm:
+        return self.simplices[0]
+
+    def is_converged(
+        self,
+        xtol: float | None = None,
+        ftol: float | None = None,
+        max_stalls: int | None = None,
+    ) -> bool:
+        """Checks whether all simplices have converged.
+
+        Args:
+            xtol: float | None = None
+                Maximum diameter of a converged simplex in the normalized space.
+            ftol: float | None = None
+                Maximum difference between the worst and the best results of a converged simplex.
+            max_stalls: int | None = None
+                Number of consecutive iterations without improvement after which a simplex is converged.
+
+        Returns:
+            bool
+                True if every simplex satisfies any of the given criteria.
+
+        """
+        return all(nm.is_converged(xtol, ftol, max_stalls) for nm in self.simplices)
+
+    def _create_simplex(self, index: int, generation: int) -> NelderMeadAlgorithm:
+        if index == 0 and generation == 0:
+            rng = self._rng
+        else:
+            assert self._base_seed is not None
+            rng = np.random.RandomState([self._base_seed, index, generation])
+
+        return NelderMeadAlgorithm(rng=rng, **self._algorithm_kwargs)
+
+    def _restart(self, index: int, generation: int) -> None:
+        # results of the old simplex arriving later are discarded by their generation
+        self._generations[index] = generation
+        self.simplices[index] = self._create_simplex(index, generation)
+
     def infer_relative_search_space(self, study: Study, trial: FrozenTrial) -> dict[str, BaseDistribution]:
         return {}
 
@@ -115,46 +270,197 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
     ) -> dict[str, Any]:
         return {}
 
-    def _get_params(self, study: Study, trial: FrozenTrial) -> npt.NDArray[np.float64] | None:
-        try:
-            params = self.nm.get_vertex()
-        except NelderMeadEmptyError as e:
-            if self.sub_sampler is None:
-                raise e
-            else:
-                self.sub_sampler.before_trial(study, trial)
+    def _get_vertex(self, index: int) -> npt.NDArray[np.float64] | None:
+        if self.simplices[index].is_converged(xtol=self.restart_diameter, max_stalls=self.restart_stalls):
+            self._restart(index, self._generations[index] + 1)
+
+        return self._get_new_vertex(index)
+
+    def _get_new_vertex(self, index: int) -> npt.NDArray[np.float64] | None:
+        num_skipped = 0
+        while True:
+            try:
+                params = self.simplices[index].get_vertex()
+            except NelderMeadEmptyError:
                 return None
-        return params
+
+            if num_skipped >= _MAX_SKIPPED_DUPLICATES or not self._resolve_duplicate(index, params):
+                return params
+            num_skipped += 1
+
+    def _cache_key(self, param_values: dict[str, Any]) -> tuple[Any, ...] | None:
+        if not self._search_space.keys() <= self._distributions.keys() & param_values.keys():
+            return None
+
+        return tuple(self._distributions[name].to_internal_repr(param_values[name]) for name in self._search_space)
+
+    def _vertex_cache_key(self, params: npt.NDArray[np.float64]) -> tuple[Any, ...] | None:
+        if not self._search_space.keys() <= self._distributions.keys():
+            return None
+
+        return self._cache_key(
+            {
+                name: _denormalize(params[index], self._distributions[name])
+                for name, index in self._param_indices.items()
+            }
+        )
+
+    def _resolve_duplicate(self, index: int, params: npt.NDArray[np.float64]) -> bool:
+        # returns True if the vertex needs no trial since the same parameters are finished or running
+        if not self.skip_duplicates or (key := self._vertex_cache_key(params)) is None:
+            return False
+
+        with self._cache_lock:
+            if key in self._cached_values:
+                value = self._cached_values[key]
+            elif key in self._running_duplicates:
+                self._running_duplicates[key].append((index, self._generations[index], params))
+                return True
+            else:
+                self._running_duplicates[key] = []
+                return False
+
+        self.simplices[index].put_value(params, value)
+        return True
+
+    def _put_duplicates(self, key: tuple[Any, ...] | None, value: float | None) -> None:
+        # caches the result unless the trial failed and gives it to the vertices waiting for the same parameters
+        if not self.skip_duplicates or key is None:
+            return
+
+        with self._cache_lock:
+            if value is not None:
+                self._cached_values[key] = value
+            duplicates = self._running_duplicates.pop(key, [])
+
+        for index, generation, params in duplicates:
+            system_attr = {"nm_index": index, "nm_generation": generation}
+            self._put_value(system_attr, params, np.inf if value is None else value)
+
+    def _get_params(self, study: Study, trial: FrozenTrial) -> tuple[npt.NDArray[np.float64] | None, int]:
+        # must be called with self._condition held if the simplices are restarted or snapshotted
+        while True:
+            for offset in range(self.num_simplices):
+                index = (self._next_index + offset) % self.num_simplices
+                params = self._get_vertex(index)
+                if params is not None:
+                    self._next_index = (index + 1) % self.num_simplices
+                    return params, index
+
+            if self.num_simplices == 1 or not self.block or self.sub_sampler is not None:
+                break
+
+            self._condition.wait()  # until any result is put
+
+        if self.sub_sampler is None:
+            raise NelderMeadEmptyError("Cannot generate new vertex now. Maybe get_vertex is called in parallel.")
+
+        self.sub_sampler.before_trial(study, trial)
+        return None, 0
+
+    def _get_system_attrs(self, study: Study, trial: FrozenTrial) -> dict[str, Any]:
+        # the system attrs set by before_trial are cached to avoid querying the storage for every parameter
+        if trial._trial_id in self._trial_system_attrs:
+            return self._trial_system_attrs[trial._trial_id]
+
+        return study._storage.get_trial_system_attrs(trial._trial_id)
+
+    def _set_system_attr(self, study: Study, trial: FrozenTrial, key: str, value: Any) -> None:
+        study._storage.set_trial_system_attr(trial._trial_id, key, value)
+        self._trial_system_attrs.setdefault(trial._trial_id, {})[key] = value
+
+    def _put_value(self, system_attr: dict[str, Any], params: npt.NDArray[np.float64], value: float) -> None:
+        index = system_attr.get("nm_index", 0)
+        if self._generations[index] == system_attr.get("nm_generation", 0):
+            self.simplices[index].put_value(params, value)
+
+    def _normalize(self, name: str, value: Any, distribution: BaseDistribution | None) -> float:
+        if isinstance(distribution, optuna.distributions.CategoricalDistribution):
+            return (distribution.to_internal_repr(value) + 0.5) / len(distribution.choices)
+
+        low, high = self._search_space[name]
+        return float((value - low) / (high - low))
 
     def _put_params(self, study: Study, trial: FrozenTrial, state: TrialState, values: Sequence[float] | None) -> None:
+        system_attr = self._get_system_attrs(study, trial)
+        for name, distribution in trial.distributions.items():
+            self._distributions.setdefault(name, distribution)
+
         if isinstance(values, list):
-            system_attr = study._storage.get_trial_system_attrs(trial._trial_id)
             if "params" in system_attr and "fixed_params" not in system_attr:
                 params = np.array(system_attr["params"])
+                self._put_value(system_attr, params, values[0])
+                self._put_duplicates(self._vertex_cache_key(params), values[0])
             else:  # sub_sampler or enqueued
-                it = zip(trial.params.values(), self._search_space.values(), strict=False)
-                params = np.array([(value - low) / (high - low) for value, (low, high) in it])
+                params = np.array(
+                    [
+                        self._normalize(name, trial.params[name], trial.distributions.get(name))
+                        for name in self._search_space
+                        if name in trial.params
+                    ]
+                )
+
+                for nm in self.simplices:
+                    nm.put_value(params, values[0], enqueue=True)
+                self._put_duplicates(self._cache_key(trial.params), values[0])
 
-            self.nm.put_value(
-                params,
-                values[0],
-                enqueue="fixed_params" in system_attr or "sub_trial" in system_attr,
-            )
             if "sub_trial" in system_attr and self.sub_sampler is not None:
                 self.sub_sampler.after_trial(study, trial, state, values)
+        elif "params" in system_attr and "fixed_params" not in system_attr:  # failed or pruned without values
+            params = np.array(system_attr["params"])
+            self._put_value(system_attr, params, np.inf)
+            self._put_duplicates(self._vertex_cache_key(params), None)
+
+        if self.num_simplices > 1:
+            with self._condition:
+                self._condition.notify_all()
+
+    def _save_snapshot(self, study: Study, trial: FrozenTrial) -> None:
+        # the state is taken at the beginning of an iteration, whose first vertex is given to this trial.
+        # it covers the results of the earlier trials only if they have all finished,
+        # and no later trial has started, since the resumption replays the trials from this trial on
+        unfinished_trials = study._storage.get_all_trials(
+            study._study_id, deepcopy=False, states=(TrialState.RUNNING, TrialState.WAITING)
+        )
+        if any(
+            t.number != trial.number and (t.state == TrialState.RUNNING or t.number < trial.number)
+            for t in unfinished_trials
+        ):
+            warnings.warn("Snapshot of NelderMeadSampler is skipped because other trials are running.", stacklevel=2)
+            return
+
+        snapshot: dict[str, Any] = {"trial_number": trial.number, "nelder_mead": self.nm.state_dict()}
+        study._storage.set_study_system_attr(study._study_id, _SNAPSHOT_KEY, snapshot)
+
+        self._snapshot_trial_number = trial.number
 
     def _resumption(self, study: Study) -> None:
         trials = study._storage.get_all_trials(study._study_id, deepcopy=False)
 
+        snapshot = study._storage.get_study_system_attrs(study._study_id).get(_SNAPSHOT_KEY)
+        if snapshot is not None:
+            self.nm.load_state_dict(snapshot["nelder_mead"])
+            self._snapshot_trial_number = snapshot["trial_number"]
+
+            self.num_trial += snapshot["trial_number"]
+            trials = trials[snapshot["trial_number"] :]
+
         for trial in trials:
             self.num_trial += 1
-            if trial.values is None:
+            if not trial.state.is_finished():
                 continue
 
             # ask
             system_attr = study._storage.get_trial_system_attrs(trial._trial_id)
-            if "fixed_params" not in system_attr:  # not enqueued trial
-                self._get_params(study, trial)
+            if "params" in system_attr and "fixed_params" not in system_attr:  # trial of NelderMead
+                index, generation = system_attr.get("nm_index", 0), system_attr.get("nm_generation", 0)
+                if generation < self._generations[index]:  # finished after the simplex was restarted
+                    continue
+                elif generation > self._generations[index]:
+                    self._restart(index, generation)
+
+                self._get_new_vertex(index)
+                self._next_index = (index + 1) % self.num_simplices
 
             # tell
             self._put_params(study, trial, trial.state, trial.values)
@@ -169,6 +475,8 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
         If the NelderMead parameters cannot be output and sub_sampler is None, a NelderMeadEmptyError is raised.
         If sub_sampler is specified, sub_sampler.before_trial() is executed,
         and trial.user_attr["sub_trial"] is set to True.
+        These attributes are also kept by the sampler until after_trial,
+        so that sample_independent and after_trial do not query the storage.
 
         Args:
             study: Study
@@ -180,7 +488,7 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
             None
 
         """
-        if self.num_trial < trial._trial_id:  # resumption
+        if self.num_trial < trial.number + 1:  # resumption (trial ids are not per-study on every storage)
             self._resumption(study)
         self.num_trial += 1
         params: npt.NDArray[np.float64] | None
@@ -189,16 +497,33 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
             fixed_params = trial.system_attrs["fixed_params"]
             if fixed_params.keys() != self._search_space.keys():
                 raise RuntimeError("All parameters must be given when executing enqueue_trial.")
-            study._storage.set_trial_system_attr(trial._trial_id, "fixed_params", trial.system_attrs["fixed_params"])
+            self._set_system_attr(study, trial, "fixed_params", trial.system_attrs["fixed_params"])
 
             params = np.array([fixed_params[name] for name in self._search_space])
         else:
-            params = self._get_params(study, trial)
+            # NelderMeadAlgorithm is thread-safe by itself, so a single simplex is shared without the lock
+            lock = self._condition if self._multi_simplex or self.snapshot_interval is not None else None
+            with lock or contextlib.nullcontext():
+                num_iterations = self.nm.num_iterations
+                params, index = self._get_params(study, trial)
+                generation = self._generations[index]
+
+                if (
+                    self.snapshot_interval is not None
+                    and self.nm.num_iterations != num_iterations
+                    and trial.number - self._snapshot_trial_number >= self.snapshot_interval
+                ):
+                    self._save_snapshot(study, trial)
+
             if params is None:  # sub trial
-                study._storage.set_trial_system_attr(trial._trial_id, "sub_trial", True)
+                self._set_system_attr(study, trial, "sub_trial", True)
                 return
 
-        study._storage.set_trial_system_attr(trial._trial_id, "params", list(params))
+            if self._multi_simplex:
+                self._set_system_attr(study, trial, "nm_index", index)
+                self._set_system_attr(study, trial, "nm_generation", generation)
+
+        self._set_system_attr(study, trial, "params", list(params))
 
     def sample_independent(
         self,
@@ -230,37 +555,23 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
                 A parameter value.
 
         """
-        system_attr = study._storage.get_trial_system_attrs(trial._trial_id)
+        system_attr = self._get_system_attrs(study, trial)
         if "sub_trial" in system_attr and self.sub_sampler is not None:
             param_value = self.sub_sampler.sample_independent(study, trial, param_name, param_distribution)
-            if self._search_space[param_name][0] <= param_value <= self._search_space[param_name][1]:
+            if isinstance(param_distribution, optuna.distributions.CategoricalDistribution) or (
+                self._search_space[param_name][0] <= param_value <= self._search_space[param_name][1]
+            ):
                 return param_value
             else:
                 raise ValueError(
                     f"Sub_sampler {self.sub_sampler} outputs out-of-range parameters. {param_name} : {param_value}"
                 )
 
-        if param_name not in self._search_space:
+        if param_name not in self._param_indices:
             raise ValueError(f"The parameter name, {param_name}, is not found in the given search_space.")
 
-        param_index = list(self._search_space.keys()).index(param_name)
-        param_value = system_attr["params"][param_index]
-
-        # reverse normalization
-        assert hasattr(param_distribution, "high")
-        assert hasattr(param_distribution, "low")
-        assert hasattr(param_distribution, "log")
-        if param_distribution.log:  # log scale
-            high = math.log(param_distribution.high)
-            low = math.log(param_distribution.low)
-            param_value = math.exp((high - low) * param_value + low)
-        else:
-            param_value = (param_distribution.high - param_distribution.low) * param_value + param_distribution.low
-
-        if isinstance(param_distribution, optuna.distributions.IntDistribution):
-            param_value = int(param_value)
-        if hasattr(param_distribution, "step") and param_distribution.step is not None:
-            param_value -= (param_value - param_distribution.low) % param_distribution.step
+        self._distributions.setdefault(param_name, param_distribution)
+        param_value = _denormalize(system_attr["params"][self._param_indices[param_name]], param_distribution)
 
         contains = param_distribution._contains(param_distribution.to_internal_repr(param_value))
         if not contains:
@@ -303,4 +614,7 @@ class NelderMeadSampler(optuna.samplers.BaseSampler):
                 "Multidimentional trial values are obtained. "
                 "NelderMeadSampler supports only single objective optimization."
             )
-        self._put_params(study, trial, state, values)
+        try:
+            self._put_params(study, trial, state, values)
+        finally:
+            self._trial_system_attrs.pop(trial._trial_id, None)
@@ -0,0 +1,140 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+from collections.abc import Mapping, Sequence
+import csv
+import json
+from pathlib import Path
+
+import optuna
+from optuna import Study
+from optuna.storages import BaseStorage, JournalStorage
+from optuna.storages.journal import JournalFileBackend
+from optuna.trial import FrozenTrial, TrialState
+
+from aiaccel.hpo.optuna.hparams_manager import HparamsManager
+
+_WARM_START_KEY = "aiaccel:warm_start"
+
+_logger = optuna.logging.get_logger(__name__)
+
+
+def _open_storage(storage: str) -> str | BaseStorage:
+    if "://" in storage:
+        return storage
+    elif storage.endswith(".journal"):
+        return JournalStorage(JournalFileBackend(storage))
+    else:
+        return f"sqlite:///{Path(storage).resolve()}"
+
+
+def load_results(
+    storage: str | None = None,
+    study_name: str | None = None,
+    csv_filename: str | None = None,
+) -> list[tuple[dict[str, Any], list[float]]]:
+    """Loads the parameters and the objective values of the completed trials of a previous study.
+
+    Args:
+        storage (str | None, optional): Path to ``optuna.db``, path to a ``.journal`` file, or storage URL.
+            Defaults to None.
+        study_name (str | None, optional): Name of the study in ``storage``, which can be omitted if the storage has
+            a single study. Defaults to None.
+        csv_filename (str | None, optional): CSV file exported by ``study.trials_dataframe().to_csv()``, which is
+            read instead of ``storage``. The parameters are given as strings. Defaults to None.
+
+    Returns:
+        list[tuple[dict[str, Any], list[float]]]: Parameters and objective values of each trial.
+
+    Raises:
+        ValueError: If neither ``storage`` nor ``csv_filename`` is given.
+    """
+
+    if csv_filename is not None:
+        with open(csv_filename, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+        results = []
+        for row in rows:
+            if row.get("state", "COMPLETE") != "COMPLETE":
+                continue
+
+            params = {
+                key.removeprefix("params_"): value
+                for key, value in row.items()
+                if key.startswith("params_") and value != ""  # empty if not suggested
+            }
+
+            value_keys = ["value"] if "value" in row else [key for key in row if key.startswith("values_")]
+            results.append((params, [float(row[key]) for key in value_keys]))
+
+        return results
+    elif storage is not None:
+        study = optuna.load_study(study_name=study_name, storage=_open_storage(storage))
+
+        return [
+            (trial.params, trial.values) for trial in study.get_trials(deepcopy=False, states=(TrialState.COMPLETE,))
+        ]
+    else:
+        raise ValueError("Either storage or csv_filename must be given.")
+
+
+def warm_start(study: Study, params: HparamsManager, sources: Sequence[Mapping[str, Any]]) -> list[FrozenTrial]:
+    """Imports the completed trials of previous studies into a study at once by ``study.add_trials``.
+
+    The parameters of each trial are mapped onto the search space of ``params`` by
+    :meth:`HparamsManager.map_params`, and the trials that do not fit it or the number of objectives are skipped.
+    The imported trials have the user attribute ``warm_start``, and each source is imported only once even if
+    the study is resumed. Samplers such as TPE and :class:`NelderMeadSampler` take the trials into account
+    in the same way as the trials evaluated in the study.
+
+    Args:
+        study (Study): Study to import the trials into.
+        params (HparamsManager): Hyperparameters of the study.
+        sources (Sequence[Mapping[str, Any]]): Keyword arguments of :func:`load_results` for each previous study.
+
+    Returns:
+        list[FrozenTrial]: The imported trials.
+    """
+
+    imported_sources = study._storage.get_study_system_attrs(study._study_id).get(_WARM_START_KEY, [])
+
+    distributions = params.distributions
+
+    trials = []
+    for source in sources:
+        source_id = json.dumps(dict(source), sort_keys=True)
+        if source_id in imported_sources:
+            continue
+
+        results = load_results(**source)
+
+        n_skipped = 0
+        for trial_params, values in results:
+            mapped_params = params.map_params(trial_params)
+            if mapped_params is None or len(values) != len(study.directions):
+                n_skipped += 1
+                continue
+
+            trials.append(
+                optuna.trial.create_trial(
+                    params=mapped_params,
+                    distributions={name: distributions[name] for name in mapped_params},
+                    values=values,
+                    user_attrs={"warm_start": source_id},
+                )
+            )
+
+        if n_skipped > 0:
+            _logger.warning(
+                f"{n_skipped} of {len(results)} trials of {source_id} do not fit the study and are skipped."
+            )
+
+        imported_sources.append(source_id)
+
+    study.add_trials(trials)
+    study._storage.set_study_system_attr(study._study_id, _WARM_START_KEY, imported_sources)
+
+    return trials
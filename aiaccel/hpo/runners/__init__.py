@@ -0,0 +1,20 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from aiaccel.hpo.runners.base_runner import BaseRunner
+from aiaccel.hpo.runners.cached_runner import CachedRunner
+from aiaccel.hpo.runners.callable_runner import CallableRunner
+from aiaccel.hpo.runners.command_runner import CommandRunner
+from aiaccel.hpo.runners.job_array_runner import JobArrayRunner, MissingResultError
+from aiaccel.hpo.runners.persistent_command_runner import PersistentCommandRunner, serve
+
+__all__ = [
+    "BaseRunner",
+    "CachedRunner",
+    "CallableRunner",
+    "CommandRunner",
+    "JobArrayRunner",
+    "MissingResultError",
+    "PersistentCommandRunner",
+    "serve",
+]
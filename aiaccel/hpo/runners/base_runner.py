@@ -0,0 +1,37 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+from optuna.trial import Trial
+
+
+class BaseRunner:
+    """Base class of runners that evaluate trials for ``aiaccel-hpo optimize``.
+
+    Runners are asynchronous context managers, which call :meth:`close` on exit.
+    """
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        """Evaluates the objective for a trial.
+
+        Args:
+            trial (Trial): Trial to evaluate.
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            Any: Objective value(s) to tell.
+        """
+
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Releases resources held by the runner."""
+
+        pass
+
+    async def __aenter__(self) -> "BaseRunner":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
@@ -0,0 +1,206 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import hashlib
+from importlib.machinery import PathFinder
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import warnings
+
+from omegaconf import DictConfig
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+from optuna.trial import Trial
+
+from aiaccel.config import collect_git_status_from_config
+from aiaccel.hpo.runners.base_runner import BaseRunner
+from aiaccel.hpo.runners.command_runner import _field_names
+
+
+def _find_module_file(target: str) -> str | None:
+    # resolve the module of ``_target_`` as CallableRunner does, i.e., with the cwd on the path, without importing it
+    origin, path = None, [os.getcwd(), *sys.path]
+    parts = target.split(".")
+    for index in range(len(parts)):
+        spec = PathFinder.find_spec(".".join(parts[: index + 1]), path)
+        if spec is None:
+            break
+
+        origin = spec.origin if spec.has_location else None
+        if spec.submodule_search_locations is None:
+            break
+        path = list(spec.submodule_search_locations)
+
+    return origin
+
+
+def _replace_path(value: Any, path: str, placeholder: str) -> Any:
+    if isinstance(value, str):
+        return value.replace(path, placeholder)
+    elif isinstance(value, list):
+        return [_replace_path(item, path, placeholder) for item in value]
+    elif isinstance(value, dict):
+        return {
+            _replace_path(key, path, placeholder): _replace_path(item, path, placeholder) for key, item in value.items()
+        }
+
+    return value
+
+
+def _hash_git_state(directory: str) -> str | None:
+    # the commit ID and the uncommitted changes of tracked files of the repository containing the directory
+    result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=directory, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+
+    diff = subprocess.run(["git", "diff", "HEAD"], cwd=directory, capture_output=True).stdout
+
+    return f"{result.stdout.strip()}:{hashlib.sha256(diff).hexdigest()}"
+
+
+class CachedRunner(BaseRunner):
+    """Answers trials from the results of identical evaluations instead of running them again.
+
+    Each result is stored in ``{cache_directory}/{key}.json``, where the key is the SHA-256 hash of
+
+    - the command formatted with ``config`` and the hyperparameters (``{job_name}`` and ``{out_filename}`` are
+      left as they are) or the configuration of the callable,
+    - the hyperparameters,
+    - the size and modification time of the files named by the arguments of the command, e.g., the objective
+      script, or the content of the module of the callable, which is looked up in the current directory first,
+    - the commit ID and the uncommitted changes of the git repository of the current directory, and
+    - the commit IDs of the git repositories of the packages referenced by ``_target_`` in ``config``.
+
+    The cache is thus invalidated by editing the objective or committing to the packages. If tracked files of
+    the packages have uncommitted changes, which cannot be hashed reliably, the cache is disabled with a warning.
+    The working directory in the command and the paths of the files is replaced with ``{config.working_directory}``
+    so that studies in different working directories can share the results through ``cache_directory``.
+    The trials answered from the cache have the user attribute ``cached`` set to True.
+    Failed and pruned trials are not cached.
+
+    Args:
+        runner (BaseRunner): Runner that evaluates the trials not found in the cache.
+        config (DictConfig): Configuration of ``aiaccel-hpo optimize``.
+        cache_directory (Path | None, optional): Directory of the cache.
+            Defaults to None, which means ``{config.working_directory}/cache``.
+    """
+
+    def __init__(self, runner: BaseRunner, config: DictConfig, cache_directory: Path | None = None) -> None:
+        self.runner = runner
+        self.config = config
+        self.cache_directory = cache_directory or Path(config.working_directory) / "cache"
+
+        self.commit_ids: dict[str, str] | None = {}
+        for status in collect_git_status_from_config(config):
+            # untracked files, e.g., the outputs of the optimization, do not change the code
+            if any(not line.startswith("??") for line in status.status):
+                warnings.warn(
+                    f"Result cache is disabled because {status.package_name} has uncommitted changes.", stacklevel=2
+                )
+                self.commit_ids = None
+                break
+
+            self.commit_ids[status.package_name] = status.commit_id
+
+        self.git_state = _hash_git_state(os.getcwd())
+
+    def _format_command(self, hparams: dict[str, Any]) -> Any:
+        command = self.config.command
+        if isinstance(command, DictConfig):
+            return oc.to_container(command, resolve=True)
+
+        # the arguments are left out in the same way as CommandRunner
+        fields = {"config": self.config, "job_name": "{job_name}", "out_filename": "{out_filename}"} | hparams
+        return [arg.format(**fields) for arg in command if _field_names(arg) <= fields.keys()]
+
+    def cache_key(self, hparams: dict[str, Any]) -> str:
+        """Computes the key of the result of the given hyperparameters.
+
+        Args:
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            str: Hexadecimal SHA-256 hash.
+        """
+
+        command = self._format_command(hparams)
+
+        files: dict[str, Any] = {}
+        if isinstance(command, list):
+            for arg in command:
+                if os.path.isfile(arg):
+                    stat = os.stat(arg)
+                    files[os.path.abspath(arg)] = [stat.st_size, stat.st_mtime_ns]
+        else:
+            module_filename = _find_module_file(command["_target_"])
+            if module_filename is not None:
+                with open(module_filename, "rb") as f:
+                    files[module_filename] = hashlib.sha256(f.read()).hexdigest()
+
+        # the working directory of each study is left out of the key
+        working_directory = Path(self.config.working_directory)
+        for path in sorted({os.path.abspath(working_directory), str(working_directory.resolve())}, key=len)[::-1]:
+            command = _replace_path(command, path, "{config.working_directory}")
+            files = _replace_path(files, path, "{config.working_directory}")
+
+        content = {
+            "command": command,
+            "params": hparams,
+            "files": files,
+            "commit_ids": self.commit_ids,
+            "git_state": self.git_state,
+        }
+
+        return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        """Returns the cached result of the hyperparameters, or runs the trial and caches its result.
+
+        Args:
+            trial (Trial): Trial to run.
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            Any: Objective value(s) to tell.
+        """
+
+        if self.commit_ids is None:
+            return await self.runner(trial, hparams)
+
+        key = self.cache_key(hparams)
+        cache_filename = self.cache_directory / f"{key}.json"
+
+        if cache_filename.exists():
+            with open(cache_filename) as f:
+                y = json.load(f)["value"]
+
+            trial.set_user_attr("cached", True)
+            return y
+
+        y = await self.runner(trial, hparams)
+
+        try:
+            content = json.dumps({"params": hparams, "value": y})
+        except (TypeError, ValueError):
+            warnings.warn(
+                f"Result of trial {trial.number} is not cached because it is not JSON serializable.", stacklevel=2
+            )
+            return y
+
+        # write atomically so that an interrupted run never leaves a broken entry
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        tmp_filename = cache_filename.with_name(f"{cache_filename.name}.{os.getpid()}.tmp")
+        tmp_filename.write_text(content)
+        tmp_filename.replace(cache_filename)
+
+        return y
+
+    async def close(self) -> None:
+        """Closes the wrapped runner."""
+
+        await self.runner.close()
@@ -0,0 +1,63 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any, cast
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import os
+import sys
+
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+from optuna.trial import Trial
+
+from aiaccel.hpo.runners.base_runner import BaseRunner
+
+_objective: Callable[..., Any] | None = None
+
+
+def _initialize_worker(objective_config: dict[str, Any], sys_path: list[str]) -> None:
+    global _objective
+
+    sys.path.extend(path for path in sys_path if path not in sys.path)
+    _objective = instantiate(objective_config, _partial_=True)
+
+
+def _call_objective(hparams: dict[str, Any]) -> Any:
+    assert _objective is not None
+
+    return _objective(**hparams)
+
+
+class CallableRunner(BaseRunner):
+    """Runs each trial by calling a Python callable in a pool of persistent worker processes.
+
+    The callable is instantiated once per worker, so that imports and other initialization are
+    amortized across trials. It is called with the suggested hyperparameters as keyword arguments
+    and returns the objective value(s) directly.
+
+    Args:
+        command (DictConfig): Configuration of the callable with ``_target_``.
+            Other keys are passed to the callable as fixed keyword arguments.
+            Modules in the current directory can be used as the target.
+        n_workers (int): Number of worker processes.
+    """
+
+    def __init__(self, command: DictConfig, n_workers: int) -> None:
+        self.pool = ProcessPoolExecutor(
+            n_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(cast(dict[str, Any], oc.to_container(command, resolve=True)), [os.getcwd()]),
+        )
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.pool, _call_objective, hparams)
+
+    async def close(self) -> None:
+        self.pool.shutdown()
@@ -0,0 +1,174 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import asyncio
+import contextlib
+import json
+import os
+from pathlib import Path
+import signal
+import string
+import subprocess
+import warnings
+
+from omegaconf import DictConfig
+
+import optuna
+from optuna.trial import Trial
+
+from aiaccel.hpo.runners.base_runner import BaseRunner
+
+
+class _PartialResultReader:
+    # reads the lines of {"step": n, "value": v} appended to a file since the last read
+    def __init__(self, filename: Path) -> None:
+        self.filename = filename
+        self.offset = 0
+        self.incomplete_line = b""
+
+    def read(self) -> list[tuple[int, float]]:
+        try:
+            with open(self.filename, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        self.offset += len(data)
+        *lines, self.incomplete_line = (self.incomplete_line + data).split(b"\n")
+
+        results = []
+        for line in lines:
+            if len(line.strip()) == 0:
+                continue
+
+            try:
+                result = json.loads(line)
+                results.append((int(result["step"]), float(result["value"])))
+            except (ValueError, KeyError, TypeError):
+                warnings.warn(f"Invalid intermediate result in {self.filename}: {line!r}", stacklevel=2)
+
+        return results
+
+
+def _field_names(arg: str) -> set[str]:
+    # names referred to by the replacement fields of an argument, e.g., "config" of "{config.working_directory}"
+    names = set()
+    for _, field_name, _, _ in string.Formatter().parse(arg):
+        if field_name:
+            names.add(field_name.split(".", 1)[0].split("[", 1)[0])
+
+    return names
+
+
+class CommandRunner(BaseRunner):
+    """Runs each trial as a subprocess of a shell-free command.
+
+    The command is launched by :func:`asyncio.create_subprocess_exec` and awaited in the caller's event loop,
+    so that thousands of trials can be in flight without occupying a thread per trial.
+    The objective is expected to write its result to ``{out_filename}`` in JSON format.
+
+    If ``config.report_interval`` is set, the objective can also append intermediate results as lines of
+    ``{"step": n, "value": v}`` to ``{out_filename}.partial``. The file is read every ``report_interval`` seconds,
+    each result is reported by :meth:`optuna.trial.Trial.report`, and the command is terminated
+    if :meth:`optuna.trial.Trial.should_prune` returns True.
+    The command runs in its own process group, and the whole group is terminated when the trial is pruned
+    or cancelled, including the processes spawned by the command.
+
+    Args:
+        command (list[str]): Command to run. Each argument is formatted with ``config``, ``job_name``,
+            ``out_filename``, and the suggested hyperparameters. The arguments referring to hyperparameters
+            that are not suggested for the trial, i.e., inactive ones of ``Choice`` and ``When``, are left out.
+        config (DictConfig): Configuration of ``aiaccel-hpo optimize``.
+    """
+
+    def __init__(self, command: list[str], config: DictConfig) -> None:
+        self.command = list(command)
+        self.config = config
+
+        self.working_directory = Path(config.working_directory)
+        self.report_interval: float | None = config.get("report_interval")
+
+    def format_command(self, trial: Trial, hparams: dict[str, Any]) -> tuple[list[str], Path]:
+        """Formats the command for the given trial.
+
+        Args:
+            trial (Trial): Trial to run.
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            tuple[list[str], Path]: Formatted command and the path to which the objective writes its result.
+        """
+
+        job_name = f"trial_{trial.number:0>6}"
+        out_filename = self.working_directory / f"{job_name}.json"
+
+        fields = {"config": self.config, "job_name": job_name, "out_filename": out_filename} | hparams
+        command = [arg.format(**fields) for arg in self.command if _field_names(arg) <= fields.keys()]
+
+        return command, out_filename
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        """Runs the objective for a trial and returns its result.
+
+        Args:
+            trial (Trial): Trial to run.
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            Any: Objective value(s) loaded from ``{out_filename}``.
+
+        Raises:
+            subprocess.CalledProcessError: If the command exits with a non-zero code.
+            optuna.TrialPruned: If the trial is pruned by its intermediate results.
+        """
+
+        command, out_filename = self.format_command(trial, hparams)
+
+        partial_filename = out_filename.with_name(out_filename.name + ".partial")
+        partial_filename.unlink(missing_ok=True)
+
+        # in its own process group so that the processes spawned by the command are also terminated
+        proc = await asyncio.create_subprocess_exec(*command, start_new_session=True)
+        try:
+            returncode = await self._wait(proc, trial, _PartialResultReader(partial_filename))
+        except (asyncio.CancelledError, optuna.TrialPruned):
+            with contextlib.suppress(ProcessLookupError):  # no process is left in the group
+                os.killpg(proc.pid, signal.SIGTERM)
+            await proc.wait()
+            raise
+        finally:
+            partial_filename.unlink(missing_ok=True)
+
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+
+        with open(out_filename) as f:
+            y = json.load(f)
+
+        out_filename.unlink()
+
+        return y
+
+    async def _wait(self, proc: asyncio.subprocess.Process, trial: Trial, reader: _PartialResultReader) -> int:
+        if self.report_interval is None:
+            return await proc.wait()
+
+        wait_task = asyncio.ensure_future(proc.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait({wait_task}, timeout=self.report_interval)
+
+                results = reader.read()
+                for step, value in results:
+                    trial.report(value, step)
+
+                if len(done) > 0:
+                    return wait_task.result()
+
+                if len(results) > 0 and trial.should_prune():
+                    raise optuna.TrialPruned()
+        finally:
+            wait_task.cancel()
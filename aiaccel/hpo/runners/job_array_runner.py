@@ -0,0 +1,165 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import asyncio
+import json
+from pathlib import Path
+import sys
+import warnings
+
+from omegaconf import DictConfig
+
+from optuna.trial import Trial
+
+from aiaccel.hpo.runners.command_runner import CommandRunner
+
+
+class MissingResultError(Exception):
+    """Raised when a task of an array job finishes without writing the result of its trial.
+
+    Args:
+        out_filename (Path): Result file that the task was expected to write.
+        task_index (int): Index of the task in ``task_filename``.
+        task_filename (Path): File of the commands of the array job.
+    """
+
+    def __init__(self, out_filename: Path, task_index: int, task_filename: Path) -> None:
+        super().__init__(f"Task {task_index} of {task_filename} did not write {out_filename}.")
+
+        self.out_filename = out_filename
+        self.task_index = task_index
+        self.task_filename = task_filename
+
+
+class JobArrayRunner(CommandRunner):
+    """Runs trials as tasks of array jobs submitted through ``aiaccel-job``.
+
+    The trials that are pending at the same time, e.g., those asked in a single iteration of the optimization loop,
+    are packed into a single ``cpu-array`` or ``gpu-array`` submission instead of submitting one job per trial.
+    Each task of the array job runs the command of a trial, which is formatted in the same way as
+    :class:`CommandRunner`.
+
+    The submission is configured by ``config.job``:
+
+    .. code-block:: yaml
+
+        job:
+          backend: pbs  # local, pbs, sge, or slurm
+          config: config_job.yaml  # configuration of aiaccel-job (optional)
+          mode: gpu  # cpu or gpu
+          args: ["--n_tasks_per_proc=1", "--walltime=2:0:0"]  # additional arguments of aiaccel-job
+
+    Args:
+        command (list[str]): Command to run for each trial.
+        config (DictConfig): Configuration of ``aiaccel-hpo optimize``.
+    """
+
+    def __init__(self, command: list[str], config: DictConfig) -> None:
+        super().__init__(command, config)
+
+        if self.report_interval is not None:
+            warnings.warn("report_interval is ignored because JobArrayRunner cannot prune trials.", stacklevel=2)
+
+        self.job_config = config.job
+        self.jobs_directory = self.working_directory / "jobs"
+
+        self.pending_tasks: list[tuple[list[str], Path, asyncio.Future[Any]]] = []
+        self.submissions: set[asyncio.Task[None]] = set()
+        self.n_submissions = 0
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        """Adds a trial to the next array job and returns its result.
+
+        Args:
+            trial (Trial): Trial to run.
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            Any: Objective value(s) loaded from ``{out_filename}``.
+
+        Raises:
+            MissingResultError: If the task of the trial did not write its result, e.g., the command failed.
+        """
+
+        command, out_filename = self.format_command(trial, hparams)
+
+        loop = asyncio.get_running_loop()
+        if len(self.pending_tasks) == 0:  # submit after the other trials of this iteration are added
+            loop.call_soon(self._flush)
+
+        future = loop.create_future()
+        self.pending_tasks.append((command, out_filename, future))
+
+        return await future
+
+    def _flush(self) -> None:
+        tasks, self.pending_tasks = self.pending_tasks, []
+
+        submission = asyncio.create_task(self._submit(tasks))
+        self.submissions.add(submission)
+        submission.add_done_callback(self.submissions.discard)
+
+    async def _submit(self, tasks: list[tuple[list[str], Path, asyncio.Future[Any]]]) -> None:
+        job_name = f"array_{self.n_submissions:0>6}"
+        self.n_submissions += 1
+
+        self.jobs_directory.mkdir(parents=True, exist_ok=True)
+
+        task_filename = self.jobs_directory / f"{job_name}.tasks.json"
+        with open(task_filename, "w") as f:
+            json.dump([command for command, _, _ in tasks], f)
+
+        submit_command = [
+            "aiaccel-job",
+            self.job_config.backend,
+            *(["--config", str(self.job_config.config)] if self.job_config.get("config") is not None else []),
+            self.job_config.get("mode", "cpu"),
+            f"--n_tasks={len(tasks)}",
+            *self.job_config.get("args", []),
+            str(self.jobs_directory / f"{job_name}.log"),
+            "--",
+            sys.executable,
+            "-m",
+            "aiaccel.hpo.runners.job_array_worker",
+            str(task_filename),
+        ]
+
+        try:
+            proc = await asyncio.create_subprocess_exec(*submit_command)
+        except OSError as e:
+            for _, _, future in tasks:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        try:
+            await proc.wait()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.terminate()
+                await proc.wait()
+
+            for _, _, future in tasks:
+                future.cancel()
+            raise
+
+        for task_index, (_, out_filename, future) in enumerate(tasks):
+            if future.done():  # the trial has been cancelled
+                continue
+
+            if out_filename.exists():
+                with open(out_filename) as f:
+                    future.set_result(json.load(f))
+                out_filename.unlink()
+            else:
+                future.set_exception(MissingResultError(out_filename, task_index, task_filename))
+
+    async def close(self) -> None:
+        """Cancels the submissions that are still running."""
+
+        for submission in list(self.submissions):
+            submission.cancel()
+
+        await asyncio.gather(*self.submissions, return_exceptions=True)
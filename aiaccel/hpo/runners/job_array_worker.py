@@ -0,0 +1,30 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+from aiaccel.job.utils import split_tasks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs the tasks of an array job submitted by JobArrayRunner.")
+    parser.add_argument("task_filename", type=Path)
+    args = parser.parse_args()
+
+    with open(args.task_filename) as f:
+        commands = json.load(f)
+
+    # exit successfully even if a trial fails so that the other tasks of the array job keep running;
+    # failed trials are detected by their missing results
+    for command in split_tasks(commands):
+        returncode = subprocess.run(command).returncode
+        if returncode != 0:
+            print(f"Command {command} failed with exit code {returncode}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import asyncio
+from collections.abc import Callable
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import traceback
+import warnings
+
+from omegaconf import DictConfig
+
+from optuna.trial import Trial
+
+from aiaccel.hpo.runners.base_runner import BaseRunner
+
+
+def serve(objective: Callable[..., Any]) -> None:
+    """Serves an objective function over the protocol of :class:`PersistentCommandRunner`.
+
+    Reads requests from stdin until EOF, calls ``objective`` with the hyperparameters as keyword arguments,
+    and writes the responses to stdout. Anything else written to stdout, including by C extensions and
+    child processes, is redirected to stderr so that it does not corrupt the protocol.
+
+    Args:
+        objective (Callable[..., Any]): Objective function that returns the objective value(s).
+
+    Examples:
+        .. code-block:: python
+
+            from aiaccel.hpo.runners import serve
+
+            model = load_model()  # loaded only once per worker
+
+
+            def objective(lr: float) -> float:
+                return evaluate(model, lr)
+
+
+            if __name__ == "__main__":
+                serve(objective)
+    """
+
+    sys.stdout.flush()
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for line in sys.stdin:
+        request = json.loads(line)
+
+        try:
+            response = {"value": objective(**request["params"])}
+        except Exception:
+            traceback.print_exc()
+            response = {"error": traceback.format_exc(limit=0).strip()}
+
+        sys.stdout.flush()
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+class PersistentCommandRunner(BaseRunner):
+    """Runs trials on long-lived objective processes that receive hyperparameters over a pipe.
+
+    Up to ``config.n_max_jobs`` processes of the command are launched on demand and reused across trials,
+    so that imports, model loading, and dataset loading are amortized. For each trial, a request
+    ``{"trial": <number>, "params": {<name>: <value>, ...}}`` is written to the stdin of an idle process
+    as a line of JSON, and the process answers with a line ``{"value": <value(s)>}`` on its stdout,
+    or ``{"error": <message>}`` if the objective failed. Processes exit when their stdin is closed.
+    Python objectives can implement the protocol with :func:`serve`.
+
+    Args:
+        command (list[str]): Command to launch a process. Each argument is formatted with ``config``.
+        config (DictConfig): Configuration of ``aiaccel-hpo optimize``.
+        close_timeout (float, optional): Seconds to wait for each process to exit before killing it.
+            Defaults to 10.0.
+    """
+
+    def __init__(self, command: list[str], config: DictConfig, close_timeout: float = 10.0) -> None:
+        self.command = [arg.format(config=config) for arg in command]
+        self.close_timeout = close_timeout
+
+        if config.get("report_interval") is not None:
+            warnings.warn(
+                "report_interval is ignored because PersistentCommandRunner cannot prune trials.", stacklevel=2
+            )
+
+        self.processes: set[asyncio.subprocess.Process] = set()
+        self.idle_processes: list[asyncio.subprocess.Process] = []
+
+    async def _start_process(self) -> asyncio.subprocess.Process:
+        proc = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        self.processes.add(proc)
+
+        return proc
+
+    async def _discard_process(self, proc: asyncio.subprocess.Process) -> int:
+        self.processes.discard(proc)
+
+        if proc.returncode is None:
+            proc.kill()
+
+        return await proc.wait()
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        """Runs the objective for a trial on an idle process and returns its result.
+
+        Args:
+            trial (Trial): Trial to run.
+            hparams (dict[str, Any]): Hyperparameters suggested for the trial.
+
+        Returns:
+            Any: Objective value(s) answered by the process.
+
+        Raises:
+            subprocess.CalledProcessError: If the process exits without answering.
+            RuntimeError: If the objective failed.
+        """
+
+        proc = self.idle_processes.pop() if len(self.idle_processes) > 0 else await self._start_process()
+        assert proc.stdin is not None and proc.stdout is not None
+
+        try:
+            with contextlib.suppress(ConnectionError):  # the process has exited, which is detected by EOF
+                proc.stdin.write((json.dumps({"trial": trial.number, "params": hparams}) + "\n").encode())
+                await proc.stdin.drain()
+
+            line = await proc.stdout.readline()
+        except asyncio.CancelledError:
+            await self._discard_process(proc)
+            raise
+
+        if len(line) == 0:
+            raise subprocess.CalledProcessError(await self._discard_process(proc), self.command)
+
+        self.idle_processes.append(proc)
+
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"Trial {trial.number} failed: {response['error']}")
+
+        return response["value"]
+
+    async def close(self) -> None:
+        """Closes the stdin of all processes and waits for them to exit."""
+
+        for proc in self.processes:
+            assert proc.stdin is not None
+            proc.stdin.close()
+
+        for proc in self.processes:
+            try:
+                await asyncio.wait_for(proc.wait(), self.close_timeout)
+            except asyncio.TimeoutError:  # not a subclass of TimeoutError before Python 3.11
+                proc.kill()
+                await proc.wait()
+
+        self.processes.clear()
+        self.idle_processes.clear()
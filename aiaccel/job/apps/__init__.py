@@ -5,15 +5,21 @@ from typing import cast
 
 from argparse import ArgumentParser, _SubParsersAction
 from importlib import resources
+import logging
 import os
 from pathlib import Path
+import re
+import subprocess
 
 from omegaconf import DictConfig
 
 from aiaccel.config import prepare_config, print_config, setup_omegaconf
+from aiaccel.job.utils import wait_for_status_files
 
 setup_omegaconf()
 
+logger = logging.getLogger(__name__)
+
 
 def prepare_argument_parser(
     default_config_name: str,
@@ -46,11 +52,15 @@ def prepare_argument_parser(
 
     sub_parser = sub_parsers.add_parser("cpu", parents=[parent_parser])
     sub_parser.add_argument("--n_tasks", type=int)
+    sub_parser.add_argument("--fail_fast", action="store_true")
+    sub_parser.add_argument("--dynamic", action="store_true")
     sub_parser.add_argument("--n_tasks_per_proc", type=int, default=config["cpu-array"].n_tasks_per_proc)
     sub_parser.add_argument("--n_procs", type=int, default=config["cpu-array"].n_procs)
 
     sub_parser = sub_parsers.add_parser("gpu", parents=[parent_parser])
     sub_parser.add_argument("--n_tasks", type=int)
+    sub_parser.add_argument("--fail_fast", action="store_true")
+    sub_parser.add_argument("--dynamic", action="store_true")
     sub_parser.add_argument("--n_tasks_per_proc", type=int, default=config["gpu-array"].n_tasks_per_proc)
     sub_parser.add_argument("--n_procs", type=int, default=config["gpu-array"].n_procs)
 
@@ -62,3 +72,83 @@ def prepare_argument_parser(
     sub_parser.add_argument("--n_gpus", type=int)
 
     return config, parser, sub_parsers
+
+
+def _parse_job_id(output: str, config: DictConfig) -> str | None:
+    if config.get("job_id_regex") is None:
+        return None
+
+    match = re.search(config.job_id_regex, output, re.MULTILINE)
+
+    return match.group(1) if match is not None else None
+
+
+def _format_scheduler_command(config: DictConfig, key: str, job_id: str | None) -> str | None:
+    if job_id is None or config.get(key) is None:
+        return None
+
+    return str(config[key].format(job_id=job_id))
+
+
+def submit_job(
+    submit_command: str,
+    status_filename_list: list[Path],
+    config: DictConfig,
+    fail_fast: bool = False,
+) -> None:
+    """Submits a job and waits until all of its status files are written.
+
+    The job ID is extracted from the output of ``submit_command`` by ``config.job_id_regex``.
+    If ``config.status_command`` is set, it is formatted with the job ID and used to query the scheduler.
+    The progress is printed as the status files of an array job appear in any order.
+
+    Args:
+        submit_command (str): Shell command to submit the job.
+        status_filename_list (list[Path]): Status files written by the job.
+        config (DictConfig): Configuration of the job scheduler.
+        fail_fast (bool, optional): Whether to cancel the job by ``config.cancel_command`` and raise as soon as
+            a status file reports a failure. Defaults to False.
+
+    Raises:
+        RuntimeError: If the job failed.
+    """
+
+    for status_filename in status_filename_list:
+        status_filename.unlink(missing_ok=True)
+
+    result = subprocess.run(submit_command, shell=True, check=True, stdout=subprocess.PIPE, text=True)
+    print(result.stdout, end="", flush=True)
+
+    job_id = _parse_job_id(result.stdout, config)
+    if job_id is None and (config.get("status_command") is not None or fail_fast):
+        logger.warning(f"Job ID is not found in the output of the submission: {result.stdout!r}")
+
+    status_command = _format_scheduler_command(config, "status_command", job_id)
+    cancel_command = _format_scheduler_command(config, "cancel_command", job_id)
+
+    n_done, n_failed = 0, 0
+
+    def report_status(status_filename: Path, status: int) -> None:
+        nonlocal n_done, n_failed
+
+        if status == 0:
+            n_done += 1
+        else:
+            n_failed += 1
+
+        if len(status_filename_list) > 1:
+            n_running = len(status_filename_list) - n_done - n_failed
+            print(f"[aiaccel-job] {n_done} done, {n_failed} failed, {n_running} running", flush=True)
+
+        if status != 0 and fail_fast:
+            if cancel_command is not None:
+                subprocess.run(cancel_command, shell=True)
+
+            raise RuntimeError(f"Job failed with {status} exit code.")
+
+    statuses = wait_for_status_files(status_filename_list, status_command, callback=report_status)
+
+    for status_filename, status in statuses.items():
+        if status != 0:
+            raise RuntimeError(f"Job failed with {status} exit code.")
+        status_filename.unlink()
@@ -6,15 +6,46 @@
 
 import logging
 from math import ceil
+import os
 from pathlib import Path
 import shlex
 import subprocess
+import sys
+
+from omegaconf import DictConfig
 
 from aiaccel.job.apps import prepare_argument_parser
 
 logger = logging.getLogger(__name__)
 
 
+def _detect_gpus() -> list[int]:
+    try:
+        result = subprocess.run(["nvidia-smi", "-L"], stdout=subprocess.PIPE, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return []
+
+    return list(range(sum(line.startswith("GPU ") for line in result.stdout.splitlines())))
+
+
+def _scheduler_command(config: DictConfig, mode: str, n_procs: int) -> list[str]:
+    # prefix that runs the rest of the line on resources of the scheduler shared by all aiaccel-job local submissions
+    cpus = config.scheduler.cpus if config.scheduler.cpus is not None else sorted(os.sched_getaffinity(0))
+    gpus = config.scheduler.gpus if config.scheduler.gpus is not None else _detect_gpus()
+
+    return [
+        sys.executable,
+        "-m",
+        "aiaccel.job.utils.acquire_resources",
+        f"--n_cpus={n_procs * config[mode].n_cpus}",
+        f"--n_gpus={n_procs * config[mode].n_gpus}",
+        f"--cpus={','.join(map(str, cpus))}",
+        f"--gpus={','.join(map(str, gpus))}",
+        f"--lock_directory={config.scheduler.lock_directory}",
+        "--",
+    ]
+
+
 def main() -> None:
     # Load configuration (from the default YAML string)
     config, parser, sub_parsers = prepare_argument_parser("local.yaml")
@@ -26,11 +57,37 @@ def main() -> None:
         if getattr(args, key, None) is not None:
             logger.warning(f"Argument '{key}' is defined for compatibility and will not be used in aiaccel-job local.")
 
+    use_scheduler = config.get("use_scheduler", False)
+
+    command = args.command
+    if use_scheduler and mode not in ["mpi", "train"]:
+        command = _scheduler_command(config, mode, 1) + command
+
     # Prepare the job script and arguments
-    job = config[mode].job.format(command=shlex.join(args.command), args=args)
+    job = config[mode].job.format(command=shlex.join(command), args=args)
+
+    if use_scheduler and mode in ["mpi", "train"]:
+        # acquire the resources of all ranks once outside mpirun, and the ranks inherit them through the environment
+        n_procs = args.n_procs if mode == "mpi" else args.n_gpus
+        if n_procs is None:
+            parser.error("--n_gpus is required for train with use_scheduler.")
+        job = f"{shlex.join(_scheduler_command(config, mode, n_procs))} {job}"
 
     if mode in ["cpu-array", "gpu-array"]:
+        # claim tasks one by one from a shared counter instead of fixed blocks (see split_tasks)
+        counter_filename = args.log_filename.with_suffix(".counter").resolve()
+        counter_filename.unlink(missing_ok=True)
+        task_counter = f"TASK_COUNTER_FILE={counter_filename} \\\n    " if args.dynamic else ""
         n_tasks_per_proc = ceil(args.n_tasks / args.n_procs)
+        fail_fast = ""
+        if args.fail_fast:
+            fail_fast = """
+        if [[ $n_failed -gt 0 ]]; then
+            for pid in $(pgrep -P $$); do
+                kill_tree $pid  # abort the other processes
+            done
+            exit 1
+        fi"""
         job = f"""\
 for LOCAL_PROC_INDEX in {{1..{args.n_procs}}}; do
     TASK_INDEX=$(( 1 + {n_tasks_per_proc} * (LOCAL_PROC_INDEX - 1) ))
@@ -40,15 +97,47 @@ for LOCAL_PROC_INDEX in {{1..{args.n_procs}}}; do
     fi
 
     TASK_INDEX=$TASK_INDEX \\
-    TASK_STEPSIZE={n_tasks_per_proc} \\
+    {task_counter}TASK_STEPSIZE={n_tasks_per_proc} \\
         {job} 2>&1 | tee {args.log_filename.with_suffix("")}.${{LOCAL_PROC_INDEX}}.log &
 
     pids[$LOCAL_PROC_INDEX]=$!
 done
 
-for i in "${{!pids[@]}}"; do
-    wait ${{pids[$i]}}
+kill_tree() {{
+    local child
+    for child in $(pgrep -P "$1"); do
+        kill_tree $child
+    done
+    kill $1 2> /dev/null || true
+}}
+
+n_procs=${{#pids[@]}}
+n_done=0
+n_failed=0
+while [[ ${{#pids[@]}} -gt 0 ]]; do
+    for i in "${{!pids[@]}}"; do
+        if kill -0 ${{pids[$i]}} 2> /dev/null; then
+            continue
+        fi
+
+        if wait ${{pids[$i]}}; then
+            n_done=$(( n_done + 1 ))
+        else
+            n_failed=$(( n_failed + 1 ))
+        fi
+        unset "pids[$i]"
+
+        echo "[aiaccel-job] $n_done done, $n_failed failed, $(( n_procs - n_done - n_failed )) running"{fail_fast}
+    done
+
+    if [[ ${{#pids[@]}} -gt 0 ]]; then
+        sleep 1
+    fi
 done
+
+if [[ $n_failed -gt 0 ]]; then
+    exit 1
+fi
 """
     else:
         job = f"{job} 2>&1 | tee {args.log_filename}"
@@ -4,13 +4,10 @@
 # Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
 # SPDX-License-Identifier: MIT
 
-import os
 from pathlib import Path
 import shlex
-import subprocess
-import time
 
-from aiaccel.job.apps import prepare_argument_parser
+from aiaccel.job.apps import prepare_argument_parser, submit_job
 
 
 def main() -> None:
@@ -24,6 +21,10 @@ def main() -> None:
     job = config[mode].job.format(command=shlex.join(args.command), args=args)
 
     if mode in ["cpu-array", "gpu-array"]:
+        # claim tasks one by one from a shared counter instead of fixed blocks (see split_tasks)
+        counter_filename = args.log_filename.with_suffix(".counter").resolve()
+        counter_filename.unlink(missing_ok=True)
+        task_counter = f"TASK_COUNTER_FILE={counter_filename} \\\n    " if args.dynamic else ""
         job = f"""\
 for LOCAL_PROC_INDEX in {{1..{args.n_procs}}}; do
     TASK_INDEX=$(( PBS_ARRAY_INDEX + {args.n_tasks_per_proc} * (LOCAL_PROC_INDEX - 1) ))
@@ -33,7 +34,7 @@ for LOCAL_PROC_INDEX in {{1..{args.n_procs}}}; do
     fi
 
     TASK_INDEX=$TASK_INDEX \\
-    TASK_STEPSIZE={args.n_tasks_per_proc} \\
+    {task_counter}TASK_STEPSIZE={args.n_tasks_per_proc} \\
         {job} > {args.log_filename.with_suffix("")}.${{PBS_ARRAY_INDEX}}-${{LOCAL_PROC_INDEX}}.log 2>&1 &
 
     pids[$LOCAL_PROC_INDEX]=$!
@@ -79,29 +80,14 @@ fi
     qsub = config.qsub.format(args=args)
     qsub_args = config[mode].qsub_args.format(args=args)
 
-    # Create the job script file, remove old status files, and run the job
+    # Create the job script file and run the job
     args.log_filename.parent.mkdir(exist_ok=True, parents=True)
 
     job_filename: Path = args.log_filename.with_suffix(".sh")
     with open(job_filename, "w") as f:
         f.write(job_script)
 
-    for status_filename in status_filename_list:
-        status_filename.unlink(missing_ok=True)
-
-    subprocess.run(f"{qsub} {qsub_args} {job_filename}", shell=True, check=True)
-
-    for status_filename in status_filename_list:
-        while not status_filename.exists():
-            time.sleep(1.0)
-
-            if config.get("use_scandir", False):  # Reflesh the file system if needed
-                os.scandir(status_filename.parent)
-
-        status = int(status_filename.read_text())
-        if status != 0:
-            raise RuntimeError(f"Job failed with {status} exit code.")
-        status_filename.unlink()
+    submit_job(f"{qsub} {qsub_args} {job_filename}", status_filename_list, config, getattr(args, "fail_fast", False))
 
 
 if __name__ == "__main__":
@@ -3,5 +3,6 @@
 
 from aiaccel.job.utils.get_rank import get_rank
 from aiaccel.job.utils.split_tasks import split_tasks
+from aiaccel.job.utils.wait_for_status_files import wait_for_status_files
 
-__all__ = ["get_rank", "split_tasks"]
+__all__ = ["get_rank", "split_tasks", "wait_for_status_files"]
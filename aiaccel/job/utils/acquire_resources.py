@@ -0,0 +1,135 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+import contextlib
+import fcntl
+import os
+from pathlib import Path
+import random
+import sys
+import time
+
+
+def _try_lock(lock_directory: Path, kind: str, ids: list[int], n: int) -> list[tuple[int, int]] | None:
+    locked: list[tuple[int, int]] = []
+    for id_ in ids:
+        if len(locked) == n:
+            break
+
+        fd = os.open(lock_directory / f"{kind}.{id_}.lock", os.O_RDONLY | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+
+        locked.append((id_, fd))
+
+    if len(locked) < n:
+        for _, fd in locked:
+            os.close(fd)
+        return None
+
+    return locked
+
+
+def acquire_resources(
+    n_cpus: int,
+    n_gpus: int,
+    cpus: list[int],
+    gpus: list[int],
+    lock_directory: Path,
+    max_interval: float = 1.0,
+) -> tuple[list[int], list[int], list[int]]:
+    """Waits until the requested CPUs and GPUs are free and locks them.
+
+    Each CPU and GPU is represented by a lock file in ``lock_directory``, which is shared by all processes
+    that schedule the same resources, e.g., concurrent ``aiaccel-job local`` submissions. The resources are
+    locked all at once or not at all, so that processes waiting for resources never hold them.
+    The locks are released when all the returned file descriptors are closed, including on process exit.
+
+    Args:
+        n_cpus (int): Number of CPUs to acquire.
+        n_gpus (int): Number of GPUs to acquire.
+        cpus (list[int]): IDs of the CPUs to be scheduled.
+        gpus (list[int]): IDs of the GPUs to be scheduled.
+        lock_directory (Path): Directory of the lock files.
+        max_interval (float, optional): Maximum interval of retries in seconds. Defaults to 1.0.
+
+    Returns:
+        tuple[list[int], list[int], list[int]]: IDs of the acquired CPUs and GPUs, and the file descriptors
+        of their locks.
+
+    Raises:
+        ValueError: If more resources are requested than those to be scheduled.
+    """
+
+    if n_cpus > len(cpus) or n_gpus > len(gpus):
+        raise ValueError(
+            f"{n_cpus} CPUs and {n_gpus} GPUs are requested, "
+            f"but only {len(cpus)} CPUs and {len(gpus)} GPUs are scheduled."
+        )
+
+    if not lock_directory.exists():
+        lock_directory.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(PermissionError):  # share the resources with other users
+            lock_directory.chmod(0o1777)
+
+    interval = 0.01
+    while True:
+        locked_cpus = _try_lock(lock_directory, "cpu", cpus, n_cpus)
+        if locked_cpus is not None:
+            locked_gpus = _try_lock(lock_directory, "gpu", gpus, n_gpus)
+            if locked_gpus is not None:
+                locked = locked_cpus + locked_gpus
+                return [id_ for id_, _ in locked_cpus], [id_ for id_, _ in locked_gpus], [fd for _, fd in locked]
+
+            for _, fd in locked_cpus:
+                os.close(fd)
+
+        time.sleep(interval * random.uniform(0.5, 1.5))
+        interval = min(2 * interval, max_interval)
+
+
+def _parse_ids(ids: str) -> list[int]:
+    return [int(id_) for id_ in ids.split(",") if len(id_) > 0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Runs a command on CPUs and GPUs that are not used by other commands run by this module."
+    )
+    parser.add_argument("--n_cpus", type=int, default=1)
+    parser.add_argument("--n_gpus", type=int, default=0)
+    parser.add_argument("--cpus", type=_parse_ids, required=True, help="comma-separated IDs of CPUs to be scheduled")
+    parser.add_argument("--gpus", type=_parse_ids, default=[], help="comma-separated IDs of GPUs to be scheduled")
+    parser.add_argument("--lock_directory", type=Path, required=True)
+    parser.add_argument("command", nargs="+")
+    args = parser.parse_args()
+
+    try:
+        cpus, gpus, fds = acquire_resources(args.n_cpus, args.n_gpus, args.cpus, args.gpus, args.lock_directory)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # keep the locks until the command exits
+    for fd in fds:
+        os.set_inheritable(fd, True)
+
+    # the CPUs and GPUs are passed through the environment to the processes launched by the command, e.g., MPI ranks
+    env = dict(os.environ)
+    if len(cpus) > 0:
+        os.sched_setaffinity(0, cpus)
+        env["AIACCEL_JOB_CPUS"] = ",".join(map(str, cpus))
+
+    # without requested GPUs, the environment is kept as it is
+    if args.n_gpus > 0:
+        env["CUDA_VISIBLE_DEVICES"] = ",".join(map(str, gpus))
+
+    sys.stdout.flush()
+    os.execvpe(args.command[0], args.command, env)
+
+
+if __name__ == "__main__":
+    main()
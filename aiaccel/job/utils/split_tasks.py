@@ -3,11 +3,50 @@
 
 from typing import Any
 
+from collections.abc import Iterable, Iterator
+import fcntl
 import os
 
 
-def split_tasks(task_list: list[Any]) -> list[Any]:
-    if "TASK_INDEX" in os.environ:
+def _claim_tasks(task_list: list[Any], counter_filename: str) -> Iterator[Any]:
+    fd = os.open(counter_filename, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        while True:
+            # atomically read and increment the index of the next task shared by all processes
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                counter = os.pread(fd, 32, 0).strip()
+                index = int(counter) if len(counter) > 0 else 0
+                os.pwrite(fd, f"{index + 1}\n".encode(), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+            if index >= len(task_list):
+                break
+
+            yield task_list[index]
+    finally:
+        os.close(fd)
+
+
+def split_tasks(task_list: list[Any]) -> Iterable[Any]:
+    """Returns the tasks to be processed by this process of an array job.
+
+    By default, the contiguous block specified by ``TASK_INDEX`` and ``TASK_STEPSIZE`` is returned.
+    If ``TASK_COUNTER_FILE`` is set (``--dynamic`` of ``aiaccel-job``), the tasks are instead claimed one by one
+    from the counter file shared by all processes, so that no process idles while tasks remain.
+    In this case, every process must give the same ``task_list``.
+
+    Args:
+        task_list (list[Any]): All tasks of the array job.
+
+    Returns:
+        Iterable[Any]: Tasks to be processed. An empty list if this process is not a part of an array job.
+    """
+
+    if "TASK_COUNTER_FILE" in os.environ:
+        return _claim_tasks(task_list, os.environ["TASK_COUNTER_FILE"])
+    elif "TASK_INDEX" in os.environ:
         start = int(os.environ["TASK_INDEX"]) - 1
         end = start + int(os.environ["TASK_STEPSIZE"])
 
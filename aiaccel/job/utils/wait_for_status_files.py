@@ -0,0 +1,152 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from collections.abc import Callable
+import ctypes
+import os
+from pathlib import Path
+import select
+import subprocess
+import sys
+import time
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+
+
+def _open_inotify(directories: set[Path]) -> int | None:
+    # inotify only sees changes made on this host, so it is used as a hint to scan the directories early
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+
+    if fd < 0:
+        return None
+
+    for directory in directories:
+        libc.inotify_add_watch(fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+
+    return int(fd)
+
+
+def _wait_for_events(inotify_fd: int | None, timeout: float) -> None:
+    if inotify_fd is None:
+        time.sleep(timeout)
+        return
+
+    readable, _, _ = select.select([inotify_fd], [], [], timeout)
+    if len(readable) > 0:
+        while True:  # drain events
+            try:
+                os.read(inotify_fd, 65536)
+            except BlockingIOError:
+                break
+
+
+def _scan_status_files(status_filenames: set[Path]) -> dict[Path, int]:
+    # scan all directories at once instead of stat-ing each file
+    directories = {status_filename.parent for status_filename in status_filenames}
+    names = {(directory, entry.name) for directory in directories for entry in os.scandir(directory)}
+
+    statuses = {}
+    for status_filename in status_filenames:
+        if (status_filename.parent, status_filename.name) not in names:
+            continue
+
+        status = status_filename.read_text().strip()
+        if len(status) > 0:  # the file may be created but not written yet
+            statuses[status_filename] = int(status)
+
+    return statuses
+
+
+def _is_job_running(status_command: str) -> bool:
+    result = subprocess.run(status_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+    return result.returncode == 0 and len(result.stdout.strip()) > 0
+
+
+def wait_for_status_files(
+    status_filenames: list[Path],
+    status_command: str | None = None,
+    min_interval: float = 0.5,
+    max_interval: float = 16.0,
+    query_interval: float = 30.0,
+    grace_period: float = 60.0,
+    callback: Callable[[Path, int], None] | None = None,
+) -> dict[Path, int]:
+    """Waits until all status files are written and returns the exit statuses in them.
+
+    The directories of the status files are scanned at once with :func:`os.scandir`, which also refreshes
+    the attribute cache of network file systems. The scan interval starts at ``min_interval`` and is doubled
+    up to ``max_interval`` while no status file appears. On Linux, inotify wakes up the scan as soon as a file
+    is written on this host.
+
+    Args:
+        status_filenames (list[Path]): Status files, each of which contains an exit status.
+        status_command (str | None, optional): Shell command that queries the job scheduler for all the jobs
+            at once, e.g., ``qstat 1234[]``. The jobs are regarded as finished when the command fails or prints
+            nothing. Defaults to None.
+        min_interval (float, optional): Initial interval of scans in seconds. Defaults to 0.5.
+        max_interval (float, optional): Maximum interval of scans in seconds. Defaults to 16.0.
+        query_interval (float, optional): Interval of ``status_command`` in seconds. Defaults to 30.0.
+        grace_period (float, optional): Seconds to wait for status files after the scheduler reported that the
+            jobs finished. Defaults to 60.0.
+        callback (Callable[[Path, int], None] | None, optional): Function called with each status file and its
+            exit status as soon as it is found. Exceptions raised by the callback abort waiting. Defaults to None.
+
+    Returns:
+        dict[Path, int]: Exit statuses in the order of ``status_filenames``.
+
+    Raises:
+        RuntimeError: If the jobs finished without writing some of the status files.
+    """
+
+    remaining = set(status_filenames)
+    statuses: dict[Path, int] = {}
+
+    inotify_fd = _open_inotify({status_filename.parent for status_filename in remaining})
+
+    interval = min_interval
+    last_query = time.monotonic()
+    finished_at: float | None = None
+
+    try:
+        while True:
+            new_statuses = _scan_status_files(remaining)
+            statuses.update(new_statuses)
+            remaining.difference_update(new_statuses)
+
+            if callback is not None:
+                for status_filename, status in new_statuses.items():
+                    callback(status_filename, status)
+
+            if len(remaining) == 0:
+                break
+
+            if len(new_statuses) > 0:
+                interval = min_interval
+
+            # query the scheduler to detect jobs that died without writing their status
+            now = time.monotonic()
+            if status_command is not None and finished_at is None and now - last_query >= query_interval:
+                last_query = now
+                if not _is_job_running(status_command):
+                    finished_at = now
+
+            if finished_at is not None and now - finished_at > grace_period:
+                raise RuntimeError(f"Job finished without writing status files: {sorted(map(str, remaining))}")
+
+            _wait_for_events(inotify_fd, interval)
+
+            interval = min(2 * interval, max_interval)
+    finally:
+        if inotify_fd is not None:
+            os.close(inotify_fd)
+
+    return {status_filename: statuses[status_filename] for status_filename in status_filenames}
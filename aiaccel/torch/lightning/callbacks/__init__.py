@@ -3,6 +3,7 @@
 
 from aiaccel.torch.lightning.callbacks.load_pretrained import LoadPretrainedCallback
 from aiaccel.torch.lightning.callbacks.print_unused_param import PrintUnusedParam
+from aiaccel.torch.lightning.callbacks.report_metric import ReportMetricCallback
 from aiaccel.torch.lightning.callbacks.save_metric import SaveMetricCallback
 
-__all__ = ["SaveMetricCallback", "LoadPretrainedCallback", "PrintUnusedParam"]
+__all__ = ["SaveMetricCallback", "ReportMetricCallback", "LoadPretrainedCallback", "PrintUnusedParam"]
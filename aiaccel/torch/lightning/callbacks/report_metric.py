@@ -0,0 +1,30 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import json
+
+import lightning
+
+
+class ReportMetricCallback(lightning.Callback):
+    """
+    Lightning Callback for appending metric at each validation epoch end to ``{output_path}.partial``,
+    which is read by ``aiaccel-hpo optimize`` to prune the trial.
+
+    Args:
+        metric_name (str): Metric name to report
+        output_path (str): File name of the final result, e.g., ``{out_filename}``
+    """
+
+    def __init__(self, metric_name: str, output_path: str) -> None:
+        super().__init__()
+        self.metric_name = metric_name
+        self.output_path = output_path
+
+    def on_validation_epoch_end(self, trainer: lightning.Trainer, pl_module: lightning.LightningModule) -> None:
+        if trainer.sanity_checking or not trainer.is_global_zero or self.metric_name not in trainer.callback_metrics:
+            return
+
+        metric_value = trainer.callback_metrics[self.metric_name].item()
+        with open(f"{self.output_path}.partial", "a") as f:
+            f.write(json.dumps({"step": trainer.current_epoch, "value": metric_value}) + "\n")
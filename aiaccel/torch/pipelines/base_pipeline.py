@@ -183,10 +183,8 @@ class BasePipeline(metaclass=ABCMeta):
                 src_fname_list = list(args.src_path.glob(f"*.{args.src_ext}"))
                 src_fname_list.sort()
 
-                src_fname_list = split_tasks(src_fname_list)
-
                 args.dst_path.mkdir(exist_ok=True, parents=True)
-                for src_filename in track(src_fname_list):
+                for src_filename in track(split_tasks(src_fname_list)):
                     pipeline.process_one(src_filename, args.dst_path / f"{src_filename.stem}.{args.dst_ext}")
 
     @classmethod
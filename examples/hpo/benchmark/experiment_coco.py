@@ -49,6 +49,7 @@ def optimize(
     result_csv_name: str,
     num_trial: int = 1000,
     num_parallel: int = 10,
+    xtol: float | None = None,
 ) -> None:
     csv_array: list[list[str | float]] = [["step", "value"]]
 
@@ -61,6 +62,10 @@ def optimize(
                 if result is not None:
                     csv_array.append([step, result])
 
+            # skip the remaining budget once the simplex has collapsed
+            if xtol is not None and isinstance(study.sampler, NelderMeadSampler) and study.sampler.is_converged(xtol):
+                break
+
     with open(result_csv_name, "w") as f:
         writer = csv.writer(f)
         writer.writerows(csv_array)
@@ -82,6 +87,7 @@ def experiment_bbob() -> None:
     parser.add_argument("--instance")
     parser.add_argument("--optuna_seed")
     parser.add_argument("--sampler_name")
+    parser.add_argument("--xtol", type=float, default=None, help="Stop NelderMeadSampler on convergence.")
     args, _ = parser.parse_known_args()
 
     func_id = int(args.func_id)
@@ -144,6 +150,7 @@ def experiment_bbob() -> None:
             step_csv_dir + f"result_{problem.id}_{optuna_seed:03}.csv",
             num_trial,
             num_parallel,
+            args.xtol,
         )
 
         create_optuna_result(study, output_folder, problem, optuna_seed, sampler_name)
@@ -0,0 +1,35 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+import time
+
+import numpy as np
+
+from aiaccel.hpo.algorithms import NelderMeadAlgorithm
+
+
+def run(dimensions: int, n_trials: int) -> float:
+    nm = NelderMeadAlgorithm(dimensions=dimensions, rng=np.random.RandomState(0))
+
+    start = time.perf_counter()
+    for _ in range(n_trials):
+        vertex = nm.get_vertex()
+        nm.put_value(vertex, float(np.sum((vertex - 0.5) ** 2)))
+
+    return n_trials / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[2, 10, 100, 1000])
+    parser.add_argument("--n_trials", type=int, default=5000)
+    args = parser.parse_args()
+
+    for dimensions in args.dimensions:
+        trials_per_second = run(dimensions, args.n_trials)
+        print(f"{dimensions:>6} dimensions: {trials_per_second:10.1f} trials/s")
+
+
+if __name__ == "__main__":
+    main()
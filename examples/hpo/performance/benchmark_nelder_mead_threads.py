@@ -0,0 +1,66 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from aiaccel.hpo.algorithms import NelderMeadAlgorithm
+
+
+def run(n_threads: int, dimensions: int, n_trials: int, speculative: bool, duration: float) -> tuple[float, float]:
+    nm = NelderMeadAlgorithm(
+        dimensions=dimensions, rng=np.random.RandomState(0), block=True, timeout=60, speculative=speculative
+    )
+
+    counter_lock = threading.Lock()
+    n_started = 0
+    issue_times: list[float] = []
+
+    def worker() -> None:
+        nonlocal n_started
+        while True:
+            with counter_lock:
+                if n_started >= n_trials:
+                    return
+                n_started += 1
+
+            start = time.perf_counter()
+            vertex = nm.get_vertex()
+            issue_times.append(time.perf_counter() - start)
+
+            time.sleep(duration)  # evaluation of the objective
+            nm.put_value(vertex, float(np.sum((vertex - 0.5) ** 2)))
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return n_trials / elapsed, float(np.median(issue_times))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--dimensions", type=int, default=10)
+    parser.add_argument("--n_trials", type=int, default=2000)
+    parser.add_argument("--speculative", action="store_true")
+    parser.add_argument("--duration", type=float, default=0.0, help="seconds to evaluate each vertex")
+    args = parser.parse_args()
+
+    for n_threads in args.n_threads:
+        trials_per_second, issue_time = run(n_threads, args.dimensions, args.n_trials, args.speculative, args.duration)
+        print(
+            f"{n_threads:>3} threads: {trials_per_second:10.1f} trials/s, median get_vertex {issue_time * 1e6:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import tempfile
+import time
+
+import optuna
+
+
+def create_storage(storage_type: str, directory: Path) -> optuna.storages.BaseStorage:
+    if storage_type == "rdb":
+        return optuna.storages.RDBStorage(
+            f"sqlite:///{directory / 'optuna.db'}", engine_kwargs={"connect_args": {"timeout": 300}}
+        )
+    else:
+        return optuna.storages.JournalStorage(
+            optuna.storages.journal.JournalFileBackend(str(directory / "optuna.journal"))
+        )
+
+
+def worker(storage_type: str, directory: Path, n_trials: int) -> None:
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    study = optuna.load_study(study_name="benchmark", storage=create_storage(storage_type, directory))
+    for _ in range(n_trials):
+        trial = study.ask()
+        study.tell(trial, trial.suggest_float("x", 0.0, 1.0) ** 2)
+
+
+def run(storage_type: str, directory: Path, n_workers: int, n_trials: int) -> float:
+    optuna.create_study(study_name="benchmark", storage=create_storage(storage_type, directory))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(n_workers) as pool:
+        futures = [pool.submit(worker, storage_type, directory, n_trials) for _ in range(n_workers)]
+        for future in futures:
+            future.result()
+
+    return n_workers * n_trials / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_workers", type=int, default=8)
+    parser.add_argument("--n_trials", type=int, default=100, help="Number of trials per worker.")
+    parser.add_argument("--directory", type=Path, default=None, help="Place the storage on this (shared) filesystem.")
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    for storage_type in ["rdb", "journal"]:
+        with tempfile.TemporaryDirectory(dir=args.directory) as tmp_dir:
+            trials_per_second = run(storage_type, Path(tmp_dir), args.n_workers, args.n_trials)
+
+        print(f"{storage_type:>8}: {trials_per_second:8.1f} trials/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+import optuna
+
+from aiaccel.hpo.optuna.buffered_storage import buffered_study
+from aiaccel.hpo.optuna.hparams import Float
+from aiaccel.hpo.optuna.hparams_manager import HparamsManager
+
+
+def run(storage: str, n_params: int, n_trials: int, batched: bool) -> float:
+    study = optuna.create_study(storage=storage, sampler=optuna.samplers.RandomSampler(seed=0))
+    asking_study = buffered_study(study) if batched else study
+    manager = HparamsManager(**{f"x{index}": Float(low=0.0, high=1.0) for index in range(n_params)})
+
+    start = time.perf_counter()
+    for _ in range(n_trials):
+        trial = asking_study.ask()
+        if batched:
+            manager.suggest_hparams(trial)
+        else:  # one storage write per parameter
+            {name: param_fn(trial, name) for name, param_fn in manager.params.items()}
+        study.tell(trial, 0.0)
+
+    return n_trials / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_params", type=int, default=100)
+    parser.add_argument("--n_trials", type=int, default=50)
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for batched in [False, True]:
+            storage = f"sqlite:///{Path(directory) / f'batched_{batched}.db'}"
+            trials_per_second = run(storage, args.n_params, args.n_trials, batched)
+            print(f"{'batched' if batched else 'per-parameter':>13}: {trials_per_second:8.1f} trials/s")
+
+
+if __name__ == "__main__":
+    main()
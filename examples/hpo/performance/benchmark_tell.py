@@ -0,0 +1,51 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+import optuna
+
+from aiaccel.hpo.apps.optimize import tell_trials
+
+
+def run(mode: str, n_trials: int, batch_size: int, storage_url: str) -> float:
+    study = optuna.create_study(storage=storage_url, sampler=optuna.samplers.RandomSampler(seed=0))
+
+    start = time.perf_counter()
+    for _ in range(n_trials // batch_size):
+        trials = [study.ask() for _ in range(batch_size)]
+        results = [(trial, trial.suggest_float("x", 0.0, 1.0) ** 2) for trial in trials]
+
+        if mode == "per-trial":
+            for trial, y in results:
+                frozentrial = study.tell(trial, y)
+                study._log_completed_trial([y], frozentrial.number, frozentrial.params)
+        else:
+            tell_trials(study, results)
+
+    return n_trials / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_trials", type=int, default=2000)
+    parser.add_argument("--batch_size", type=int, default=200)
+    args = parser.parse_args()
+
+    optuna.logging.set_verbosity(optuna.logging.INFO)
+
+    results = {}
+    for mode in ["per-trial", "batched"]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            storage_url = f"sqlite:///{Path(tmp_dir) / 'optuna.db'}"
+            results[mode] = run(mode, args.n_trials, args.batch_size, storage_url)
+
+    for mode, trials_per_second in results.items():
+        print(f"{mode:>10}: {trials_per_second:8.1f} trials/s")
+
+
+if __name__ == "__main__":
+    main()
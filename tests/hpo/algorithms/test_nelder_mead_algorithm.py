@@ -3,6 +3,8 @@
 
 import numpy.typing as npt
 
+import threading
+import time
 from unittest.mock import patch
 
 import numpy as np
@@ -251,3 +253,238 @@ def test_compare_results(
 
         assert isinstance(enqueued, bool)
         nm.put_value(np.array(expected_vertex), expected_value, enqueued)
+
+
+@pytest.mark.parametrize(
+    "candidate_values, expected_vertices",
+    [
+        pytest.param([4.0, 9.0, 9.0, 9.0], [[0.9, 0.9]], id="reflect"),
+        pytest.param([2.0, 1.0, 9.0, 9.0], [[0.9, 0.8]], id="expand -> fe < fr"),
+        pytest.param([2.0, 3.0, 9.0, 9.0], [[0.9, 0.9]], id="expand -> fe > fr"),
+        pytest.param([6.0, 9.0, 5.5, 9.0], [[0.7, 0.85]], id="outside_contract -> foc <= fr"),
+        pytest.param([6.0, 9.0, 7.0, 9.0], [[0.7, 0.8], [0.75, 0.9]], id="outside_contract -> shrink"),
+        pytest.param([8.0, 9.0, 9.0, 6.0], [[0.7, 0.75]], id="inside_contract -> fic < self.values[-1]"),
+        pytest.param([8.0, 9.0, 9.0, 8.5], [[0.7, 0.8], [0.75, 0.9]], id="inside_contract -> shrink"),
+    ],
+)
+def test_speculative(
+    vertices: list[npt.NDArray[np.float64]],
+    values: list[float],
+    candidate_values: list[float],
+    expected_vertices: list[list[float]],
+) -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, block=False, speculative=True)
+    for vertex, value in zip(vertices, values, strict=False):
+        nm.put_value(vertex, value, True)
+
+    # reflect, expand, outside contract, and inside contract are proposed at once
+    candidates = [nm.get_vertex() for _ in range(4)]
+    assert np.allclose(candidates, [[0.7, 0.7], [0.7, 0.6], [0.7, 0.75], [0.7, 0.85]])
+
+    with pytest.raises(NelderMeadEmptyError):
+        nm.get_vertex()
+
+    # results are matched to the candidates regardless of their order
+    for candidate, value in reversed(list(zip(candidates, candidate_values, strict=True))):
+        nm.put_value(candidate, value)
+
+    for expected_vertex in expected_vertices:
+        assert np.allclose(nm.get_vertex(), expected_vertex)
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_simplex_invariants(speculative: bool) -> None:
+    nm = NelderMeadAlgorithm(dimensions=20, rng=np.random.RandomState(0), speculative=speculative)
+
+    for _ in range(2000):
+        vertex = nm.get_vertex()
+        nm.put_value(vertex, float(np.sum((vertex - 0.3) ** 2)))
+
+    assert nm.vertices.shape == (21, 20)
+    assert np.all(np.diff(nm.values) >= 0)
+    assert np.allclose(nm._centroid(), np.mean(nm.vertices[:-1], axis=0))
+    assert nm.values[0] < 0.5
+
+
+def test_state_dict() -> None:
+    def sphere(vertex: npt.NDArray[np.float64]) -> float:
+        return float(np.sum((vertex - 0.3) ** 2))
+
+    nm = NelderMeadAlgorithm(dimensions=3, rng=np.random.RandomState(0))
+
+    state_dict = None
+    for _ in range(30):
+        num_iterations = nm.num_iterations
+        vertex = nm.get_vertex()
+        if state_dict is None and nm.num_iterations != num_iterations:
+            state_dict = nm.state_dict()
+            vertex_restored = vertex
+        nm.put_value(vertex, sphere(vertex))
+
+    assert state_dict is not None
+
+    # the restored algorithm restarts the iteration at which the state was taken
+    nm_restored = NelderMeadAlgorithm()
+    nm_restored.load_state_dict(state_dict)
+    assert np.allclose(nm_restored.get_vertex(), vertex_restored)
+    assert nm_restored.num_iterations == state_dict["num_iterations"]
+
+
+@pytest.mark.parametrize("block", [False, True])
+def test_result_timeout(vertices: list[npt.NDArray[np.float64]], values: list[float], block: bool) -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, block=block, result_timeout=0.05)
+    for vertex, value in zip(vertices, values, strict=False):
+        nm.put_value(vertex, value, True)
+
+    yr = nm.get_vertex()
+    assert np.allclose(yr, [0.7, 0.7])
+
+    if not block:
+        with pytest.raises(NelderMeadEmptyError):
+            nm.get_vertex()
+        time.sleep(0.1)
+
+    # the reflection is regarded as inf, which leads to the inside contraction
+    yic = nm.get_vertex()
+    assert np.allclose(yic, [0.7, 0.85])
+
+    # the late result is not taken as the result of the inside contraction
+    nm.put_value(yr, 100.0)
+    if not block:
+        with pytest.raises(NelderMeadEmptyError):
+            nm.get_vertex()
+
+    nm.put_value(yic, 6.0)
+    assert np.allclose(nm.get_vertex(), [0.7, 0.75])
+
+
+def test_result_timeout_after_restart() -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, result_timeout=0.2, rng=np.random.RandomState(0))
+    v0, v1, v2 = (nm.get_vertex() for _ in range(3))
+
+    # the initial iteration is completed without the result of v2, e.g., by a duplicate result of v0,
+    # and abandoned by the enqueued result
+    nm.put_value(v0, 1.0)
+    nm.put_value(v0, 1.0)
+    nm.put_value(v1, 2.0)
+    nm.put_value(np.array([0.5, 0.5]), 0.5, enqueue=True)
+    time.sleep(0.3)
+
+    yr = nm.get_vertex()
+
+    # the timed-out v2 of the abandoned iteration is not regarded as the inf result of the reflection
+    with pytest.raises(NelderMeadEmptyError):
+        nm.get_vertex()
+
+    # the late result of v2 is handled like an enqueued one
+    nm.put_value(v2, 100.0)
+    nm.put_value(yr, 0.8)
+    nm.get_vertex()
+    assert 0.8 in nm.values and 100.0 not in nm.values
+
+
+def test_convergence() -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, rng=np.random.RandomState(0))
+    assert nm.diameter == np.inf and nm.value_spread == np.inf
+    assert not nm.is_converged(xtol=1e-3, ftol=1e-3)
+
+    for _ in range(200):
+        vertex = nm.get_vertex()
+        nm.put_value(vertex, float(np.sum((vertex - 0.3) ** 2)))
+
+    assert nm.diameter < 1e-3
+    assert nm.value_spread < 1e-6
+    assert nm.is_converged(xtol=1e-3)
+    assert not nm.is_converged(xtol=0.0, ftol=0.0)
+
+
+def test_num_stalls() -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, rng=np.random.RandomState(0))
+
+    for _ in range(30):
+        nm.put_value(nm.get_vertex(), 1.0)  # flat objective never improves the best result
+
+    assert nm.num_stalls == nm.num_iterations - 1
+    assert nm.is_converged(max_stalls=nm.num_stalls)
+
+
+def test_proposals_are_popped_without_lock() -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, rng=np.random.RandomState(0))
+
+    first_vertex = nm.get_vertex()  # proposes all the initial vertices at once
+    with nm.lock:
+        vertices = [first_vertex, nm.get_vertex(), nm.get_vertex()]
+
+    with pytest.raises(NelderMeadEmptyError):
+        nm.get_vertex()
+
+    assert len({tuple(vertex) for vertex in vertices}) == 3
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_parallel_get_vertex(speculative: bool) -> None:
+    nm = NelderMeadAlgorithm(
+        dimensions=2, rng=np.random.RandomState(0), block=True, timeout=10, speculative=speculative
+    )
+    num_trials = 0
+    num_trials_lock = threading.Lock()
+
+    def worker() -> None:
+        nonlocal num_trials
+        while True:
+            with num_trials_lock:
+                if num_trials >= 200:
+                    return
+                num_trials += 1
+
+            vertex = nm.get_vertex()
+            nm.put_value(vertex, float(np.sum((vertex - 0.3) ** 2)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert np.allclose(nm.vertices[0], 0.3, atol=0.05)
+
+
+@pytest.mark.parametrize(
+    "boundary, expected_vertex",
+    [
+        ("penalty", [0.7, 0.8]),  # the reflection [1.3, 0.5] is regarded as inf, so the inside contraction
+        ("projection", [1.0, 0.5]),
+        ("reflection", [0.7, 0.5]),
+    ],
+)
+def test_boundary(boundary: str, expected_vertex: list[float]) -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, boundary=boundary)
+    for vertex, value in zip([[0.9, 0.9], [0.9, 0.5], [0.5, 0.9]], [1.0, 2.0, 3.0], strict=True):
+        nm.put_value(np.array(vertex), value, True)
+
+    assert np.allclose(nm.get_vertex(), expected_vertex)
+    assert nm.results.empty()  # the penalty is not fed back through the queue
+
+    with pytest.raises(NelderMeadEmptyError):
+        nm.get_vertex()
+
+
+def test_boundary_speculative() -> None:
+    nm = NelderMeadAlgorithm(dimensions=2, speculative=True)
+    for vertex, value in zip([[0.9, 0.9], [0.9, 0.5], [0.5, 0.9]], [1.0, 2.0, 3.0], strict=True):
+        nm.put_value(np.array(vertex), value, True)
+
+    # only the inside contraction is in the range
+    assert np.allclose(nm.get_vertex(), [0.7, 0.8])
+    with pytest.raises(NelderMeadEmptyError):
+        nm.get_vertex()
+
+    nm.put_value(np.array([0.7, 0.8]), 0.5)
+    nm.get_vertex()  # starts the next iteration
+    assert np.allclose(nm.vertices[0], [0.7, 0.8])
+
+
+def test_invalid_boundary() -> None:
+    with pytest.raises(ValueError):
+        NelderMeadAlgorithm(dimensions=2, boundary="clip")
@@ -0,0 +1,6 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+
+def objective(x1: float, x2: float) -> float:
+    return (x1**2) - (4.0 * x1) + (x2**2) - x2 - (x1 * x2)
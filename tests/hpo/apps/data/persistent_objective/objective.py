@@ -0,0 +1,14 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from aiaccel.hpo.runners import serve
+
+
+def objective(x1: float, x2: float) -> float:
+    print(f"evaluating x1={x1}, x2={x2}")  # must not corrupt the protocol
+
+    return (x1**2) - (4.0 * x1) + (x2**2) - x2 - (x1 * x2)
+
+
+if __name__ == "__main__":
+    serve(objective)
@@ -0,0 +1,25 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import argparse
+import json
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("out_filename", type=str)
+    parser.add_argument("--x1", type=float)
+    args = parser.parse_args()
+
+    for step in range(3):
+        with open(args.out_filename + ".partial", "a") as f:
+            f.write(json.dumps({"step": step, "value": args.x1}) + "\n")
+        time.sleep(0.2)
+
+    with open(args.out_filename, "w") as f:
+        f.write(f"{args.x1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 # Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
 # SPDX-License-Identifier: MIT
 
+from typing import Any
+
 from collections.abc import Callable, Generator
 from contextlib import AbstractContextManager, contextmanager
 import os
@@ -10,9 +12,12 @@ import subprocess
 
 from hydra.utils import instantiate
 
+import optuna
 import pytest
+import sqlalchemy
 
 from aiaccel.config import prepare_config
+from aiaccel.hpo.apps.optimize import tell_trials
 
 
 @pytest.fixture()
@@ -87,6 +92,106 @@ def test_resume(workspace_factory: Callable[..., AbstractContextManager[Path]])
         assert len(study.get_trials()) == 30
 
 
+def test_journal_storage(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory() as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml storage=journal --", shell=True, check=True)
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml storage=journal --", shell=True, check=True)
+
+        assert (workspace / "optuna.journal").exists()
+        assert not (workspace / "optuna.db").exists()
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+        assert len(study.get_trials()) == 30
+
+
+def test_callable_objective(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory("callable_objective") as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+        assert len(study.get_trials()) == 15
+
+        best_value = study.best_trial.value
+
+    # check consistency with the command-style execution
+    with workspace_factory() as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+
+    assert best_value == study.best_trial.value
+
+
+def test_persistent_objective(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory("persistent_objective") as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+        assert len(study.get_trials()) == 15
+
+        best_value = study.best_trial.value
+
+    # check consistency with the command-style execution
+    with workspace_factory() as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+
+    assert best_value == study.best_trial.value
+
+
+def test_job_objective(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory("job_objective") as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+        assert len(study.get_trials(states=[optuna.trial.TrialState.COMPLETE])) == 6
+
+        # each batch of three trials is submitted as a single array job
+        assert len(list((workspace / "jobs").glob("array_*.tasks.json"))) == 2
+
+
+def test_job_objective_missing_result(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory("job_objective") as workspace:
+        # the trials with x1 > 0.5 exit without writing their results
+        objective = (workspace / "objective.py").read_text()
+        (workspace / "objective.py").write_text(
+            objective.replace("    y = ", "    if args.x1 > 0.5:\n        raise SystemExit(1)\n\n    y = ")
+        )
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+
+        # only the failed trials are told as FAIL, and the study runs all trials
+        assert len(study.trials) == 6
+        for trial in study.trials:
+            expected = optuna.trial.TrialState.FAIL if trial.params["x1"] > 0.5 else optuna.trial.TrialState.COMPLETE
+            assert trial.state == expected
+        assert {trial.state for trial in study.trials} == {
+            optuna.trial.TrialState.FAIL,
+            optuna.trial.TrialState.COMPLETE,
+        }
+
+
+def test_convergence_callback(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory("convergence_objective") as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+
+        # stopped by the callback long before n_trials
+        assert 0 < len(study.get_trials()) < config.n_trials
+        assert study.best_value < -3.99
+
+
 def test_multi_objective(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
     with workspace_factory("multi_objective") as workspace:
         subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
@@ -119,3 +224,80 @@ def test_from_cli_and_config(workspace_factory: Callable[..., AbstractContextMan
         config = prepare_config(workspace / "merged_config.yaml")
         study = instantiate(config.study)
         assert len(study.get_trials()) == 30
+
+
+def test_pruning_objective(workspace_factory: Callable[..., AbstractContextManager[Path]]) -> None:
+    with workspace_factory("pruning_objective") as workspace:
+        subprocess.run("aiaccel-hpo optimize --config=config.yaml", shell=True, check=True)
+
+        config = prepare_config(workspace / "merged_config.yaml")
+        study = instantiate(config.study)
+        assert len(study.get_trials()) == 10
+
+        for trial in study.get_trials():
+            if trial.params["x1"] > 0.5:
+                assert trial.state == optuna.trial.TrialState.PRUNED
+                assert len(trial.intermediate_values) < 3
+            else:
+                assert trial.state == optuna.trial.TrialState.COMPLETE
+                assert trial.value == trial.params["x1"]
+
+        assert not any(workspace.glob("*.partial"))
+
+
+def count_write_commits(study: optuna.Study) -> list[None]:
+    # commits of the transactions that write to the database, as reads are also committed by RDBStorage
+    engine = study._storage._backend.engine
+    commits: list[None] = []
+    writing = False
+
+    def before_cursor_execute(connection: Any, cursor: Any, statement: str, *args: Any) -> None:
+        nonlocal writing
+        writing |= statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+
+    def commit(connection: Any) -> None:
+        nonlocal writing
+        if writing:
+            commits.append(None)
+        writing = False
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    sqlalchemy.event.listen(engine, "commit", commit)
+
+    return commits
+
+
+@pytest.mark.parametrize("storage", ["inmemory", "sqlite"])
+def test_tell_trials(caplog: pytest.LogCaptureFixture, tmp_path: Path, storage: str) -> None:
+    study = optuna.create_study(storage=None if storage == "inmemory" else f"sqlite:///{tmp_path}/optuna.db")
+    trials = [study.ask() for _ in range(3)]
+
+    with caplog.at_level("INFO", logger="optuna"):
+        frozentrials = tell_trials(study, [(trials[0], 2.0), (trials[1], 1.0), (trials[2], optuna.TrialPruned())])
+
+    assert [frozentrial.state for frozentrial in frozentrials] == [
+        optuna.trial.TrialState.COMPLETE,
+        optuna.trial.TrialState.COMPLETE,
+        optuna.trial.TrialState.PRUNED,
+    ]
+    assert [message for message in caplog.messages if message.startswith("Trial")] == [
+        "Trial 0 finished with value: 2.0 and parameters: {}. Best is trial 0 with value: 2.0.",
+        "Trial 1 finished with value: 1.0 and parameters: {}. Best is trial 1 with value: 1.0.",
+        "Trial 2 pruned.",
+    ]
+
+
+def test_tell_trials_single_commit(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+    commits = count_write_commits(study)
+
+    for batch in range(2):
+        trials = [study.ask() for _ in range(3)]
+        commits.clear()
+        tell_trials(study, [(trial, float(trial.number)) for trial in trials[:2]] + [(trials[2], optuna.TrialPruned())])
+
+        assert len(commits) == 1  # one commit per batch
+        assert [trial.values for trial in study.trials[3 * batch :]] == [[3.0 * batch], [3.0 * batch + 1.0], None]
+        assert study.trials[3 * batch + 2].state == optuna.trial.TrialState.PRUNED
+
+    assert study.best_trial.number == 0
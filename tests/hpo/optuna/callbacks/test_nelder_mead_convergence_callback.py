@@ -0,0 +1,45 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import optuna
+import pytest
+
+from aiaccel.hpo.optuna.callbacks import NelderMeadConvergenceCallback
+from aiaccel.hpo.optuna.samplers import NelderMeadSampler
+
+
+def objective(trial: optuna.trial.Trial) -> float:
+    x = trial.suggest_float("x", -5.0, 5.0)
+    y = trial.suggest_float("y", -5.0, 5.0)
+    return (x - 1.0) ** 2 + (y + 1.0) ** 2
+
+
+@pytest.mark.parametrize(
+    "criteria",
+    [
+        pytest.param({"xtol": 1e-4}, id="xtol"),
+        pytest.param({"ftol": 1e-8}, id="ftol"),
+        pytest.param({"max_stalls": 10}, id="max_stalls"),
+    ],
+)
+def test_stop(criteria: dict[str, float]) -> None:
+    sampler = NelderMeadSampler(search_space={"x": (-5.0, 5.0), "y": (-5.0, 5.0)}, seed=42)
+    study = optuna.create_study(sampler=sampler)
+
+    study.optimize(objective, n_trials=1000, callbacks=[NelderMeadConvergenceCallback(**criteria)])
+
+    assert len(study.trials) < 1000
+    assert sampler.is_converged(**criteria)  # type: ignore[arg-type]
+    assert study.best_value < 1e-4
+
+
+def test_no_criteria() -> None:
+    with pytest.raises(ValueError):
+        NelderMeadConvergenceCallback()
+
+
+def test_other_sampler() -> None:
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+
+    with pytest.raises(TypeError):
+        study.optimize(objective, n_trials=1, callbacks=[NelderMeadConvergenceCallback(xtol=1e-4)])
@@ -205,6 +205,175 @@ def test_after_trial_sub_sampler(
         mock_iter.method.assert_not_called()
 
 
+def test_system_attrs_are_cached() -> None:
+    search_space = {f"x{i}": (-5.0, 5.0) for i in range(10)}
+    sampler = NelderMeadSampler(search_space=search_space, seed=42)
+    study = create_study(sampler)
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        return sum(trial.suggest_float(name, *distribution) ** 2 for name, distribution in search_space.items())
+
+    with patch.object(
+        study._storage, "get_trial_system_attrs", wraps=study._storage.get_trial_system_attrs
+    ) as mock_get_trial_system_attrs:
+        study.optimize(objective, n_trials=20)
+
+    assert mock_get_trial_system_attrs.call_count == 0
+    assert sampler._trial_system_attrs == {}
+    assert all(len(trial.system_attrs["params"]) == len(search_space) for trial in study.trials)
+
+
+def test_failed_trials(search_space: dict[str, tuple[int | float, int | float]]) -> None:
+    sampler = create_sampler(search_space)
+    study = create_study(sampler)
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        x, y = (trial.suggest_float(name, *distribution) for name, distribution in search_space.items())
+        if x + y > 2.0:
+            raise ValueError("infeasible")
+        return (x - 1.0) ** 2 + (y + 1.0) ** 2
+
+    # failed trials are regarded as inf instead of stalling the simplex
+    study.optimize(objective, n_trials=50, catch=(ValueError,))
+
+    states = [trial.state for trial in study.trials]
+    assert len(states) == 50
+    assert optuna.trial.TrialState.FAIL in states
+    assert study.best_value < 0.1
+
+
+@pytest.mark.parametrize("boundary", ["penalty", "projection", "reflection"])
+def test_boundary(boundary: str) -> None:
+    search_space = {"x": (-5.0, 5.0), "y": (-5.0, 5.0)}
+    sampler = NelderMeadSampler(search_space=search_space, seed=42, boundary=boundary)
+    study = create_study(sampler)
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        x, y = (trial.suggest_float(name, *distribution) for name, distribution in search_space.items())
+        return (x - 6.0) ** 2 + (y + 6.0) ** 2  # the optimum in the search space is at the corner (5, -5)
+
+    study.optimize(objective, n_trials=100)
+
+    for trial in study.trials:
+        assert all(-5.0 <= value <= 5.0 for value in trial.params.values())
+    assert study.best_value < 2.0 + 1e-2
+
+
+def test_skip_duplicates() -> None:
+    search_space = {"x": (-5, 5), "y": (-5, 5)}
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        x, y = (trial.suggest_int(name, *distribution) for name, distribution in search_space.items())
+        return (x - 1.0) ** 2 + (y + 2.0) ** 2
+
+    def first_duplicate(study: optuna.study.Study) -> int:
+        params = [tuple(trial.params.values()) for trial in study.trials]
+        return next(number for number, p in enumerate(params) if p in params[:number])
+
+    study = create_study(NelderMeadSampler(search_space=search_space, seed=42))
+    study.optimize(objective, n_trials=50)
+    assert study.trials[first_duplicate(study)].params != {"x": 1, "y": -2}
+
+    sampler = NelderMeadSampler(search_space=search_space, seed=42, skip_duplicates=True)
+    study = create_study(sampler)
+    study.optimize(objective, n_trials=50)
+
+    # trials are run twice only after the simplex has shrunk into the optimum
+    number = first_duplicate(study)
+    assert all(trial.params == {"x": 1, "y": -2} for trial in study.trials[number:])
+    assert len(sampler._cached_values) == number
+
+
+def test_categorical() -> None:
+    search_space = {"x": (-5.0, 5.0), "c": (0, 1)}
+    offsets = {"a": 3.0, "b": 0.0, "c": 1.0}
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        x = trial.suggest_float("x", *search_space["x"])
+        c = trial.suggest_categorical("c", list(offsets))
+        return (x - 1.0) ** 2 + offsets[c]
+
+    study = create_study(NelderMeadSampler(search_space=search_space, seed=42, skip_duplicates=True))
+    study.enqueue_trial({"x": 0.0, "c": "a"})
+    study.optimize(objective, n_trials=50)
+
+    assert study.best_params["c"] == "b"
+    assert study.best_value < 1e-2
+
+
+def test_multiple_simplices() -> None:
+    search_space = {"x": (-5.0, 5.0), "y": (-5.0, 5.0)}
+    sampler = NelderMeadSampler(search_space=search_space, seed=42, num_simplices=3, restart_diameter=1e-3)
+    study = create_study(sampler)
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        x, y = (trial.suggest_float(name, *distribution) for name, distribution in search_space.items())
+        return (x - 1.0) ** 2 + (y + 1.0) ** 2
+
+    study.optimize(objective, n_trials=300)
+
+    system_attrs = [study._storage.get_trial_system_attrs(trial._trial_id) for trial in study.trials]
+    assert {attrs["nm_index"] for attrs in system_attrs} == {0, 1, 2}
+    assert max(attrs["nm_generation"] for attrs in system_attrs) > 0  # restarted on convergence
+    assert study.best_value < 1e-4
+
+
+def test_multiple_simplices_parallel() -> None:
+    search_space = {"x": (-5.0, 5.0), "y": (-5.0, 5.0), "z": (-5.0, 5.0)}
+    sampler = NelderMeadSampler(search_space=search_space, seed=42, block=True, num_simplices=4)
+    study = create_study(sampler)
+
+    def objective(trial: optuna.trial.Trial) -> float:
+        return sphere_sleep([trial.suggest_float(name, *distribution) for name, distribution in search_space.items()])
+
+    # every worker gets a vertex of one of the simplices without waiting for the others
+    study.optimize(objective, n_trials=60, n_jobs=4)
+
+    assert all(trial.state == optuna.trial.TrialState.COMPLETE for trial in study.trials)
+    assert len(study.trials) == 60
+
+
+def test_snapshot_with_running_trials(tmp_path: Path) -> None:
+    search_space = {"x": (-5.0, 5.0), "y": (-5.0, 5.0)}
+    storage = f"sqlite:///{tmp_path}/optuna.db"
+    study = optuna.create_study(
+        sampler=NelderMeadSampler(search_space=search_space, seed=42, snapshot_interval=1), storage=storage
+    )
+
+    def ask() -> optuna.trial.Trial:
+        trial = study.ask()
+        for name, distribution in search_space.items():
+            trial.suggest_float(name, *distribution)
+        return trial
+
+    for value in [1.0, 2.0, 3.0]:  # initial simplex
+        study.tell(ask(), value)
+    study.tell(ask(), 1.5)  # the reflection starts the first iteration and is accepted
+
+    # the enqueued trial is still running when the next iteration starts
+    study.enqueue_trial({"x": 0.0, "y": 0.0})
+    enqueued_trial = ask()
+    with pytest.warns(UserWarning, match="Snapshot of NelderMeadSampler is skipped"):
+        trial = ask()
+    study.tell(enqueued_trial, 0.5)
+    study.tell(trial, 4.0)
+
+    snapshot = study._storage.get_study_system_attrs(study._study_id)["nelder_mead_snapshot"]
+    assert snapshot["trial_number"] == 3
+
+    sampler = NelderMeadSampler(search_space=search_space, seed=42, snapshot_interval=1)
+    study = optuna.load_study(study_name=study.study_name, storage=storage, sampler=sampler)
+    ask()
+
+    assert 0.5 in sampler.nm.values  # the result of the enqueued trial is replayed
+
+
+@pytest.mark.parametrize("kwargs", [{"speculative": True}, {"block": True}, {"result_timeout": 1.0}])
+def test_snapshot_parallel(kwargs: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        NelderMeadSampler(search_space={"x": (-5.0, 5.0)}, snapshot_interval=1, **kwargs)
+
+
 def ackley(x: list[int | float]) -> float:
     # Ackley function
     y = (
@@ -295,6 +464,17 @@ class TestNelderMeadAckley(BaseTestNelderMead):
             assert math.isclose(trial.values[0], float(result["objective"]), rel_tol=0.000001)
 
 
+class TestNelderMeadAckleySharedStorage(TestNelderMeadAckley):
+    def setup_method(self) -> None:
+        super().setup_method()
+
+        # trial ids are shared among studies in the same storage
+        storage = optuna.storages.InMemoryStorage()
+        optuna.create_study(storage=storage, study_name="other").optimize(lambda trial: 0.0, n_trials=3)
+
+        self.study = optuna.create_study(sampler=self.study.sampler, storage=storage, study_name="nelder-mead")
+
+
 class TestNelderMeadAckleyParallel(BaseTestNelderMead):
     def setup_method(self) -> None:
         search_space = {
@@ -326,6 +506,36 @@ class TestNelderMeadAckleyParallel(BaseTestNelderMead):
             assert almost_equal_trial_exists
 
 
+class TestNelderMeadAckleySpeculative(BaseTestNelderMead):
+    def setup_method(self) -> None:
+        search_space = {
+            "x": (0.0, 10.0),
+            "y": (0.0, 10.0),
+        }
+        sampler = NelderMeadSampler(search_space=search_space, seed=42, block=True, speculative=True)
+
+        self.common_setup(
+            search_space=search_space,
+            objective=ackley_sleep,
+            result_file_name="results_ackley.csv",
+            study=optuna.create_study(sampler=sampler),
+            n_jobs=4,
+        )
+
+    def optimize(self) -> None:
+        self.study.optimize(self.func, n_trials=60, n_jobs=self.n_jobs)
+
+    def validation(self, results: list[dict[str | Any, str | Any]]) -> None:
+        # every trial of the sequential NelderMead is also evaluated speculatively
+        for result in results[:10]:
+            assert any(
+                math.isclose(trial.params["x"], float(result["x"]), rel_tol=0.000001)
+                and math.isclose(trial.params["y"], float(result["y"]), rel_tol=0.000001)
+                and math.isclose(trial.values[0], float(result["objective"]), rel_tol=0.000001)
+                for trial in self.study.trials
+            )
+
+
 class TestNelderMeadSphereParallel(BaseTestNelderMead):
     def setup_method(self) -> None:
         search_space = {
@@ -545,13 +755,21 @@ class TestNelderMeadAckleyLogScale(BaseTestNelderMead):
 
 
 class TestNelderMeadAckleyResumption(BaseTestNelderMead):
+    snapshot_interval: int | None = None
+
+    def create_sampler(self) -> NelderMeadSampler:
+        return NelderMeadSampler(search_space=self.search_space, seed=42, snapshot_interval=self.snapshot_interval)
+
+    def create_storage(self, dname: str) -> str | optuna.storages.BaseStorage:
+        return f"sqlite:///{dname}/optuna_study.db"
+
     def test_sampler(self) -> None:
         self.search_space = {
             "x": (-10, 10),
             "y": (-10, 10),
         }
         self.objective = ackley
-        sampler = NelderMeadSampler(search_space=self.search_space, seed=42)
+        sampler = self.create_sampler()
 
         # No resumption
         study = optuna.create_study(sampler=sampler)
@@ -561,33 +779,60 @@ class TestNelderMeadAckleyResumption(BaseTestNelderMead):
 
         # Resumption
         with tempfile.TemporaryDirectory() as dname:
-            sampler = NelderMeadSampler(search_space=self.search_space, seed=42)
+            sampler = self.create_sampler()
             study_resumption = optuna.create_study(
                 sampler=sampler,
                 study_name=study_name,
-                storage=f"sqlite:///{dname}/optuna_study.db",
+                storage=self.create_storage(dname),
                 load_if_exists=True,
             )
             study_resumption.enqueue_trial({"x": 1.0, "y": 2.0})
             study_resumption.optimize(func=self.func, n_trials=1)
 
             for _ in range(29):
-                sampler = NelderMeadSampler(search_space=self.search_space, seed=42)
+                sampler = self.create_sampler()
                 study_resumption = optuna.create_study(
                     sampler=sampler,
                     study_name=study_name,
-                    storage=f"sqlite:///{dname}/optuna_study.db",
+                    storage=self.create_storage(dname),
                     load_if_exists=True,
                 )
                 study_resumption.optimize(func=self.func, n_trials=1)
 
-        for trial, trial_resumption in zip(study.trials, study_resumption.trials, strict=False):
+            trials_resumption = study_resumption.trials
+            self.validate_snapshot(study_resumption)
+
+        for trial, trial_resumption in zip(study.trials, trials_resumption, strict=False):
             assert math.isclose(trial.params["x"], trial_resumption.params["x"], rel_tol=0.000001)
             assert math.isclose(trial.params["y"], trial_resumption.params["y"], rel_tol=0.000001)
             assert math.isclose(trial.values[0], trial_resumption.values[0], rel_tol=0.000001)
 
+    def validate_snapshot(self, study: optuna.Study) -> None:
+        assert "nelder_mead_snapshot" not in study._storage.get_study_system_attrs(study._study_id)
+
     def func(self, trial: optuna.trial.Trial) -> float:
         params = []
         for name, distribution in self.search_space.items():
             params.append(trial.suggest_float(name, *distribution))
         return self.objective(params)
+
+
+class TestNelderMeadAckleyResumptionJournal(TestNelderMeadAckleyResumption):
+    def create_storage(self, dname: str) -> str | optuna.storages.BaseStorage:
+        return optuna.storages.JournalStorage(
+            optuna.storages.journal.JournalFileBackend(f"{dname}/optuna_study.journal")
+        )
+
+
+class TestNelderMeadAckleyResumptionSnapshot(TestNelderMeadAckleyResumption):
+    snapshot_interval = 5
+
+    def validate_snapshot(self, study: optuna.Study) -> None:
+        snapshot = study._storage.get_study_system_attrs(study._study_id)["nelder_mead_snapshot"]
+        assert 20 <= snapshot["trial_number"] < 30
+        assert np.array(snapshot["nelder_mead"]["vertices"]).shape == (3, 2)
+
+
+class TestNelderMeadAckleyResumptionMultipleSimplices(TestNelderMeadAckleyResumption):
+    def create_sampler(self) -> NelderMeadSampler:
+        return NelderMeadSampler(search_space=self.search_space, seed=42, num_simplices=2, restart_diameter=0.5)
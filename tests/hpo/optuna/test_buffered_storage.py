@@ -0,0 +1,102 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+from pathlib import Path
+
+import optuna
+from optuna.trial import TrialState
+import pytest
+import sqlalchemy
+
+from aiaccel.hpo.optuna import buffered_storage
+from aiaccel.hpo.optuna.buffered_storage import BufferedStorage, buffered_study
+
+
+def count_write_commits(study: optuna.Study) -> list[None]:
+    # commits of the transactions that write to the database, as reads are also committed by RDBStorage
+    engine = study._storage._backend.engine
+    commits: list[None] = []
+    writing = False
+
+    def before_cursor_execute(connection: Any, cursor: Any, statement: str, *args: Any) -> None:
+        nonlocal writing
+        writing |= statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+
+    def commit(connection: Any) -> None:
+        nonlocal writing
+        if writing:
+            commits.append(None)
+        writing = False
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    sqlalchemy.event.listen(engine, "commit", commit)
+
+    return commits
+
+
+@pytest.mark.parametrize("rdb_batching_supported", [True, False])
+def test_buffer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, rdb_batching_supported: bool) -> None:
+    monkeypatch.setattr(buffered_storage, "_RDB_BATCHING_SUPPORTED", rdb_batching_supported)
+
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+    view = buffered_study(study)
+    storage = view._storage
+    assert isinstance(storage, BufferedStorage)
+
+    trials = [view.ask() for _ in range(3)]
+    commits = count_write_commits(study)
+    with storage.buffer():
+        for index, trial in enumerate(trials):
+            trial.suggest_float("x", 0.0, 1.0)
+            view.tell(trial, float(index))
+
+        # visible through the buffered storage, but not written yet
+        assert view.best_trial.number == 0
+        assert view.trials[1].state == TrialState.COMPLETE and "x" in view.trials[1].params
+        assert all(trial.state == TrialState.RUNNING and trial.params == {} for trial in study.trials)
+        assert len(commits) == 0
+
+    # a single transaction with the private API, otherwise one per write
+    assert len(commits) == (1 if rdb_batching_supported else 6)
+    assert [trial.values for trial in study.trials] == [[0.0], [1.0], [2.0]]
+    assert [trial.params for trial in study.trials] == [trial.params for trial in view.trials]
+    assert all(trial.datetime_complete is not None for trial in study.trials)
+
+
+def test_buffer_in_memory() -> None:
+    study = optuna.create_study()
+    view = buffered_study(study)
+
+    trial = view.ask()
+    with view._storage.buffer():
+        trial.suggest_int("x", 0, 10)
+        view.tell(trial, state=TrialState.PRUNED)
+        assert study.trials[0].state == TrialState.RUNNING
+
+    assert study.trials[0].state == TrialState.PRUNED
+    assert study.trials[0].params == trial.params
+
+
+def test_buffer_rejects_finished_trial(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+    view = buffered_study(study)
+
+    trial = view.ask()
+    with view._storage.buffer():
+        view.tell(trial, 1.0)
+        with pytest.raises(RuntimeError):
+            view._storage.set_trial_param(trial._trial_id, "x", 0.5, optuna.distributions.FloatDistribution(0.0, 1.0))
+
+
+def test_unbuffered_writes(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+    view = buffered_study(study)
+
+    trial = view.ask()
+    trial.suggest_float("x", 0.0, 1.0)
+    assert "x" in study.trials[0].params
+
+    view.tell(trial, 1.0)
+    assert study.trials[0].state == TrialState.COMPLETE
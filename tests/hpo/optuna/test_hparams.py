@@ -49,3 +49,9 @@ def test_log_uniform() -> None:
     trial = optuna.create_study().ask()
 
     assert isinstance(suggest_log_uniform(trial=trial, name="x6"), float)
+
+
+def test_distribution() -> None:
+    assert Float(low=0.1, high=1.0, log=True).distribution == optuna.distributions.FloatDistribution(0.1, 1.0, log=True)
+    assert Int(low=0, high=10, step=2).distribution == optuna.distributions.IntDistribution(0, 10, step=2)
+    assert Categorical(choices=[0, 1]).distribution == optuna.distributions.CategoricalDistribution([0, 1])
@@ -0,0 +1,258 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+from pathlib import Path
+
+from hydra.utils import instantiate
+from omegaconf import OmegaConf
+
+import optuna
+from optuna.distributions import CategoricalDistribution, FloatDistribution, IntDistribution
+from optuna.trial import Trial
+import pytest
+import sqlalchemy
+
+from aiaccel.hpo.optuna.buffered_storage import buffered_study
+from aiaccel.hpo.optuna.hparams import Categorical, Choice, Float, Int, When
+from aiaccel.hpo.optuna.hparams_manager import HparamsManager
+
+
+def count_write_commits(study: optuna.Study) -> list[None]:
+    # commits of the transactions that write to the database, as reads are also committed by RDBStorage
+    engine = study._storage._backend.engine
+    commits: list[None] = []
+    writing = False
+
+    def before_cursor_execute(connection: Any, cursor: Any, statement: str, *args: Any) -> None:
+        nonlocal writing
+        writing |= statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+
+    def commit(connection: Any) -> None:
+        nonlocal writing
+        if writing:
+            commits.append(None)
+        writing = False
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    sqlalchemy.event.listen(engine, "commit", commit)
+
+    return commits
+
+
+def test_distributions() -> None:
+    manager = HparamsManager(
+        x=Float(low=0.0, high=1.0, log=False),
+        y=Int(low=0, high=10, step=2),
+        z=Categorical(choices=["a", "b"]),
+        w=[0.0, 2.0],
+        c=1,
+    )
+
+    assert manager.distributions == {
+        "x": FloatDistribution(low=0.0, high=1.0),
+        "y": IntDistribution(low=0, high=10, step=2),
+        "z": CategoricalDistribution(choices=["a", "b"]),
+        "w": FloatDistribution(low=0.0, high=2.0),
+    }
+
+
+def test_suggest_hparams_writes_params_at_once(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+
+    def written_params(trial: Trial, name: str) -> int:
+        return len(study._storage.get_trial(trial._trial_id).params)
+
+    manager = HparamsManager(x=Float(low=0.0, high=1.0), y=Int(low=0, high=10), n=written_params)
+    trial = buffered_study(study).ask()
+    hparams = manager.suggest_hparams(trial)
+
+    assert hparams["n"] == 0  # nothing is written while suggesting
+    assert study._storage.get_trial(trial._trial_id).params == {"x": hparams["x"], "y": hparams["y"]}
+    assert trial.params == {"x": hparams["x"], "y": hparams["y"]}
+
+
+def test_suggest_hparams_without_buffered_storage(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+
+    def written_params(trial: Trial, name: str) -> int:
+        return len(study._storage.get_trial(trial._trial_id).params)
+
+    manager = HparamsManager(x=Float(low=0.0, high=1.0), y=Int(low=0, high=10), n=written_params)
+    trial = study.ask()
+    hparams = manager.suggest_hparams(trial)
+
+    assert hparams["n"] == 2  # written by Trial.suggest_* one by one
+    assert study._storage.get_trial(trial._trial_id).params == {"x": hparams["x"], "y": hparams["y"]}
+
+
+def test_suggest_hparams_batch(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+    asking_study = buffered_study(study)
+
+    manager = HparamsManager(x=Float(low=0.0, high=1.0), y=Int(low=0, high=10))
+    trials = [asking_study.ask() for _ in range(3)]
+
+    commits = count_write_commits(study)
+    hparams_list = manager.suggest_hparams_batch(trials)
+
+    assert len(commits) == 1
+    for trial, hparams in zip(trials, hparams_list, strict=True):
+        assert study._storage.get_trial(trial._trial_id).params == hparams
+
+
+def test_suggest_hparams_error(tmp_path: Path) -> None:
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/optuna.db")
+
+    def error(trial: Trial, name: str) -> None:
+        raise ValueError
+
+    manager = HparamsManager(x=Float(low=0.0, high=1.0), e=error)
+    trial = buffered_study(study).ask()
+    with pytest.raises(ValueError):
+        manager.suggest_hparams(trial)
+
+    # the parameters suggested before the error are still written
+    assert "x" in study._storage.get_trial(trial._trial_id).params
+
+
+def test_choice() -> None:
+    manager = HparamsManager(
+        optimizer=Choice(
+            choices={
+                "adam": {"beta1": Float(low=0.8, high=0.999)},
+                "sgd": {"momentum": Float(low=0.0, high=0.99), "nesterov": Categorical(choices=[True, False])},
+                "none": None,
+            }
+        ),
+        lr=Float(low=1e-4, high=1e-1, log=True),
+    )
+    assert manager.distributions.keys() == {"optimizer", "beta1", "momentum", "nesterov", "lr"}
+
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    for _ in range(10):
+        trial = study.ask()
+        hparams = manager.suggest_hparams(trial)
+
+        active = {"adam": {"beta1"}, "sgd": {"momentum", "nesterov"}, "none": set()}[hparams["optimizer"]]
+        assert hparams.keys() == trial.params.keys() == {"optimizer", "lr"} | active
+
+
+def test_choice_defaults() -> None:
+    manager = HparamsManager(
+        optimizer=Choice(
+            choices={"adam": {"beta1": Float(low=0.8, high=0.999)}, "sgd": {"momentum": Float(low=0.0, high=0.99)}},
+            defaults={"momentum": 0.0},
+        ),
+    )
+
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    for _ in range(10):
+        trial = study.ask()
+        hparams = manager.suggest_hparams(trial)
+
+        if hparams["optimizer"] == "adam":
+            assert hparams == {"optimizer": "adam", "beta1": trial.params["beta1"], "momentum": 0.0}
+            assert "momentum" not in trial.params
+        else:
+            assert hparams == trial.params
+
+
+def test_when() -> None:
+    manager = HparamsManager(
+        scheduler=Categorical(choices=["cosine", "step"]),
+        step_size=When(key="scheduler", values=["step"], hparam=Int(low=1, high=10), default=0),
+    )
+
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    for _ in range(10):
+        trial = study.ask()
+        hparams = manager.suggest_hparams(trial)
+
+        if hparams["scheduler"] == "step":
+            assert trial.params["step_size"] == hparams["step_size"]
+        else:
+            assert "step_size" not in trial.params
+            assert hparams["step_size"] == 0
+
+
+def test_instantiate_conditional_hparams() -> None:
+    config = OmegaConf.create(
+        {
+            "_convert_": "partial",
+            "_target_": "aiaccel.hpo.optuna.hparams_manager.HparamsManager",
+            "optimizer": {
+                "_target_": "aiaccel.hpo.optuna.hparams.Choice",
+                "choices": {"adam": None, "sgd": {"momentum": [0.0, 0.99]}},
+            },
+            "weight_decay": {
+                "_target_": "aiaccel.hpo.optuna.hparams.When",
+                "key": "optimizer",
+                "values": ["sgd"],
+                "hparam": {"_target_": "aiaccel.hpo.optuna.hparams.Float", "low": 0.0, "high": 0.1},
+            },
+        }
+    )
+    manager = instantiate(config)
+
+    assert manager.distributions == {
+        "optimizer": CategoricalDistribution(choices=["adam", "sgd"]),
+        "momentum": FloatDistribution(low=0.0, high=0.99),
+        "weight_decay": FloatDistribution(low=0.0, high=0.1),
+    }
+
+
+def test_map_params() -> None:
+    manager = HparamsManager(
+        optimizer=Choice(choices={"adam": None, "sgd": {"momentum": Float(low=0.0, high=0.99)}}),
+        n_layers=Int(low=1, high=8, step=1),
+        step_size=When(key="optimizer", values=["sgd"], hparam=Int(low=1, high=10)),
+        nesterov=When(key="optimizer", values=["sgd"], hparam=Categorical(choices=[True, False])),
+        c=1,
+    )
+
+    assert manager.map_params({"optimizer": "adam", "n_layers": 3, "removed": 0.5}) == {
+        "optimizer": "adam",
+        "n_layers": 3,
+    }
+    assert manager.map_params(
+        {"optimizer": "sgd", "momentum": "0.5", "n_layers": "3.0", "step_size": "2", "nesterov": "True"}
+    ) == {"optimizer": "sgd", "momentum": 0.5, "n_layers": 3, "step_size": 2, "nesterov": True}
+
+    assert manager.map_params({"optimizer": "sgd", "n_layers": 3, "step_size": 2, "nesterov": True}) is None
+    assert manager.map_params({"optimizer": "adam", "n_layers": 9}) is None
+    assert manager.map_params({"optimizer": "adam", "n_layers": 2.5}) is None
+    assert manager.map_params({"optimizer": "rmsprop", "n_layers": 3}) is None
+
+
+def test_when_choice() -> None:
+    manager = HparamsManager(
+        use_optimizer=Categorical(choices=[True, False]),
+        optimizer=When(
+            key="use_optimizer",
+            values=[True],
+            hparam=Choice(
+                choices={"adam": {"lr": Float(low=1e-4, high=1e-1)}, "sgd": {"momentum": Float(low=0.0, high=0.99)}}
+            ),
+        ),
+    )
+
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    for _ in range(10):
+        trial = study.ask()
+        hparams = manager.suggest_hparams(trial)
+
+        assert hparams == trial.params
+        if hparams["use_optimizer"]:
+            active = {"adam": "lr", "sgd": "momentum"}[hparams["optimizer"]]
+            assert trial.params.keys() == {"use_optimizer", "optimizer", active}
+        else:
+            assert trial.params.keys() == {"use_optimizer"}
+
+    assert manager.map_params({"use_optimizer": True, "optimizer": "sgd", "momentum": 0.5}) == {
+        "use_optimizer": True,
+        "optimizer": "sgd",
+        "momentum": 0.5,
+    }
+    assert manager.map_params({"use_optimizer": True, "optimizer": "sgd"}) is None
@@ -0,0 +1,98 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from pathlib import Path
+
+import numpy as np
+
+import optuna
+from optuna.trial import TrialState
+import pytest
+
+from aiaccel.hpo.optuna.hparams import Categorical, Float, Int
+from aiaccel.hpo.optuna.hparams_manager import HparamsManager
+from aiaccel.hpo.optuna.samplers.nelder_mead_sampler import NelderMeadSampler
+from aiaccel.hpo.optuna.warm_start import load_results, warm_start
+
+
+def objective(trial: optuna.trial.Trial) -> float:
+    x = trial.suggest_float("x", -5.0, 5.0)
+    y = trial.suggest_int("y", -5, 5)
+    return (x - 1.0) ** 2 + (y + 2) ** 2
+
+
+@pytest.fixture
+def previous_storage(tmp_path: Path) -> str:
+    storage = str(tmp_path / "optuna.db")
+
+    previous_study = optuna.create_study(
+        study_name="previous", storage=f"sqlite:///{storage}", sampler=optuna.samplers.RandomSampler(seed=0)
+    )
+    previous_study.optimize(objective, n_trials=20)
+    previous_study.optimize(lambda trial: float("nan"), n_trials=1)  # failed trials are not imported
+
+    return storage
+
+
+def test_load_results(tmp_path: Path, previous_storage: str) -> None:
+    results = load_results(storage=previous_storage)
+    assert len(results) == 20
+
+    previous_study = optuna.load_study(study_name="previous", storage=f"sqlite:///{previous_storage}")
+    previous_study.trials_dataframe().to_csv(tmp_path / "trials.csv")
+
+    csv_results = load_results(csv_filename=str(tmp_path / "trials.csv"))
+    assert len(csv_results) == 20
+    for (params, values), (csv_params, csv_values) in zip(results, csv_results, strict=True):
+        assert csv_params.keys() == params.keys()
+        assert float(csv_params["x"]) == params["x"]
+        assert csv_values == values
+
+    with pytest.raises(ValueError):
+        load_results()
+
+
+def test_warm_start(tmp_path: Path, previous_storage: str) -> None:
+    params = HparamsManager(x=Float(low=-5.0, high=5.0), y=Int(low=-5, high=5))
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path}/new.db")
+
+    sources = [{"storage": previous_storage}]
+    trials = warm_start(study, params, sources)
+    assert len(trials) == 20
+    assert all(trial.state == TrialState.COMPLETE for trial in study.trials)
+    assert all("warm_start" in trial.user_attrs for trial in study.trials)
+
+    # each source is imported only once on resumption
+    assert warm_start(study, params, sources) == []
+    assert len(study.trials) == 20
+
+
+def test_warm_start_narrowed_space(tmp_path: Path, previous_storage: str) -> None:
+    params = HparamsManager(x=Float(low=0.0, high=5.0), y=Int(low=-5, high=5), z=Categorical(choices=["a", "b"]))
+    study = optuna.create_study()
+    assert warm_start(study, params, [{"storage": previous_storage}]) == []
+
+    params = HparamsManager(x=Float(low=0.0, high=5.0), y=Int(low=-5, high=5))
+    study = optuna.create_study()
+    warm_start(study, params, [{"storage": previous_storage}])
+
+    previous_study = optuna.load_study(study_name="previous", storage=f"sqlite:///{previous_storage}")
+    assert len(study.trials) == sum(trial.params["x"] >= 0.0 for trial in previous_study.trials if trial.values)
+
+
+def test_warm_start_nelder_mead(previous_storage: str) -> None:
+    params = HparamsManager(x=Float(low=-5.0, high=5.0), y=Float(low=-5.0, high=5.0))
+    sampler = NelderMeadSampler(search_space={"x": (-5.0, 5.0), "y": (-5.0, 5.0)}, seed=0)
+    study = optuna.create_study(sampler=sampler)
+
+    trials = warm_start(study, params, [{"storage": previous_storage}])
+
+    # the simplex is made of the best imported trials, and the first proposal is its reflection
+    best, second, worst = (
+        np.array([trial.params["x"], trial.params["y"]]) for trial in sorted(trials, key=lambda t: t.value)[:3]
+    )
+    expected = best + second - worst
+
+    trial = study.ask()
+    hparams = params.suggest_hparams(trial)
+    assert [hparams["x"], hparams["y"]] == pytest.approx(list(expected))
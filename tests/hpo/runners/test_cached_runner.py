@@ -0,0 +1,178 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import asyncio
+import contextlib
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+import optuna
+from optuna.trial import Trial
+import pytest
+
+from aiaccel.config import PackageGitStatus
+from aiaccel.hpo.runners import BaseRunner, CachedRunner
+
+
+class CountingRunner(BaseRunner):
+    def __init__(self) -> None:
+        self.n_calls = 0
+
+    async def __call__(self, trial: Trial, hparams: dict[str, Any]) -> Any:
+        self.n_calls += 1
+        return hparams["x"] ** 2
+
+
+def test_cached_runner(tmp_path: Path) -> None:
+    objective_filename = tmp_path / "objective.py"
+    objective_filename.write_text("")
+
+    config = oc.create(
+        {
+            "working_directory": str(tmp_path),
+            "command": [sys.executable, str(objective_filename), "--x={x}", "{out_filename}"],
+        }
+    )
+
+    base_runner = CountingRunner()
+    runner = CachedRunner(base_runner, config)
+
+    study = optuna.create_study()
+
+    def run(x: float) -> tuple[Any, Trial]:
+        trial = study.ask()
+        return asyncio.run(runner(trial, {"x": x})), trial
+
+    assert run(2.0)[0] == 4.0
+    assert run(3.0)[0] == 9.0
+    assert base_runner.n_calls == 2
+
+    y, trial = run(2.0)
+    assert y == 4.0
+    assert base_runner.n_calls == 2
+    assert study.trials[trial.number].user_attrs == {"cached": True}
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+
+    # invalidated by editing the objective
+    stat = objective_filename.stat()
+    os.utime(objective_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert run(2.0)[0] == 4.0
+    assert base_runner.n_calls == 3
+
+
+def test_cached_runner_working_directories(tmp_path: Path) -> None:
+    objective_filename = tmp_path / "objective.py"
+    objective_filename.write_text("")
+
+    base_runner = CountingRunner()
+    study = optuna.create_study()
+
+    for working_directory in [tmp_path / "study1", tmp_path / "study2"]:
+        config = oc.create(
+            {
+                "working_directory": str(working_directory),
+                "command": [sys.executable, str(objective_filename), "--x={x}", "--log={config.working_directory}/log"],
+            }
+        )
+        runner = CachedRunner(base_runner, config, tmp_path / "cache")
+
+        trial = study.ask()
+        assert asyncio.run(runner(trial, {"x": 2.0})) == 4.0
+
+    # the second study in another working directory is answered from the cache of the first one
+    assert base_runner.n_calls == 1
+    assert study.trials[1].user_attrs == {"cached": True}
+
+
+def test_cached_runner_callable(tmp_path: Path) -> None:
+    config = oc.create({"working_directory": str(tmp_path), "command": {"_target_": "objective.main", "a": 1}})
+
+    base_runner = CountingRunner()
+    study = optuna.create_study()
+
+    asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+    asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+    assert base_runner.n_calls == 1
+
+    config.command.a = 2
+    asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+    assert base_runner.n_calls == 2
+
+
+def test_cached_runner_callable_edited(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "objective.py").write_text("def main(x):\n    return x\n")
+
+    config = oc.create({"working_directory": str(tmp_path), "command": {"_target_": "objective.main"}})
+
+    base_runner = CountingRunner()
+    study = optuna.create_study()
+
+    asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+    asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+    assert base_runner.n_calls == 1
+
+    (tmp_path / "objective.py").write_text("def main(x):\n    return 2 * x\n")
+    asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+    assert base_runner.n_calls == 2
+
+
+def test_cached_runner_git_state(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "objective.py").write_text("from utils import f\n\ndef main(x):\n    return f(x)\n")
+    (tmp_path / "utils.py").write_text("def f(x):\n    return x\n")
+
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run([*git, "init", "-q"], check=True)
+    subprocess.run([*git, "add", "."], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "init"], check=True)
+
+    config = oc.create({"working_directory": str(tmp_path / "work"), "command": {"_target_": "objective.main"}})
+
+    base_runner = CountingRunner()
+    study = optuna.create_study()
+
+    def run() -> None:
+        asyncio.run(CachedRunner(base_runner, config)(study.ask(), {"x": 1.0}))
+
+    run()
+    run()
+    assert base_runner.n_calls == 1
+
+    # uncommitted changes of the modules used by the objective
+    (tmp_path / "utils.py").write_text("def f(x):\n    return 2 * x\n")
+    run()
+    assert base_runner.n_calls == 2
+
+    subprocess.run([*git, "commit", "-q", "-am", "update"], check=True)
+    run()
+    assert base_runner.n_calls == 3
+
+
+@pytest.mark.parametrize("status, n_calls", [(["?? outputs/"], 1), ([" M objective.py"], 2)])
+def test_cached_runner_git_status(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, status: list[str], n_calls: int
+) -> None:
+    monkeypatch.setattr(
+        "aiaccel.hpo.runners.cached_runner.collect_git_status_from_config",
+        lambda config: [PackageGitStatus("objective", "0" * 40, status)],
+    )
+
+    config = oc.create({"working_directory": str(tmp_path), "command": {"_target_": "objective.main"}})
+
+    base_runner = CountingRunner()
+    study = optuna.create_study()
+
+    with pytest.warns(UserWarning, match="disabled") if n_calls == 2 else contextlib.nullcontext():
+        runner = CachedRunner(base_runner, config)
+
+    for _ in range(2):
+        asyncio.run(runner(study.ask(), {"x": 1.0}))
+    assert base_runner.n_calls == n_calls
@@ -0,0 +1,19 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+import optuna
+
+from aiaccel.hpo.runners import CallableRunner
+
+
+def test_callable_runner() -> None:
+    async def run_trials() -> list[float]:
+        study = optuna.create_study()
+        async with CallableRunner(oc.create({"_target_": "builtins.round", "ndigits": 2}), n_workers=2) as runner:
+            return await asyncio.gather(*[runner(study.ask(), {"number": number}) for number in [0.123, 4.567]])
+
+    assert asyncio.run(run_trials()) == [0.12, 4.57]
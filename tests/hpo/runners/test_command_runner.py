@@ -0,0 +1,171 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+import optuna
+import pytest
+
+from aiaccel.hpo.optuna.hparams import Choice, Float, When
+from aiaccel.hpo.optuna.hparams_manager import HparamsManager
+from aiaccel.hpo.runners import CommandRunner
+
+objective_filename = Path(__file__).parents[1] / "apps" / "data" / "single_objective" / "objective.py"
+
+
+def test_command_runner(tmp_path: Path) -> None:
+    config = oc.create({"working_directory": str(tmp_path)})
+    runner = CommandRunner(
+        [sys.executable, str(objective_filename), "--x1={x1}", "--x2={x2}", "{out_filename}"],
+        config,
+    )
+
+    trial = optuna.create_study().ask()
+    y = asyncio.run(runner(trial, {"x1": 1.0, "x2": 2.0}))
+
+    assert y == 1.0 - 4.0 + 4.0 - 2.0 - 2.0
+    assert not (tmp_path / f"trial_{trial.number:0>6}.json").exists()
+
+
+def test_command_runner_conditional_hparams(tmp_path: Path) -> None:
+    script_filename = tmp_path / "objective.py"
+    script_filename.write_text("import json, sys\njson.dump(sys.argv[1:-1], open(sys.argv[-1], 'w'))\n")
+
+    config = oc.create({"working_directory": str(tmp_path)})
+    runner = CommandRunner(
+        [sys.executable, str(script_filename), "--optimizer={optimizer}", "--momentum={momentum}"]
+        + ["--beta1={beta1}", "--warmup={warmup}", "{out_filename}"],
+        config,
+    )
+    manager = HparamsManager(
+        optimizer=Choice(
+            choices={"adam": {"beta1": Float(low=0.8, high=0.999)}, "sgd": {"momentum": Float(low=0.0, high=0.99)}}
+        ),
+        warmup=When(key="optimizer", values=["adam"], hparam=Float(low=0.0, high=0.1), default=0.0),
+    )
+
+    study = optuna.create_study(sampler=optuna.samplers.RandomSampler(seed=0))
+    optimizers = set()
+    for _ in range(6):
+        trial = study.ask()
+        hparams = manager.suggest_hparams(trial)
+        args = asyncio.run(runner(trial, hparams))
+        optimizers.add(hparams["optimizer"])
+
+        # the inactive hyperparameters without defaults are left out of the command
+        if hparams["optimizer"] == "adam":
+            assert args == ["--optimizer=adam", f"--beta1={hparams['beta1']}", f"--warmup={hparams['warmup']}"]
+        else:
+            assert args == ["--optimizer=sgd", f"--momentum={hparams['momentum']}", "--warmup=0.0"]
+
+    assert optimizers == {"adam", "sgd"}
+
+
+def test_command_runner_failed(tmp_path: Path) -> None:
+    config = oc.create({"working_directory": str(tmp_path)})
+    runner = CommandRunner([sys.executable, "-c", "import sys; sys.exit(3)"], config)
+
+    trial = optuna.create_study().ask()
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(runner(trial, {}))
+
+
+_reporting_objective = """
+import json, sys, time
+
+for step in range(5):
+    with open(sys.argv[1] + ".partial", "a") as f:
+        f.write(json.dumps({"step": step, "value": float(step)}) + "\\n")
+    time.sleep(0.1)
+
+with open(sys.argv[1], "w") as f:
+    json.dump(10.0, f)
+"""
+
+
+def test_command_runner_report(tmp_path: Path) -> None:
+    script_filename = tmp_path / "objective.py"
+    script_filename.write_text(_reporting_objective)
+    (tmp_path / "work").mkdir()
+
+    config = oc.create({"working_directory": str(tmp_path / "work"), "report_interval": 0.02})
+    runner = CommandRunner([sys.executable, str(script_filename), "{out_filename}"], config)
+
+    study = optuna.create_study(pruner=optuna.pruners.NopPruner())
+    trial = study.ask()
+    y = asyncio.run(runner(trial, {}))
+    study.tell(trial, y)
+
+    assert y == 10.0
+    assert study.trials[0].intermediate_values == {step: float(step) for step in range(5)}
+    assert list((tmp_path / "work").iterdir()) == []
+
+
+def test_command_runner_pruned(tmp_path: Path) -> None:
+    script_filename = tmp_path / "objective.py"
+    script_filename.write_text(_reporting_objective)
+    (tmp_path / "work").mkdir()
+
+    config = oc.create({"working_directory": str(tmp_path / "work"), "report_interval": 0.02})
+    runner = CommandRunner([sys.executable, str(script_filename), "{out_filename}"], config)
+
+    study = optuna.create_study(pruner=optuna.pruners.ThresholdPruner(upper=1.5))
+    trial = study.ask()
+    with pytest.raises(optuna.TrialPruned):
+        asyncio.run(runner(trial, {}))
+    study.tell(trial, state=optuna.trial.TrialState.PRUNED)
+
+    assert max(study.trials[0].intermediate_values) < 4
+    assert list((tmp_path / "work").iterdir()) == []
+
+
+_spawning_objective = """
+import subprocess, sys, time
+
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+with open(sys.argv[1], "w") as f:
+    f.write(str(child.pid))
+time.sleep(60)
+"""
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"  # zombies are not running
+    except FileNotFoundError:
+        return False
+
+
+def test_command_runner_cancelled(tmp_path: Path) -> None:
+    script_filename = tmp_path / "objective.py"
+    script_filename.write_text(_spawning_objective)
+    pid_filename = tmp_path / "pid"
+
+    config = oc.create({"working_directory": str(tmp_path)})
+    runner = CommandRunner([sys.executable, str(script_filename), str(pid_filename)], config)
+
+    async def main() -> None:
+        task = asyncio.create_task(runner(optuna.create_study().ask(), {}))
+        while not pid_filename.exists() or pid_filename.read_text() == "":
+            await asyncio.sleep(0.01)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    # the process spawned by the command is terminated together
+    pid = int(pid_filename.read_text())
+    for _ in range(100):
+        if not _is_running(pid):
+            break
+        time.sleep(0.05)
+    assert not _is_running(pid)
@@ -0,0 +1,56 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import asyncio
+from pathlib import Path
+import sys
+
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+import optuna
+import pytest
+
+from aiaccel.hpo.runners import JobArrayRunner, MissingResultError
+
+objective_filename = Path(__file__).parents[1] / "apps" / "data" / "single_objective" / "objective.py"
+
+
+def test_job_array_runner(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    config = oc.create({"working_directory": str(tmp_path), "job": {"backend": "local", "mode": "cpu"}})
+    runner = JobArrayRunner(
+        [sys.executable, str(objective_filename), "--x1={x1}", "--x2={x2}", "{out_filename}"],
+        config,
+    )
+
+    async def run_trials() -> list[Any]:
+        study = optuna.create_study()
+        async with runner:
+            return await asyncio.gather(
+                *[runner(study.ask(), {"x1": x1, "x2": x2}) for x1, x2 in [(1.0, 2.0), (0.0, 0.0), ("a", 0.0)]],
+                return_exceptions=True,
+            )
+
+    y1, y2, y3 = asyncio.run(run_trials())
+
+    assert y1 == 1.0 - 4.0 + 4.0 - 2.0 - 2.0
+    assert y2 == 0.0
+    assert isinstance(y3, MissingResultError)
+    assert y3.task_index == 2
+    assert y3.out_filename == tmp_path / "trial_000002.json"
+    assert "trial_000002.json" in str(y3)
+
+    # all trials are submitted as a single array job
+    assert runner.n_submissions == 1
+    assert (tmp_path / "jobs" / "array_000000.tasks.json").exists()
+
+
+def test_job_array_runner_report_interval(tmp_path: Path) -> None:
+    config = oc.create(
+        {"working_directory": str(tmp_path), "job": {"backend": "local", "mode": "cpu"}, "report_interval": 1.0}
+    )
+    with pytest.warns(UserWarning, match="report_interval is ignored"):
+        JobArrayRunner([sys.executable, str(objective_filename), "{out_filename}"], config)
@@ -0,0 +1,104 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from typing import Any
+
+import asyncio
+import subprocess
+import sys
+
+from omegaconf import OmegaConf as oc  # noqa: N813
+
+import optuna
+import pytest
+
+from aiaccel.hpo.runners import PersistentCommandRunner
+
+server_script = """
+import os
+
+from aiaccel.hpo.runners import serve
+
+
+def objective(x: float) -> list[float]:
+    print("noise")
+    if x < 0:
+        raise ValueError("negative x")
+    if x > 100:
+        os._exit(5)
+    return [x * 2, os.getpid()]
+
+
+serve(objective)
+"""
+
+
+def run_trials(runner: PersistentCommandRunner, xs: list[float]) -> list[Any]:
+    async def _run_trials() -> list[Any]:
+        study = optuna.create_study()
+        async with runner:
+            return [await runner(study.ask(), {"x": x}) for x in xs]
+
+    return asyncio.run(_run_trials())
+
+
+def test_persistent_command_runner() -> None:
+    runner = PersistentCommandRunner([sys.executable, "-c", server_script], oc.create({}))
+
+    results = run_trials(runner, [1.0, 2.0, 3.0])
+
+    assert [y for y, _ in results] == [2.0, 4.0, 6.0]
+    assert len({pid for _, pid in results}) == 1  # the process is reused
+    assert len(runner.processes) == 0
+
+
+def test_persistent_command_runner_objective_error() -> None:
+    runner = PersistentCommandRunner([sys.executable, "-c", server_script], oc.create({}))
+
+    with pytest.raises(RuntimeError, match="negative x"):
+        run_trials(runner, [-1.0])
+
+
+def test_persistent_command_runner_exited() -> None:
+    runner = PersistentCommandRunner([sys.executable, "-c", server_script], oc.create({}))
+
+    with pytest.raises(subprocess.CalledProcessError) as e:
+        run_trials(runner, [1.0, 101.0])
+
+    assert e.value.returncode == 5
+
+
+hanging_script = """
+import json
+import sys
+import time
+
+sys.stdin.readline()
+time.sleep(0.2)
+print(json.dumps(dict(value=1.0)), flush=True)
+
+while True:  # ignore EOF
+    time.sleep(1)
+"""
+
+
+def test_persistent_command_runner_close_timeout() -> None:
+    runner = PersistentCommandRunner([sys.executable, "-c", hanging_script], oc.create({}), close_timeout=0.5)
+
+    async def _run_trials() -> list[asyncio.subprocess.Process]:
+        study = optuna.create_study()
+        async with runner:
+            await asyncio.gather(*(runner(study.ask(), {}) for _ in range(2)))
+            processes = list(runner.processes)
+
+        return processes
+
+    processes = asyncio.run(_run_trials())
+
+    assert len(processes) == 2
+    assert all(proc.returncode is not None for proc in processes)  # killed instead of leaked
+
+
+def test_persistent_command_runner_report_interval() -> None:
+    with pytest.warns(UserWarning, match="report_interval is ignored"):
+        PersistentCommandRunner([sys.executable, "-c", server_script], oc.create({"report_interval": 1.0}))
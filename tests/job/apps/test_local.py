@@ -0,0 +1,124 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import time
+
+import pytest
+
+cmd = ["aiaccel-job", "local"]
+
+
+def test_fail_fast(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    log_path = tmp_path / "test.log"
+
+    start = time.monotonic()
+    result = subprocess.run(
+        cmd
+        + ["cpu", "--n_tasks=4", "--n_procs=4", "--fail_fast", log_path, "--"]
+        + ["bash", "-c", "if [[ $TASK_INDEX -eq 3 ]]; then exit 1; else sleep 30; fi"],
+        stdout=subprocess.PIPE,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode != 0
+    assert time.monotonic() - start < 20
+    assert "0 done, 1 failed, 3 running" in result.stdout
+
+
+def test_dynamic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    log_path = tmp_path / "test.log"
+
+    script = (
+        "from aiaccel.job.utils import split_tasks\nfor task in split_tasks(list(range(20))): open(f'done.{task}', 'x')"
+    )
+    subprocess.run(
+        cmd + ["cpu", "--n_tasks=20", "--n_procs=4", "--dynamic", log_path, "--", "python", "-c", script], check=True
+    )
+
+    assert sorted(int(path.suffix[1:]) for path in tmp_path.glob("done.*")) == list(range(20))
+
+    # each of the four processes claimed tasks until the counter passed the end of the list
+    assert int((tmp_path / "test.counter").read_text()) == 20 + 4
+
+
+def test_scheduler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    log_path = tmp_path / "test.log"
+
+    cpu = min(os.sched_getaffinity(0))
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f"""\
+_base_: {Path(__file__).parents[3] / "aiaccel" / "job" / "apps" / "config" / "local.yaml"}
+use_scheduler: True
+scheduler:
+    cpus: [{cpu}]
+    gpus: []
+    lock_directory: {tmp_path / "locks"}
+"""
+    )
+
+    script = """
+import os, time
+start = time.time()
+time.sleep(0.3)
+with open(f"proc.{os.environ['TASK_INDEX']}", "w") as f:
+    f.write(f"{start} {time.time()} {sorted(os.sched_getaffinity(0))}")
+"""
+    subprocess.run(
+        cmd + ["--config", config_path, "cpu", "--n_tasks=3", "--n_procs=3", log_path, "--", "python", "-c", script],
+        check=True,
+    )
+
+    results = sorted(path.read_text().split(" ", 2) for path in tmp_path.glob("proc.*"))
+    assert len(results) == 3
+
+    # the processes ran one by one on the scheduled CPU
+    for (_, end, _), (start, _, _) in zip(results[:-1], results[1:], strict=True):
+        assert float(end) <= float(start)
+    for _, _, resources in results:
+        assert resources == f"[{cpu}]"
+
+
+@pytest.mark.skipif(shutil.which("mpirun") is None, reason="mpirun is not available")
+def test_scheduler_mpi(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OMPI_ALLOW_RUN_AS_ROOT", "1")
+    monkeypatch.setenv("OMPI_ALLOW_RUN_AS_ROOT_CONFIRM", "1")
+    log_path = tmp_path / "test.log"
+
+    cpu = min(os.sched_getaffinity(0))
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f"""\
+_base_: {Path(__file__).parents[3] / "aiaccel" / "job" / "apps" / "config" / "local.yaml"}
+use_scheduler: True
+scheduler:
+    cpus: [{cpu}]
+    gpus: [0, 1, 2]
+    lock_directory: {tmp_path / "locks"}
+mpi:
+    n_cpus: 0
+    n_gpus: 1
+    job: "mpirun -np {{args.n_procs}} --oversubscribe --bind-to none {{command}}"
+"""
+    )
+
+    script = """
+import os
+with open(f"rank.{os.environ['OMPI_COMM_WORLD_RANK']}", "w") as f:
+    f.write(os.environ["CUDA_VISIBLE_DEVICES"])
+"""
+    subprocess.run(
+        cmd + ["--config", config_path, "mpi", "--n_procs=2", log_path, "--", "python", "-c", script], check=True
+    )
+
+    # the GPUs of both ranks are acquired once for the job and shared by the ranks
+    assert [path.read_text() for path in sorted(tmp_path.glob("rank.*"))] == ["0,1", "0,1"]
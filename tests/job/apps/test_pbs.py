@@ -0,0 +1,84 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import os
+from pathlib import Path
+import subprocess
+import time
+
+import pytest
+
+cmd = ["aiaccel-job", "pbs"]
+
+fake_scheduler_path = Path(__file__).parent / "fake_scheduler"
+
+
+@pytest.fixture
+def fake_scheduler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PATH", f"{fake_scheduler_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_SCHEDULER_SPOOL", str(tmp_path))
+    monkeypatch.setenv("JOB_GROUP", "gaa00000")
+
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "base_args",
+    [
+        ["cpu"],
+        ["cpu", "--n_tasks=10", "--n_tasks_per_proc=2", "--n_procs=2"],
+        ["gpu"],
+        ["gpu", "--n_tasks=10", "--n_tasks_per_proc=2", "--n_procs=2"],
+    ],
+)
+def test_default(base_args: list[str], fake_scheduler: Path) -> None:
+    log_path = fake_scheduler / "test.log"
+
+    subprocess.run(cmd + base_args + [log_path, "--", "sleep", "0"], check=True, timeout=60)
+
+    # status files are removed after the job succeeded
+    assert len(list(fake_scheduler.glob("test*.out"))) == 0
+
+
+def test_failed(fake_scheduler: Path) -> None:
+    log_path = fake_scheduler / "test.log"
+
+    with pytest.raises(subprocess.CalledProcessError):
+        subprocess.run(cmd + ["cpu", log_path, "--", "false"], check=True, timeout=60)
+
+
+def test_status_command(fake_scheduler: Path) -> None:
+    config_path = fake_scheduler / "config.yaml"
+    config_path.write_text(
+        f"""\
+_base_: {Path(__file__).parents[3] / "aiaccel" / "job" / "apps" / "config" / "pbs.yaml"}
+status_command: qstat {{job_id}}
+"""
+    )
+
+    log_path = fake_scheduler / "test.log"
+
+    subprocess.run(cmd + ["--config", config_path, "cpu", log_path, "--", "sleep", "1"], check=True, timeout=60)
+
+
+def test_fail_fast(fake_scheduler: Path) -> None:
+    log_path = fake_scheduler / "test.log"
+
+    start = time.monotonic()
+    result = subprocess.run(
+        cmd
+        + ["cpu", "--n_tasks=4", "--n_tasks_per_proc=1", "--n_procs=1", "--fail_fast", log_path, "--"]
+        + ["bash", "-c", "if [[ $TASK_INDEX -eq 3 ]]; then exit 1; else sleep 30; fi"],
+        stdout=subprocess.PIPE,
+        text=True,
+        timeout=60,
+    )
+
+    # the failure of the third chunk is reported without waiting for the others
+    assert result.returncode != 0
+    assert time.monotonic() - start < 20
+    assert "0 done, 1 failed, 3 running" in result.stdout
+
+    # the remaining chunks are cancelled
+    assert len(list(fake_scheduler.glob("qdel.*"))) == 1
@@ -0,0 +1,71 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+from threading import Timer
+import time
+
+import pytest
+
+from aiaccel.job.utils.acquire_resources import acquire_resources
+
+
+def test_acquire_resources(tmp_path: Path) -> None:
+    cpus, gpus, fds = acquire_resources(2, 1, [0, 1, 2], [0, 1], tmp_path)
+    assert cpus == [0, 1]
+    assert gpus == [0]
+
+    # the remaining resources are acquired without waiting
+    cpus2, gpus2, fds2 = acquire_resources(1, 1, [0, 1, 2], [0, 1], tmp_path)
+    assert cpus2 == [2]
+    assert gpus2 == [1]
+
+    # wait until the first resources are released
+    timer = Timer(0.3, lambda: [os.close(fd) for fd in fds])
+    timer.start()
+
+    start = time.monotonic()
+    cpus3, gpus3, fds3 = acquire_resources(2, 0, [0, 1, 2], [0, 1], tmp_path, max_interval=0.05)
+    assert time.monotonic() - start >= 0.25
+    assert cpus3 == [0, 1]
+    assert gpus3 == []
+
+    for fd in fds2 + fds3:
+        os.close(fd)
+
+
+def test_acquire_resources_too_many(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        acquire_resources(1, 1, [0, 1], [], tmp_path)
+
+
+@pytest.mark.parametrize("n_gpus, expected", [(0, "0,1"), (1, "0")])
+def test_cuda_visible_devices(n_gpus: int, expected: str, tmp_path: Path) -> None:
+    cpu = min(os.sched_getaffinity(0))
+    result = subprocess.run(
+        [sys.executable, "-m", "aiaccel.job.utils.acquire_resources", f"--n_gpus={n_gpus}", f"--cpus={cpu}"]
+        + ["--gpus=0,1", f"--lock_directory={tmp_path}", "--"]
+        + [sys.executable, "-c", "import os; print(os.environ['CUDA_VISIBLE_DEVICES'])"],
+        env=os.environ | {"CUDA_VISIBLE_DEVICES": "0,1"},
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == expected
+
+
+def test_scheduled_cpus(tmp_path: Path) -> None:
+    cpu = min(os.sched_getaffinity(0))
+    result = subprocess.run(
+        [sys.executable, "-m", "aiaccel.job.utils.acquire_resources", f"--cpus={cpu}", f"--lock_directory={tmp_path}"]
+        + ["--", sys.executable, "-c", "import os; print(os.environ['AIACCEL_JOB_CPUS'], os.sched_getaffinity(0))"],
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split(" ", 1) == [str(cpu), f"{{{cpu}}}\n"]
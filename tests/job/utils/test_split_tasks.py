@@ -0,0 +1,45 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+from aiaccel.job.utils import split_tasks
+
+
+def test_split_tasks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TASK_INDEX", "4")
+    monkeypatch.setenv("TASK_STEPSIZE", "3")
+
+    assert split_tasks(list(range(10))) == [3, 4, 5]
+
+
+def test_split_tasks_not_array_job(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TASK_INDEX", raising=False)
+    monkeypatch.delenv("TASK_COUNTER_FILE", raising=False)
+
+    assert split_tasks(list(range(10))) == []
+
+
+def test_split_tasks_dynamic(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("TASK_INDEX", "1")
+    monkeypatch.setenv("TASK_STEPSIZE", "1")
+    monkeypatch.setenv("TASK_COUNTER_FILE", str(tmp_path / "job.counter"))
+
+    task_list = list(range(100))
+    claimed_lists: list[list[int]] = [[] for _ in range(8)]
+
+    def worker(claimed: list[int]) -> None:
+        for task in split_tasks(task_list):
+            claimed.append(task)
+
+    threads = [Thread(target=worker, args=(claimed,)) for claimed in claimed_lists]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # every task is claimed exactly once regardless of TASK_INDEX and TASK_STEPSIZE
+    assert sorted(sum(claimed_lists, [])) == task_list
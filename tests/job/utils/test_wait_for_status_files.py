@@ -0,0 +1,91 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import importlib
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+from aiaccel.job.utils import wait_for_status_files
+
+
+def write_later(path: Path, status: int, delay: float) -> None:
+    def _write() -> None:
+        time.sleep(delay)
+        path.write_text(f"{status}\n")
+
+    threading.Thread(target=_write, daemon=True).start()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_wait_for_status_files(tmp_path: Path, use_inotify: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not use_inotify:
+        module = importlib.import_module("aiaccel.job.utils.wait_for_status_files")
+        monkeypatch.setattr(module, "_open_inotify", lambda directories: None)
+
+    status_filenames = [tmp_path / f"job.{idx}.out" for idx in range(3)]
+
+    status_filenames[1].write_text("0\n")
+    write_later(status_filenames[0], 1, 0.2)
+    write_later(status_filenames[2], 0, 0.5)
+
+    statuses = wait_for_status_files(status_filenames, min_interval=0.1, max_interval=0.2)
+
+    assert list(statuses.items()) == [(status_filenames[0], 1), (status_filenames[1], 0), (status_filenames[2], 0)]
+
+
+def test_wait_for_status_files_empty(tmp_path: Path) -> None:
+    status_filename = tmp_path / "job.out"
+
+    # the file is created but not written yet
+    status_filename.touch()
+    write_later(status_filename, 0, 0.2)
+
+    assert wait_for_status_files([status_filename], min_interval=0.1) == {status_filename: 0}
+
+
+def test_wait_for_status_files_running(tmp_path: Path) -> None:
+    status_filename = tmp_path / "job.out"
+    running_filename = tmp_path / "running"
+
+    running_filename.write_text("1234 R\n")
+    write_later(status_filename, 0, 0.5)
+
+    statuses = wait_for_status_files(
+        [status_filename], f"cat {running_filename}", min_interval=0.1, query_interval=0.0, grace_period=0.0
+    )
+
+    assert statuses == {status_filename: 0}
+
+
+def test_wait_for_status_files_died(tmp_path: Path) -> None:
+    status_filename = tmp_path / "job.out"
+
+    with pytest.raises(RuntimeError, match="without writing status files"):
+        wait_for_status_files(
+            [status_filename], f"cat {tmp_path / 'running'}", min_interval=0.1, query_interval=0.0, grace_period=0.3
+        )
+
+
+def test_wait_for_status_files_callback(tmp_path: Path) -> None:
+    status_filenames = [tmp_path / f"job.{idx}.out" for idx in range(3)]
+
+    write_later(status_filenames[2], 1, 0.1)
+    write_later(status_filenames[0], 0, 10.0)
+
+    found = []
+
+    def callback(status_filename: Path, status: int) -> None:
+        found.append((status_filename, status))
+        if status != 0:
+            raise RuntimeError("failed")
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="failed"):
+        wait_for_status_files(status_filenames, min_interval=0.1, callback=callback)
+
+    # the failure is reported as soon as it is found
+    assert found == [(status_filenames[2], 1)]
+    assert time.monotonic() - start < 5.0
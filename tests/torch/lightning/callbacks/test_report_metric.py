@@ -0,0 +1,52 @@
+# Copyright (C) 2025 National Institute of Advanced Industrial Science and Technology (AIST)
+# SPDX-License-Identifier: MIT
+
+import json
+from pathlib import Path
+from unittest import mock
+
+import torch
+
+import pytest
+
+from aiaccel.torch.lightning.callbacks import ReportMetricCallback
+
+
+def create_trainer(
+    current_epoch: int, sanity_checking: bool = False, is_global_zero: bool = True, **metrics: float
+) -> mock.MagicMock:
+    trainer = mock.MagicMock()
+    trainer.current_epoch = current_epoch
+    trainer.sanity_checking = sanity_checking
+    trainer.is_global_zero = is_global_zero
+    trainer.callback_metrics = {name: torch.tensor(value) for name, value in metrics.items()}
+
+    return trainer
+
+
+def test_report_metric(tmp_path: Path) -> None:
+    output_path = tmp_path / "trial_000000.json"
+    callback = ReportMetricCallback("val_loss", str(output_path))
+
+    for epoch, value in enumerate([1.0, 0.5]):
+        callback.on_validation_epoch_end(create_trainer(epoch, val_loss=value), mock.MagicMock())
+
+    lines = (tmp_path / "trial_000000.json.partial").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [{"step": 0, "value": 1.0}, {"step": 1, "value": 0.5}]
+
+
+@pytest.mark.parametrize(
+    "trainer",
+    [
+        create_trainer(0, sanity_checking=True, val_loss=1.0),
+        create_trainer(0, is_global_zero=False, val_loss=1.0),
+        create_trainer(0, train_loss=1.0),
+    ],
+)
+def test_report_metric_skipped(tmp_path: Path, trainer: mock.MagicMock) -> None:
+    output_path = tmp_path / "trial_000000.json"
+    callback = ReportMetricCallback("val_loss", str(output_path))
+
+    callback.on_validation_epoch_end(trainer, mock.MagicMock())
+
+    assert not (tmp_path / "trial_000000.json.partial").exists()